@@ -4,7 +4,8 @@ from app.agents.research import ResearchAgent
 from app.agents.analyst import AnalystAgent
 from app.agents.risk import RiskAgent
 from app.agents.decision import DecisionAgent
-from app.agents.orchestrator import AgentOrchestrator
+from app.agents.scheduler import PipelineNode, DAGScheduler, build_pipeline
+from app.agents.orchestrator import AgentOrchestrator, PhaseFailedError
 
 __all__ = [
     "BaseAgent",
@@ -12,5 +13,9 @@ __all__ = [
     "AnalystAgent",
     "RiskAgent",
     "DecisionAgent",
+    "PipelineNode",
+    "DAGScheduler",
+    "build_pipeline",
     "AgentOrchestrator",
+    "PhaseFailedError",
 ]
@@ -1,7 +1,6 @@
-import json
-import re
 from typing import Dict, Any
 from app.agents.base import BaseAgent
+from app.agents.json_stream import parse_json_response
 from app.schemas import AgentConfig, AgentInput
 
 
@@ -67,6 +66,8 @@ Respond ONLY with the JSON object, no additional text."""
 class AnalystAgent(BaseAgent):
     """Agent responsible for logical and technical analysis."""
     
+    input_keys = ['Research Agent']
+    
     def __init__(self):
         config = AgentConfig(
             name="Analysis Agent",
@@ -83,7 +84,7 @@ class AnalystAgent(BaseAgent):
     
     def format_task(self, input_data: AgentInput) -> str:
         # Get research data from previous outputs
-        research_data = input_data.previous_outputs.get('Research Agent', {})
+        research_data = self.format_previous(input_data, 'Research Agent')
         
         task = f"""
 ## ANALYSIS TASK
@@ -93,7 +94,7 @@ class AnalystAgent(BaseAgent):
 
 **Research Data to Analyze:**
 ```json
-{json.dumps(research_data, indent=2)}
+{research_data}
 ```
 
 **Analysis Focus:**
@@ -108,19 +109,16 @@ Please analyze the data thoroughly and return your analysis in the specified JSO
     
     def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse the JSON response from the LLM."""
-        try:
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return {
-                "error": "Failed to parse response",
-                "raw_response": response[:500],
-                "market_viability": {"score": 0.5, "assessment": "Unable to parse"},
-                "technical_feasibility": {"score": 0.5},
-                "business_model_analysis": {"score": 0.5},
-                "competitive_position": {"score": 0.5},
-                "overall_analysis_score": 0.5,
-                "confidence": 0.3
-            }
+        result = parse_json_response(response)
+        if result is not None:
+            return result
+        return {
+            "error": "Failed to parse response",
+            "raw_response": response[:500],
+            "market_viability": {"score": 0.5, "assessment": "Unable to parse"},
+            "technical_feasibility": {"score": 0.5},
+            "business_model_analysis": {"score": 0.5},
+            "competitive_position": {"score": 0.5},
+            "overall_analysis_score": 0.5,
+            "confidence": 0.3
+        }
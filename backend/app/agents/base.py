@@ -1,31 +1,44 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
-from langchain_openai import ChatOpenAI
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable
 from langchain.schema import HumanMessage, SystemMessage
 import time
 import logging
 from app.config import get_settings
+from openai import RateLimitError
+from app.llm import get_chat_model, get_response_cache, get_rate_limiter, get_hedger, ResponseCache
+from app.agents.prompt_context import fit_to_budget, prune, estimate_tokens
+from app.agents.json_stream import IncrementalJSONParser, parse_json_response
 from app.schemas import AgentConfig, AgentInput, AgentOutput
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Receives each text fragment as the completion streams in
+TokenCallback = Callable[[str], Awaitable[None]]
+
+# Receives each top-level result field as soon as it is complete
+FieldCallback = Callable[[str, Any], Awaitable[None]]
+
 
 class BaseAgent(ABC):
     """Base class for all AegisAI agents."""
     
+    # Names of the previous_outputs entries this agent reads in format_task.
+    # The orchestrator uses them to build the dependency graph.
+    input_keys: List[str] = []
+    
+    # Top-level fields to keep from each input when building prompt context.
+    # Inputs not listed here are embedded with all of their fields.
+    context_fields: Dict[str, List[str]] = {}
+    
     def __init__(self, config: AgentConfig):
         self.config = config
-        self.llm = ChatOpenAI(
-            api_key=settings.OPENROUTER_API_KEY,
-            model=settings.OPENROUTER_MODEL,
-            base_url="https://openrouter.ai/api/v1",
+        # Borrow the shared pooled client; per-agent params are bound per call
+        client = get_chat_model()
+        self.model_name = client.model_name
+        self.llm = client.bind(
             temperature=config.temperature,
-            max_tokens=config.max_tokens,
-            default_headers={
-                "HTTP-Referer": "https://aegis-ai.vercel.app",
-                "X-Title": "AegisAI Decision System",
-            }
+            max_tokens=config.max_tokens
         )
         self.reasoning_log: List[Dict[str, Any]] = []
     
@@ -37,6 +50,16 @@ class BaseAgent(ABC):
     def role(self) -> str:
         return self.config.role
     
+    @property
+    def soft_deadline(self) -> float:
+        """Seconds after which a slow LLM call is hedged."""
+        return self.config.soft_deadline_seconds or settings.LLM_SOFT_DEADLINE_SECONDS
+    
+    @property
+    def hard_deadline(self) -> float:
+        """Seconds after which an LLM call is abandoned."""
+        return self.config.hard_deadline_seconds or settings.LLM_HARD_DEADLINE_SECONDS
+    
     @abstractmethod
     def get_system_prompt(self) -> str:
         """Return the system prompt for this agent."""
@@ -47,37 +70,119 @@ class BaseAgent(ABC):
         """Format the task for the LLM."""
         pass
     
+    def format_previous(self, input_data: AgentInput, key: str) -> str:
+        """
+        Return the compact JSON digest of an upstream output for the prompt.
+        
+        Uses the digest prepared by the orchestrator when available.
+        """
+        if key in input_data.prompt_context:
+            return input_data.prompt_context[key]
+        result = input_data.previous_outputs.get(key, {})
+        return fit_to_budget(
+            prune(result, self.context_fields.get(key)),
+            settings.PROMPT_CONTEXT_TOKEN_BUDGET
+        )
+    
     @abstractmethod
     def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse the LLM response into structured data."""
         pass
     
-    async def execute(self, input_data: AgentInput) -> AgentOutput:
-        """Execute the agent's task."""
+    async def execute(
+        self,
+        input_data: AgentInput,
+        on_token: Optional[TokenCallback] = None,
+        on_field: Optional[FieldCallback] = None
+    ) -> AgentOutput:
+        """
+        Execute the agent's task.
+        
+        When ``on_token`` is given and streaming is enabled, the completion is
+        streamed and every fragment is forwarded as it arrives; ``on_field``
+        additionally receives each top-level JSON field once it closes.
+        """
         start_time = time.time()
         
         try:
+            task = self.format_task(input_data)
+            system_prompt = self.get_system_prompt()
+            
+            # Add memory context if available
+            content = task
+            if input_data.memory_context:
+                content += f"\n\n[RELEVANT PAST EXPERIENCES]\n{input_data.memory_context}"
+            
             # Build messages
             messages = [
-                SystemMessage(content=self.get_system_prompt()),
-                HumanMessage(content=self.format_task(input_data))
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=content)
             ]
             
-            # Add memory context if available
-            if input_data.memory_context:
-                memory_msg = f"\n\n[RELEVANT PAST EXPERIENCES]\n{input_data.memory_context}"
-                messages[1] = HumanMessage(content=self.format_task(input_data) + memory_msg)
+            # A latency budget may ask for a shorter completion
+            max_tokens = min(input_data.max_tokens or self.config.max_tokens, self.config.max_tokens)
             
-            # Call LLM
-            logger.info(f"Agent {self.name} executing task...")
-            response = await self.llm.ainvoke(messages)
+            # Serve identical prompts from the response cache
+            cache = get_response_cache() if input_data.use_cache else None
+            cache_key = None
+            cached = None
+            if cache:
+                cache_key = ResponseCache.make_key(
+                    self.model_name,
+                    system_prompt,
+                    task,
+                    input_data.memory_context,
+                    self.config.temperature,
+                    max_tokens
+                )
+                cached = await cache.get(cache_key)
+            
+            if cached:
+                logger.info(f"Agent {self.name} served from response cache")
+                response_text = cached["content"]
+                tokens_used = 0
+            else:
+                # Call LLM within the per-model rate limits and global concurrency cap
+                limiter = get_rate_limiter()
+                estimated_tokens = estimate_tokens(system_prompt + content) + max_tokens
+                async with limiter.acquire(self.model_name, estimated_tokens) as lease:
+                    logger.info(f"Agent {self.name} executing task...")
+                    hedger = get_hedger()
+                    try:
+                        if on_token and settings.LLM_STREAMING_ENABLED:
+                            response_text, tokens_used = await hedger.with_deadline(
+                                self.name,
+                                self._stream_llm(
+                                    messages, on_token, on_field,
+                                    on_hedge=lease.charge_extra_request,
+                                    max_tokens=max_tokens
+                                ),
+                                self.hard_deadline
+                            )
+                        else:
+                            # Duplicate the call when it runs long; first parseable response wins
+                            response_text, tokens_used = await hedger.call(
+                                self.name,
+                                lambda: self._call_llm(messages, max_tokens),
+                                self.soft_deadline,
+                                self.hard_deadline,
+                                validate=lambda response: parse_json_response(response[0]) is not None,
+                                on_hedge=lease.charge_extra_request
+                            )
+                    except RateLimitError:
+                        limiter.backoff(self.model_name)
+                        raise
+                    lease.record_usage(tokens_used)
             
             # Parse response
-            result = self.parse_response(response.content)
+            result = self.parse_response(response_text)
+            
+            # Only cache responses that parsed cleanly
+            if cache and not cached and "error" not in result:
+                await cache.set(cache_key, {"content": response_text, "tokens_used": tokens_used})
             
             # Calculate metrics
             duration_ms = int((time.time() - start_time) * 1000)
-            tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
             
             # Extract confidence from result
             confidence = result.get('confidence', 0.7)
@@ -97,7 +202,8 @@ class BaseAgent(ABC):
                 confidence=min(max(confidence, 0), 1),  # Clamp between 0 and 1
                 tools_used=[],
                 tokens_used=tokens_used,
-                duration_ms=duration_ms
+                duration_ms=duration_ms,
+                cached=cached is not None
             )
             
             logger.info(f"Agent {self.name} completed in {duration_ms}ms")
@@ -114,9 +220,58 @@ class BaseAgent(ABC):
                 confidence=0.0,
                 tools_used=[],
                 tokens_used=0,
-                duration_ms=duration_ms
+                duration_ms=duration_ms,
+                failed=True
             )
     
+    def _llm_kwargs(self, max_tokens: Optional[int]) -> Dict[str, Any]:
+        """Per-call overrides of the parameters bound in ``__init__``."""
+        if max_tokens is None or max_tokens == self.config.max_tokens:
+            return {}
+        return {"max_tokens": max_tokens}
+    
+    async def _call_llm(self, messages: List[Any], max_tokens: Optional[int] = None) -> Tuple[str, int]:
+        """Send the messages to the LLM, returning the text and tokens used."""
+        response = await self.llm.ainvoke(messages, **self._llm_kwargs(max_tokens))
+        tokens_used = response.response_metadata.get('token_usage', {}).get('total_tokens', 0)
+        return response.content, tokens_used
+    
+    async def _stream_llm(
+        self,
+        messages: List[Any],
+        on_token: TokenCallback,
+        on_field: Optional[FieldCallback] = None,
+        on_hedge: Optional[Callable[[], None]] = None,
+        max_tokens: Optional[int] = None
+    ) -> Tuple[str, int]:
+        """
+        Stream the completion, forwarding fragments and completed fields.
+        
+        The stream is hedged on time to first chunk.
+        """
+        parts: List[str] = []
+        tokens_used = 0
+        parser = IncrementalJSONParser()
+        stream = get_hedger().stream(
+            self.name,
+            lambda: self.llm.astream(messages, **self._llm_kwargs(max_tokens)),
+            self.soft_deadline,
+            on_hedge=on_hedge
+        )
+        
+        async for chunk in stream:
+            if chunk.content:
+                parts.append(chunk.content)
+                await on_token(chunk.content)
+                if on_field:
+                    for key, value in parser.feed(chunk.content):
+                        await on_field(key, value)
+            # Usage arrives on the final chunk when stream_usage is enabled
+            if chunk.usage_metadata:
+                tokens_used = chunk.usage_metadata.get('total_tokens', tokens_used)
+        
+        return "".join(parts), tokens_used
+    
     def _build_reasoning(self, result: Dict[str, Any]) -> str:
         """Build a reasoning summary from the result."""
         reasoning_parts = []
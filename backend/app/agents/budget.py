@@ -0,0 +1,71 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+@dataclass
+class LatencyBudget:
+    """
+    Wall-clock budget for one analysis, from ``preferences.deadline_ms``.
+
+    The budget is measured from the start of execution and decides how the
+    orchestrator degrades: short budgets skip memory retrieval or fuse the
+    pipeline into a single decision call, and every phase's completion is
+    capped at what can be generated in the time left.
+    """
+    deadline_ms: int
+    started_at: float
+
+    @classmethod
+    def from_context(cls, context: Dict[str, Any]) -> Optional["LatencyBudget"]:
+        """Build a budget from analysis preferences, or None without a deadline."""
+        value = context.get("deadline_ms")
+        if value is None:
+            return None
+        try:
+            deadline_ms = int(value)
+        except (TypeError, ValueError):
+            deadline_ms = 0
+        if deadline_ms <= 0:
+            logger.warning(f"Ignoring invalid deadline_ms: {value!r}")
+            return None
+        return cls(deadline_ms=deadline_ms, started_at=asyncio.get_running_loop().time())
+
+    @property
+    def total(self) -> float:
+        """Budget in seconds."""
+        return self.deadline_ms / 1000
+
+    @property
+    def deadline(self) -> float:
+        """Event loop time at which the budget runs out."""
+        return self.started_at + self.total
+
+    def remaining(self, until: Optional[float] = None) -> float:
+        """Seconds left before ``until`` (default: the end of the budget)."""
+        end = self.deadline if until is None else until
+        return max(end - asyncio.get_running_loop().time(), 0.0)
+
+    @property
+    def skip_memory(self) -> bool:
+        return self.deadline_ms < settings.DEADLINE_SKIP_MEMORY_BELOW_MS
+
+    @property
+    def fuse_phases(self) -> bool:
+        return self.deadline_ms < settings.DEADLINE_FUSE_BELOW_MS
+
+    @property
+    def final_phase_reserve(self) -> float:
+        """Seconds held back for the final phase(s)."""
+        return self.total * settings.DEADLINE_FINAL_PHASE_SHARE
+
+    def max_tokens(self, seconds: float, configured: int) -> int:
+        """Largest completion that fits in ``seconds``, never above ``configured``."""
+        affordable = int(seconds * settings.LLM_OUTPUT_TOKENS_PER_SECOND)
+        return min(configured, max(affordable, settings.DEADLINE_MIN_MAX_TOKENS))
@@ -1,7 +1,6 @@
-import json
-import re
 from typing import Dict, Any
 from app.agents.base import BaseAgent
+from app.agents.json_stream import parse_json_response
 from app.schemas import AgentConfig, AgentInput
 
 
@@ -86,6 +85,22 @@ Respond ONLY with the JSON object, no additional text."""
 class DecisionAgent(BaseAgent):
     """Agent responsible for making the final decision."""
     
+    input_keys = ['Research Agent', 'Analysis Agent', 'Risk Agent']
+    context_fields = {
+        'Research Agent': [
+            'market_overview', 'competitors', 'industry_insights', 'data_gaps', 'confidence'
+        ],
+        'Analysis Agent': [
+            'market_viability', 'technical_feasibility', 'business_model_analysis',
+            'competitive_position', 'key_success_factors', 'critical_assumptions',
+            'overall_analysis_score', 'reasoning', 'confidence'
+        ],
+        'Risk Agent': [
+            'risks', 'risk_matrix_summary', 'overall_risk_score', 'top_3_concerns',
+            'risk_appetite_recommendation', 'confidence'
+        ],
+    }
+    
     def __init__(self):
         config = AgentConfig(
             name="Decision Agent",
@@ -93,7 +108,10 @@ class DecisionAgent(BaseAgent):
             system_prompt=DECISION_SYSTEM_PROMPT,
             allowed_tools=[],
             temperature=0.5,
-            max_tokens=4000
+            max_tokens=4000,
+            # Longest completion in the pipeline
+            soft_deadline_seconds=45.0,
+            hard_deadline_seconds=150.0
         )
         super().__init__(config)
     
@@ -101,9 +119,9 @@ class DecisionAgent(BaseAgent):
         return DECISION_SYSTEM_PROMPT
     
     def format_task(self, input_data: AgentInput) -> str:
-        research_data = input_data.previous_outputs.get('Research Agent', {})
-        analysis_data = input_data.previous_outputs.get('Analysis Agent', {})
-        risk_data = input_data.previous_outputs.get('Risk Agent', {})
+        research_data = self.format_previous(input_data, 'Research Agent')
+        analysis_data = self.format_previous(input_data, 'Analysis Agent')
+        risk_data = self.format_previous(input_data, 'Risk Agent')
         
         task = f"""
 ## DECISION TASK
@@ -115,21 +133,21 @@ class DecisionAgent(BaseAgent):
 
 ### RESEARCH FINDINGS (from Research Agent):
 ```json
-{json.dumps(research_data, indent=2)}
+{research_data}
 ```
 
 ---
 
 ### ANALYSIS RESULTS (from Analysis Agent):
 ```json
-{json.dumps(analysis_data, indent=2)}
+{analysis_data}
 ```
 
 ---
 
 ### RISK ASSESSMENT (from Risk Agent):
 ```json
-{json.dumps(risk_data, indent=2)}
+{risk_data}
 ```
 
 ---
@@ -147,19 +165,16 @@ Make your decision and return it in the specified JSON format.
     
     def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse the JSON response from the LLM."""
-        try:
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return {
-                "error": "Failed to parse response",
-                "raw_response": response[:500],
-                "verdict": "CONDITIONAL",
-                "summary": "Unable to parse decision - manual review required",
-                "key_factors": [],
-                "recommendations": [],
-                "next_steps": ["Review raw output manually"],
-                "confidence": 0.3
-            }
+        result = parse_json_response(response)
+        if result is not None:
+            return result
+        return {
+            "error": "Failed to parse response",
+            "raw_response": response[:500],
+            "verdict": "CONDITIONAL",
+            "summary": "Unable to parse decision - manual review required",
+            "key_factors": [],
+            "recommendations": [],
+            "next_steps": ["Review raw output manually"],
+            "confidence": 0.3
+        }
@@ -0,0 +1,190 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCALAR_TERMINATORS = ",}] \t\r\n"
+
+
+class _Frame:
+    """An open object or array on the parser stack."""
+    __slots__ = ("kind", "state", "key", "value_start")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        # Objects expect key -> colon -> value -> comma, arrays value -> comma
+        self.state = "key" if kind == "{" else "value"
+        self.key: Optional[str] = None
+        self.value_start = 0
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for the JSON object an agent streams back.
+
+    Text before the first ``{`` (prose, code fences) is ignored. Each
+    top-level field is emitted from ``feed`` as soon as its value closes, and
+    ``finish`` repairs common truncation such as unterminated strings or
+    arrays when the completion hit ``max_tokens``.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self.repaired = False
+        self._pos = 0
+        self._root_start: Optional[int] = None
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._scalar_start: Optional[int] = None
+        # Last position where cutting the text and closing the stack is valid JSON
+        self._safe_point: Optional[Tuple[int, str]] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Consume a chunk, returning top-level fields completed by it."""
+        self.text += chunk
+        emitted: List[Tuple[str, Any]] = []
+        text = self.text
+        i = self._pos
+
+        while i < len(text) and not self.done:
+            ch = text[i]
+
+            if self._root_start is None:
+                if ch == "{":
+                    self._root_start = i
+                    self._stack.append(_Frame("{"))
+                    self._safe_point = (i + 1, "}")
+                i += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._string_is_key:
+                        frame = self._stack[-1]
+                        try:
+                            frame.key = json.loads(text[self._string_start:i + 1])
+                        except ValueError:
+                            frame.key = text[self._string_start + 1:i]
+                        frame.state = "colon"
+                    else:
+                        self._value_done(self._string_start, i + 1, emitted)
+                i += 1
+                continue
+
+            if self._scalar_start is not None:
+                if ch not in SCALAR_TERMINATORS:
+                    i += 1
+                    continue
+                self._value_done(self._scalar_start, i, emitted)
+                self._scalar_start = None
+
+            frame = self._stack[-1]
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = frame.kind == "{" and frame.state == "key"
+                if not self._string_is_key:
+                    frame.value_start = i
+            elif ch in "{[":
+                frame.value_start = i
+                self._stack.append(_Frame(ch))
+                self._safe_point = (i + 1, self._closers())
+            elif ch in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self.done = True
+                else:
+                    self._value_done(self._stack[-1].value_start, i + 1, emitted)
+            elif ch == ":":
+                frame.state = "value"
+            elif ch == ",":
+                frame.state = "key" if frame.kind == "{" else "value"
+            elif not ch.isspace():
+                self._scalar_start = i
+                frame.value_start = i
+            i += 1
+
+        self._pos = i
+        return emitted
+
+    def finish(self) -> Optional[Dict[str, Any]]:
+        """Return the parsed object, repairing a truncated tail if needed."""
+        if self._root_start is None:
+            return None
+
+        if self.done:
+            try:
+                return json.loads(self.text[self._root_start:self._pos])
+            except ValueError:
+                return None
+
+        body = self.text[self._root_start:]
+        closers = self._closers()
+        candidates = []
+        if self._in_string and not self._string_is_key:
+            # Close the truncated string value, dropping a dangling escape
+            candidates.append((body[:-1] if self._escape else body) + '"' + closers)
+        if self._scalar_start is not None:
+            candidates.append(body.rstrip() + closers)
+        if self._safe_point is not None:
+            pos, safe_closers = self._safe_point
+            candidates.append(self.text[self._root_start:pos] + safe_closers)
+
+        for candidate in candidates:
+            try:
+                result = json.loads(candidate)
+            except ValueError:
+                continue
+            if isinstance(result, dict):
+                self.repaired = True
+                return result
+        return None
+
+    def _value_done(self, start: int, end: int, emitted: List[Tuple[str, Any]]) -> None:
+        frame = self._stack[-1]
+        frame.state = "comma"
+        self._safe_point = (end, self._closers())
+
+        # Only fields of the root object are emitted
+        if len(self._stack) == 1 and frame.key is not None:
+            try:
+                value = json.loads(self.text[start:end])
+            except ValueError:
+                return
+            self.fields[frame.key] = value
+            emitted.append((frame.key, value))
+
+    def _closers(self) -> str:
+        return "".join("}" if frame.kind == "{" else "]" for frame in reversed(self._stack))
+
+
+def parse_json_response(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse the JSON object in an LLM response.
+
+    Returns None when no object can be recovered.
+    """
+    try:
+        result = json.loads(response)
+        if isinstance(result, dict):
+            return result
+    except ValueError:
+        pass
+
+    parser = IncrementalJSONParser()
+    parser.feed(response)
+    result = parser.finish()
+    if result is not None and parser.repaired:
+        logger.warning(f"Repaired truncated JSON response ({len(result)} top-level fields recovered)")
+    return result
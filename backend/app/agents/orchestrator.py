@@ -1,14 +1,18 @@
 import asyncio
 import logging
 import time
-from typing import Dict, Any, List, Optional, AsyncGenerator
+from typing import Dict, Any, List, Optional, AsyncGenerator, Callable, Awaitable
 from datetime import datetime
 from uuid import UUID, uuid4
 
+from app.agents.base import BaseAgent
 from app.agents.research import ResearchAgent
 from app.agents.analyst import AnalystAgent
 from app.agents.risk import RiskAgent
 from app.agents.decision import DecisionAgent
+from app.agents.scheduler import PipelineNode, DAGScheduler, DeadlineExceeded, build_pipeline
+from app.agents.budget import LatencyBudget
+from app.agents.prompt_context import PromptContextBuilder
 from app.schemas import (
     AgentInput, 
     AgentOutput, 
@@ -18,153 +22,528 @@ from app.schemas import (
     KeyFactor,
     RiskItem
 )
+from app.config import get_settings
 from app.memory import search_similar_memories, add_memory
 from app.reasoning.logger import ReasoningLogger
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Persists a finished phase's output so a failed analysis can resume
+CheckpointCallback = Callable[[str, AgentOutput], Awaitable[None]]
+
+# Loads the phase outputs stored with a past analysis, keyed by agent name
+OutputsLoader = Callable[[str], Awaitable[Dict[str, Dict[str, Any]]]]
+
+
+class PhaseFailedError(Exception):
+    """Raised when an agent could not produce a result for its phase."""
+    
+    def __init__(self, agent_name: str, error: str):
+        self.agent_name = agent_name
+        super().__init__(f"{agent_name} failed: {error}")
+
+
+# Status reported while each default phase is running
+PHASE_STATUSES = {
+    "research": AnalysisStatus.RESEARCHING,
+    "analyst": AnalysisStatus.ANALYZING,
+    "risk": AnalysisStatus.ASSESSING_RISKS,
+    "decision": AnalysisStatus.DECIDING,
+}
+
+# Progress reported for each status
+PHASE_PROGRESS = {
+    AnalysisStatus.RESEARCHING: 25,
+    AnalysisStatus.ANALYZING: 50,
+    AnalysisStatus.ASSESSING_RISKS: 75,
+    AnalysisStatus.DECIDING: 90,
+    AnalysisStatus.COMPLETED: 100,
+}
 
 
 class AgentOrchestrator:
     """
     Orchestrates the multi-agent workflow for decision analysis.
     
-    Flow:
+    Flow (default pipeline):
     1. Research Agent → Gather data
     2. Analysis Agent → Analyze findings
     3. Risk Agent → Assess risks
     4. Decision Agent → Make final decision
+    
+    The flow is a dependency graph derived from each agent's ``input_keys``;
+    pass a custom ``pipeline`` to add nodes that run alongside the defaults.
     """
     
-    def __init__(self, analysis_id: UUID):
+    def __init__(
+        self,
+        analysis_id: UUID,
+        pipeline: Optional[List[PipelineNode]] = None
+    ):
         self.analysis_id = analysis_id
-        self.agents = {
-            "research": ResearchAgent(),
-            "analyst": AnalystAgent(),
-            "risk": RiskAgent(),
-            "decision": DecisionAgent()
-        }
+        if pipeline is None:
+            agents = {
+                "research": ResearchAgent(),
+                "analyst": AnalystAgent(),
+                "risk": RiskAgent(),
+                "decision": DecisionAgent()
+            }
+            pipeline = build_pipeline(agents, PHASE_STATUSES, memory_nodes=["research"])
+        self.pipeline = pipeline
+        self.scheduler = DAGScheduler(pipeline)
+        self.agents = {node.key: node.agent for node in pipeline}
         self.agent_outputs: Dict[str, AgentOutput] = {}
         self.reasoning_steps: List[AgentStep] = []
         self.reasoning_logger = ReasoningLogger(analysis_id)
+        self.prompt_context = PromptContextBuilder()
         self.status = AnalysisStatus.PENDING
         self.current_agent: Optional[str] = None
         self.start_time: Optional[float] = None
+        self.reused_from: Optional[Dict[str, Any]] = None
+        self.resumed_phases: List[str] = []
+        self.degradations: List[str] = []
+        self._on_checkpoint: Optional[CheckpointCallback] = None
+        self._active_nodes: List[PipelineNode] = []
+        self._subscribers: List[asyncio.Queue] = []
+    
+    def subscribe(self, max_queued: int = 1000) -> asyncio.Queue:
+        """Register a queue that receives streamed agent events."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self._subscribers.append(queue)
+        return queue
+    
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Stop delivering events to a queue."""
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+    
+    def _emit(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Deliver an event to every subscriber without blocking the pipeline."""
+        event = {"type": event_type, "data": data}
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                logger.debug(f"Dropping {event_type} event for slow subscriber")
+    
+    def _emit_status(self) -> None:
+        """Publish the current status to subscribers as a ``status`` event."""
+        self._emit("status", self.get_status())
     
     async def execute(
         self, 
         problem_statement: str,
-        context: Optional[Dict[str, Any]] = None
+        context: Optional[Dict[str, Any]] = None,
+        memories: Optional[List[Dict[str, Any]]] = None,
+        checkpoints: Optional[Dict[str, Dict[str, Any]]] = None,
+        on_checkpoint: Optional[CheckpointCallback] = None,
+        load_outputs: Optional[OutputsLoader] = None
     ) -> Dict[str, Any]:
         """
         Execute the full multi-agent analysis workflow.
+        
+        Phases run as soon as the outputs they read are available, so
+        independent phases execute concurrently. Pass ``memories`` to skip the
+        memory lookup when they were already retrieved (e.g. for a batch).
+        
+        ``on_checkpoint`` receives each phase's output as it succeeds; pass
+        those outputs back as ``checkpoints`` (keyed by agent name) to resume
+        a failed analysis with only the missing phases. ``load_outputs``
+        fetches the outputs of a near-duplicate past analysis for reuse;
+        without it nothing is reused.
+        
+        With ``context["deadline_ms"]`` the run is planned within that budget
+        and degrades instead of overrunning it (see ``_run_within_budget``).
         """
         self.start_time = time.time()
+        context = context or {}
+        self._on_checkpoint = on_checkpoint
+        budget = LatencyBudget.from_context(context)
         
         try:
-            # Get relevant memories for context
-            memory_context = await self._get_memory_context(problem_statement)
+            # Restore phases finished by an earlier attempt
+            restored = self._apply_checkpoints(checkpoints or {}, problem_statement)
+            if len(restored) == len(self.pipeline):
+                return self._finish()
             
-            # Phase 1: Research
-            self.status = AnalysisStatus.RESEARCHING
-            self.current_agent = "Research Agent"
-            research_output = await self._execute_agent(
-                "research",
-                problem_statement,
-                context or {},
-                memory_context
-            )
+            # Get relevant memories for context
+            if memories is None and budget and budget.skip_memory:
+                memories = []
+                self._degrade("Skipped memory retrieval")
+            elif memories is None:
+                memories = await self._get_memories(problem_statement)
+            memory_context = self._format_memory_context(memories)
             
-            # Phase 2: Analysis
-            self.status = AnalysisStatus.ANALYZING
-            self.current_agent = "Analysis Agent"
-            analysis_output = await self._execute_agent(
-                "analyst",
-                problem_statement,
-                context or {},
-                None
-            )
+            # Fast path: reuse a near-duplicate past analysis if allowed
+            completed: List[str] = list(restored)
+            if load_outputs and not restored and context.get("allow_reuse", settings.ANALYSIS_REUSE_ENABLED):
+                match = self._find_reusable_analysis(memories)
+                if match:
+                    completed = await self._apply_reuse(match, load_outputs, problem_statement)
+                    if len(completed) == len(self.pipeline):
+                        return self._finish()
             
-            # Phase 3: Risk Assessment
-            self.status = AnalysisStatus.ASSESSING_RISKS
-            self.current_agent = "Risk Agent"
-            risk_output = await self._execute_agent(
-                "risk", 
-                problem_statement,
-                context or {},
-                None
-            )
+            if budget:
+                await self._run_within_budget(problem_statement, context, memory_context, completed, budget)
+            else:
+                async def run_node(node: PipelineNode) -> AgentOutput:
+                    return await self._run_node(
+                        node,
+                        problem_statement,
+                        context,
+                        memory_context if node.use_memory else None
+                    )
+                
+                await self.scheduler.run(run_node, completed=completed)
             
-            # Phase 4: Decision
-            self.status = AnalysisStatus.DECIDING
-            self.current_agent = "Decision Agent"
-            decision_output = await self._execute_agent(
-                "decision",
-                problem_statement,
-                context or {},
-                None
-            )
+            # Store insights in memory for future reference; degraded
+            # answers are not good enough to be reused
+            decision_output = self.agent_outputs.get("Decision Agent")
+            if decision_output and not self.degradations:
+                await self._store_insights(problem_statement, decision_output)
             
             # Compile final result
-            self.status = AnalysisStatus.COMPLETED
-            self.current_agent = None
-            
-            total_duration = int((time.time() - self.start_time) * 1000)
-            
-            # Store insights in memory for future reference
-            await self._store_insights(problem_statement, decision_output)
-            
-            return self._compile_result(total_duration)
+            return self._finish()
             
+        except asyncio.CancelledError:
+            self.status = AnalysisStatus.CANCELLED
+            self.current_agent = None
+            self._emit_status()
+            raise
         except Exception as e:
             logger.error(f"Orchestrator failed: {str(e)}")
             self.status = AnalysisStatus.FAILED
+            self._emit_status()
             raise
     
-    async def _get_memory_context(self, problem: str) -> Optional[str]:
-        """Retrieve relevant memories for context."""
+    def _finish(self) -> Dict[str, Any]:
+        """Mark the analysis completed and compile the final result."""
+        self.status = AnalysisStatus.COMPLETED
+        self.current_agent = None
+        self._emit_status()
+        total_duration = int((time.time() - self.start_time) * 1000)
+        return self._compile_result(total_duration)
+    
+    def _degrade(self, description: str) -> None:
+        """Record a shortcut taken to stay within the latency budget."""
+        self.degradations.append(description)
+        logger.info(f"Analysis {self.analysis_id} degraded: {description}")
+    
+    async def _run_within_budget(
+        self,
+        problem: str,
+        context: Dict[str, Any],
+        memory_context: Optional[str],
+        completed: List[str],
+        budget: LatencyBudget
+    ) -> None:
+        """
+        Run the pipeline so that a decision is available before the deadline.
+        
+        Upstream phases get the budget minus a reserve for the final phase(s)
+        and are cut off when it runs out; failed or unfinished phases are
+        dropped rather than failing the analysis. Very short budgets skip
+        straight to the final phase. When no decision arrives in time a
+        best-effort one is derived from whatever phases did complete.
+        """
+        final_keys = {
+            node.key for node in self.pipeline
+            if not any(node.key in other.depends_on for other in self.pipeline)
+        }
+        upstream_keys = {node.key for node in self.pipeline} - final_keys
+        
+        async def run_stage(keys: set, done: List[str], deadline: float) -> None:
+            async def run_node(node: PipelineNode) -> AgentOutput:
+                seconds = budget.remaining(deadline) / self._chain_length(node.key, keys)
+                max_tokens = budget.max_tokens(seconds, node.agent.config.max_tokens)
+                if max_tokens < node.agent.config.max_tokens:
+                    self._degrade(f"Capped {node.agent.name} at {max_tokens} output tokens")
+                return await self._run_node(
+                    node,
+                    problem,
+                    context,
+                    memory_context if node.use_memory else None,
+                    max_tokens=max_tokens
+                )
+            
+            try:
+                await self.scheduler.run(run_node, completed=done, only=keys, deadline=deadline)
+            except DeadlineExceeded as e:
+                names = [self.scheduler.nodes[key].agent.name for key in e.pending]
+                self._degrade(f"Out of time before {', '.join(names)} finished")
+            except PhaseFailedError as e:
+                self.agent_outputs.pop(e.agent_name, None)
+                self._degrade(str(e))
+        
+        pending_upstream = upstream_keys - set(completed)
+        if pending_upstream and budget.fuse_phases:
+            names = [self.scheduler.nodes[key].agent.name for key in sorted(pending_upstream)]
+            self._degrade(f"Fused phases: skipped {', '.join(names)} and decided directly")
+        elif pending_upstream:
+            await run_stage(upstream_keys, completed, budget.deadline - budget.final_phase_reserve)
+        
+        # Final phases run with whatever upstream output exists
+        await run_stage(final_keys, [*upstream_keys, *completed], budget.deadline)
+        
+        if "Decision Agent" not in self.agent_outputs:
+            self._best_effort_decision(problem)
+    
+    def _chain_length(self, key: str, keys: set) -> int:
+        """Number of phases on the longest path from ``key`` through ``keys``."""
+        children = [node.key for node in self.pipeline if key in node.depends_on and node.key in keys]
+        return 1 + max((self._chain_length(child, keys) for child in children), default=0)
+    
+    def _best_effort_decision(self, problem: str) -> None:
+        """Derive a low-confidence decision from the scores of completed phases."""
+        analysis = self.agent_outputs.get("Analysis Agent")
+        risk = self.agent_outputs.get("Risk Agent")
+        viability = analysis.result.get("overall_analysis_score") if analysis else None
+        risk_score = risk.result.get("overall_risk_score") if risk else None
+        viability = viability if isinstance(viability, (int, float)) else None
+        risk_score = risk_score if isinstance(risk_score, (int, float)) else None
+        
+        if viability is None and risk_score is None:
+            verdict, confidence = "CONDITIONAL", 0.2
+        else:
+            viability = 0.5 if viability is None else viability
+            risk_score = 0.5 if risk_score is None else risk_score
+            if viability >= 0.65 and risk_score < 0.5:
+                verdict = "GO"
+            elif viability < 0.4 or risk_score >= 0.7:
+                verdict = "NO-GO"
+            else:
+                verdict = "CONDITIONAL"
+            confidence = 0.4
+        
+        phases = [name for name in self.agent_outputs] or ["no"]
+        output = AgentOutput(
+            agent_name="Decision Agent",
+            result={
+                "verdict": verdict,
+                "summary": (
+                    f"Best-effort {verdict} based on {', '.join(phases)} output; "
+                    "the decision phase did not finish within the latency budget."
+                ),
+                "key_factors": [],
+                "next_steps": ["Re-run without a deadline for a full analysis"],
+                "confidence": confidence,
+                "best_effort": True
+            },
+            reasoning="Derived from the viability and risk scores of completed phases",
+            confidence=confidence,
+            tools_used=[],
+            tokens_used=0,
+            duration_ms=0
+        )
+        self.agent_outputs["Decision Agent"] = output
+        decision_agent = next(
+            (agent for agent in self.agents.values() if agent.name == "Decision Agent"), None
+        )
+        if decision_agent:
+            self._record_step(decision_agent, "Best-effort decision from completed phases", output, problem)
+        self._degrade("Returned a best-effort decision from completed phases")
+    
+    def _apply_checkpoints(
+        self,
+        checkpoints: Dict[str, Dict[str, Any]],
+        problem: str
+    ) -> List[str]:
+        """
+        Seed agent outputs saved by a previous attempt.
+        
+        Returns the pipeline node keys that no longer need to run.
+        """
+        restored = []
+        for node in self.pipeline:
+            data = checkpoints.get(node.agent.name)
+            if not data:
+                continue
+            output = AgentOutput(**data)
+            self.agent_outputs[node.agent.name] = output
+            self._record_step(node.agent, f"Restored {node.agent.role} output from checkpoint", output, problem)
+            restored.append(node.key)
+        
+        if restored:
+            self.resumed_phases = restored
+            logger.info(f"Analysis {self.analysis_id} resuming with {restored} already done")
+        return restored
+    
+    async def _run_node(
+        self,
+        node: PipelineNode,
+        problem: str,
+        context: Dict[str, Any],
+        memory_context: Optional[str],
+        max_tokens: Optional[int] = None
+    ) -> AgentOutput:
+        """Run one pipeline node, keeping status in sync with what is in flight."""
+        self._active_nodes.append(node)
+        self._refresh_phase()
+        try:
+            return await self._execute_agent(node.key, problem, context, memory_context, max_tokens)
+        finally:
+            self._active_nodes.remove(node)
+            self._refresh_phase()
+    
+    def _refresh_phase(self) -> None:
+        """Report the most recently started node(s) still running."""
+        if not self._active_nodes:
+            return
+        self.status = self._active_nodes[-1].status
+        self.current_agent = ", ".join(node.agent.name for node in self._active_nodes)
+        self._emit_status()
+    
+    async def _get_memories(self, problem: str) -> List[Dict[str, Any]]:
+        """Retrieve memories similar to the problem."""
         try:
-            memories = search_similar_memories(problem, n_results=3)
-            if memories:
-                context_parts = []
-                for mem in memories:
-                    context_parts.append(f"- {mem['text'][:200]}...")
-                return "\n".join(context_parts)
+            return search_similar_memories(problem, n_results=3)
         except Exception as e:
             logger.warning(f"Failed to retrieve memories: {e}")
+        return []
+    
+    def _format_memory_context(self, memories: List[Dict[str, Any]]) -> Optional[str]:
+        """Format retrieved memories as prompt context."""
+        if not memories:
+            return None
+        context_parts = []
+        for mem in memories:
+            context_parts.append(f"- {mem['text'][:200]}...")
+        return "\n".join(context_parts)
+    
+    def _find_reusable_analysis(
+        self,
+        memories: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """Find a stored analysis close and recent enough to reuse."""
+        max_age_seconds = settings.ANALYSIS_REUSE_MAX_AGE_HOURS * 3600
+        now = time.time()
+        
+        for mem in sorted(memories, key=lambda m: m.get("distance") if m.get("distance") is not None else float("inf")):
+            metadata = mem.get("metadata") or {}
+            distance = mem.get("distance")
+            if metadata.get("category") != "analysis_result" or not metadata.get("analysis_id"):
+                continue
+            if distance is None or distance > settings.ANALYSIS_REUSE_MAX_DISTANCE:
+                continue
+            if now - metadata.get("created_at", 0) > max_age_seconds:
+                continue
+            return mem
         return None
     
+    async def _apply_reuse(
+        self,
+        match: Dict[str, Any],
+        load_outputs: OutputsLoader,
+        problem: str
+    ) -> List[str]:
+        """
+        Seed agent outputs from a past analysis, loaded from its record.
+        
+        Returns the pipeline node keys that no longer need to run.
+        """
+        metadata = match["metadata"]
+        try:
+            stored = await load_outputs(metadata["analysis_id"])
+        except Exception as e:
+            logger.warning(f"Outputs of {metadata['analysis_id']} could not be loaded: {e}")
+            return []
+        
+        # In research mode only the research phase is reused
+        if settings.ANALYSIS_REUSE_MODE == "research":
+            reusable_nodes = [node for node in self.pipeline if node.use_memory]
+        else:
+            reusable_nodes = self.pipeline
+        
+        completed = []
+        for node in reusable_nodes:
+            data = stored.get(node.agent.name)
+            if not data:
+                continue
+            output = AgentOutput(**{**data, "tokens_used": 0, "duration_ms": 0, "cached": True})
+            self.agent_outputs[node.agent.name] = output
+            self._record_step(node.agent, f"Reused {node.agent.role} output", output, problem)
+            completed.append(node.key)
+        
+        if completed:
+            self.reused_from = {
+                "analysis_id": metadata.get("analysis_id"),
+                "distance": match.get("distance"),
+                "phases": completed,
+            }
+            logger.info(
+                f"Analysis {self.analysis_id} reusing {completed} from "
+                f"{metadata.get('analysis_id')} (distance {match.get('distance'):.3f})"
+            )
+        return completed
+    
     async def _execute_agent(
         self,
         agent_key: str,
         problem: str,
         context: Dict[str, Any],
-        memory_context: Optional[str]
+        memory_context: Optional[str],
+        max_tokens: Optional[int] = None
     ) -> AgentOutput:
         """Execute a single agent and log the results."""
         agent = self.agents[agent_key]
         
         # Build input with previous outputs
+        previous_outputs = {
+            name: self.agent_outputs[name].result
+            for name in agent.input_keys
+            if name in self.agent_outputs
+        }
         agent_input = AgentInput(
             task=problem,
             context=context,
-            previous_outputs={
-                name: output.result 
-                for name, output in self.agent_outputs.items()
-            },
-            memory_context=memory_context
+            previous_outputs=previous_outputs,
+            prompt_context=self.prompt_context.build(agent, previous_outputs),
+            memory_context=memory_context,
+            use_cache=not context.get("bypass_cache", False),
+            max_tokens=max_tokens
         )
         
-        # Execute agent
-        output = await agent.execute(agent_input)
+        async def on_token(text: str) -> None:
+            self._emit("token", {"agent": agent.name, "text": text})
+        
+        async def on_field(field: str, value: Any) -> None:
+            self._emit("field", {"agent": agent.name, "field": field, "value": value})
+        
+        # Execute agent, streaming tokens and completed fields to any subscribers
+        output = await agent.execute(agent_input, on_token=on_token, on_field=on_field)
         
         # Store output
         self.agent_outputs[agent.name] = output
         
         # Log reasoning step
+        self._record_step(agent, f"Executing {agent.role}", output, problem)
+        
+        # A failed LLM call stops the pipeline; finished phases stay checkpointed.
+        # An unparseable completion continues with the agent's fallback result.
+        if output.failed:
+            raise PhaseFailedError(agent.name, output.result["error"])
+        
+        if self._on_checkpoint:
+            try:
+                await self._on_checkpoint(agent.name, output)
+            except Exception as e:
+                logger.warning(f"Failed to checkpoint {agent.name} for {self.analysis_id}: {e}")
+        
+        return output
+    
+    def _record_step(
+        self,
+        agent: BaseAgent,
+        action: str,
+        output: AgentOutput,
+        problem: str = ""
+    ) -> AgentStep:
+        """Append a reasoning step for an agent output."""
         step = AgentStep(
             agent_name=agent.name,
             step_number=len(self.reasoning_steps) + 1,
-            action=f"Executing {agent.role}",
+            action=action,
             input_summary=problem[:200] + "..." if len(problem) > 200 else problem,
             output_summary=self._summarize_output(output.result),
             tools_used=output.tools_used,
@@ -175,8 +554,8 @@ class AgentOrchestrator:
         )
         self.reasoning_steps.append(step)
         self.reasoning_logger.log_step(step)
-        
-        return output
+        self._emit("step", step.model_dump(mode="json"))
+        return step
     
     def _summarize_output(self, result: Dict[str, Any]) -> str:
         """Create a brief summary of agent output."""
@@ -221,7 +600,10 @@ class AgentOrchestrator:
                     "analysis_id": str(self.analysis_id),
                     "verdict": result.get('verdict'),
                     "confidence": result.get('confidence', 0),
-                    "category": "analysis_result"
+                    "summary": (result.get('summary') or '')[:500],
+                    "category": "analysis_result",
+                    "created_at": time.time()
+                    # The phase outputs for reuse stay with the analysis record
                 }
             )
             
@@ -309,7 +691,11 @@ class AgentOrchestrator:
             "agent_outputs": {
                 name: output.result 
                 for name, output in self.agent_outputs.items()
-            }
+            },
+            "reused_from": self.reused_from,
+            "resumed_phases": self.resumed_phases,
+            "degraded": bool(self.degradations),
+            "degradations": self.degradations
         }
     
     def _get_research_summary(self, result: Dict[str, Any]) -> str:
@@ -357,23 +743,11 @@ class AgentOrchestrator:
     
     def get_status(self) -> Dict[str, Any]:
         """Get current orchestrator status for real-time updates."""
-        progress = 0
-        if self.status == AnalysisStatus.RESEARCHING:
-            progress = 25
-        elif self.status == AnalysisStatus.ANALYZING:
-            progress = 50
-        elif self.status == AnalysisStatus.ASSESSING_RISKS:
-            progress = 75
-        elif self.status == AnalysisStatus.DECIDING:
-            progress = 90
-        elif self.status == AnalysisStatus.COMPLETED:
-            progress = 100
-        
         return {
             "id": str(self.analysis_id),
             "status": self.status,
             "current_agent": self.current_agent,
-            "progress_percentage": progress,
+            "progress_percentage": PHASE_PROGRESS.get(self.status, 0),
             "completed_steps": len(self.reasoning_steps),
             "latest_step": self.reasoning_steps[-1] if self.reasoning_steps else None
         }
@@ -0,0 +1,111 @@
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Fields that never help a downstream agent
+DROPPED_FIELDS = {"raw_response"}
+
+# Progressively tighter (max list items, max string chars) used to fit a budget
+SHRINK_STEPS = [(5, 400), (3, 200), (2, 120), (1, 60)]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def minify(value: Any) -> str:
+    """Serialize JSON without whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def prune(result: Dict[str, Any], fields: Optional[List[str]]) -> Dict[str, Any]:
+    """Keep only the requested top-level fields (all when ``fields`` is None)."""
+    return {
+        key: value
+        for key, value in result.items()
+        if key not in DROPPED_FIELDS and (fields is None or key in fields)
+    }
+
+
+def _truncate(value: Any, max_items: int, max_chars: int) -> Any:
+    """Shorten lists and strings throughout a JSON value."""
+    if isinstance(value, dict):
+        return {k: _truncate(v, max_items, max_chars) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_truncate(v, max_items, max_chars) for v in value[:max_items]]
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + "…"
+    return value
+
+
+def fit_to_budget(value: Any, token_budget: int) -> str:
+    """Minify a value, shrinking lists and strings until it fits the budget."""
+    text = minify(value)
+    for max_items, max_chars in SHRINK_STEPS:
+        if estimate_tokens(text) <= token_budget:
+            break
+        text = minify(_truncate(value, max_items, max_chars))
+    if estimate_tokens(text) > token_budget:
+        logger.warning(f"Prompt context still {estimate_tokens(text)} tokens over a {token_budget} budget")
+    return text
+
+
+class PromptContextBuilder:
+    """
+    Builds compact digests of upstream agent outputs for prompts.
+
+    One builder lives for the duration of an analysis, so each upstream
+    output is serialized once per distinct field selection no matter how
+    many downstream agents embed it.
+    """
+
+    def __init__(self, token_budget: Optional[int] = None):
+        self.token_budget = token_budget or settings.PROMPT_CONTEXT_TOKEN_BUDGET
+        self._digests: Dict[Tuple[str, int, Optional[Tuple[str, ...]], int], str] = {}
+        self.tokens_saved = 0
+
+    def build(
+        self,
+        consumer: Any,
+        previous_outputs: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, str]:
+        """Return a digest per upstream output the consuming agent reads."""
+        sources = [key for key in consumer.input_keys if key in previous_outputs]
+        if not sources:
+            return {}
+
+        per_source_budget = self.token_budget // len(sources)
+        digests = {}
+        full_tokens = 0
+        for source in sources:
+            result = previous_outputs[source]
+            fields = consumer.context_fields.get(source)
+            digests[source] = self._digest(source, result, fields, per_source_budget)
+            full_tokens += estimate_tokens(json.dumps(result, indent=2, default=str))
+
+        digest_tokens = sum(estimate_tokens(d) for d in digests.values())
+        saved = max(full_tokens - digest_tokens, 0)
+        self.tokens_saved += saved
+        logger.info(
+            f"Prompt context for {consumer.name}: ~{digest_tokens} tokens "
+            f"(saved ~{saved} vs full JSON)"
+        )
+        return digests
+
+    def _digest(
+        self,
+        source: str,
+        result: Dict[str, Any],
+        fields: Optional[List[str]],
+        token_budget: int
+    ) -> str:
+        key = (source, id(result), tuple(fields) if fields is not None else None, token_budget)
+        if key not in self._digests:
+            self._digests[key] = fit_to_budget(prune(result, fields), token_budget)
+        return self._digests[key]
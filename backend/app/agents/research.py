@@ -1,7 +1,6 @@
-import json
-import re
 from typing import Dict, Any
 from app.agents.base import BaseAgent
+from app.agents.json_stream import parse_json_response
 from app.schemas import AgentConfig, AgentInput
 
 
@@ -94,22 +93,18 @@ Please gather comprehensive data on the above and return your findings in the sp
     
     def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse the JSON response from the LLM."""
-        try:
-            # Try to extract JSON from the response
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-            
-            # If no JSON found, try parsing the whole response
-            return json.loads(response)
-        except json.JSONDecodeError:
-            # Return a structured error response
-            return {
-                "error": "Failed to parse response",
-                "raw_response": response[:500],
-                "market_overview": {"market_size": "Unable to parse", "key_trends": []},
-                "competitors": [],
-                "target_market": {},
-                "industry_insights": [],
-                "confidence": 0.3
-            }
+        # Recovers the object even if the completion was truncated
+        result = parse_json_response(response)
+        if result is not None:
+            return result
+        
+        # Return a structured error response
+        return {
+            "error": "Failed to parse response",
+            "raw_response": response[:500],
+            "market_overview": {"market_size": "Unable to parse", "key_trends": []},
+            "competitors": [],
+            "target_market": {},
+            "industry_insights": [],
+            "confidence": 0.3
+        }
@@ -1,7 +1,6 @@
-import json
-import re
 from typing import Dict, Any
 from app.agents.base import BaseAgent
+from app.agents.json_stream import parse_json_response
 from app.schemas import AgentConfig, AgentInput
 
 
@@ -83,6 +82,19 @@ Respond ONLY with the JSON object, no additional text."""
 class RiskAgent(BaseAgent):
     """Agent responsible for identifying and assessing risks."""
     
+    input_keys = ['Research Agent', 'Analysis Agent']
+    context_fields = {
+        'Research Agent': [
+            'market_overview', 'competitors', 'target_market',
+            'industry_insights', 'data_gaps', 'confidence'
+        ],
+        'Analysis Agent': [
+            'market_viability', 'technical_feasibility', 'business_model_analysis',
+            'competitive_position', 'critical_assumptions', 'overall_analysis_score',
+            'confidence'
+        ],
+    }
+    
     def __init__(self):
         config = AgentConfig(
             name="Risk Agent",
@@ -98,8 +110,8 @@ class RiskAgent(BaseAgent):
         return RISK_SYSTEM_PROMPT
     
     def format_task(self, input_data: AgentInput) -> str:
-        research_data = input_data.previous_outputs.get('Research Agent', {})
-        analysis_data = input_data.previous_outputs.get('Analysis Agent', {})
+        research_data = self.format_previous(input_data, 'Research Agent')
+        analysis_data = self.format_previous(input_data, 'Analysis Agent')
         
         task = f"""
 ## RISK ASSESSMENT TASK
@@ -109,12 +121,12 @@ class RiskAgent(BaseAgent):
 
 **Research Findings:**
 ```json
-{json.dumps(research_data, indent=2)}
+{research_data}
 ```
 
 **Analysis Results:**
 ```json
-{json.dumps(analysis_data, indent=2)}
+{analysis_data}
 ```
 
 **Risk Assessment Focus:**
@@ -129,18 +141,15 @@ Please conduct a thorough risk assessment and return your findings in the specif
     
     def parse_response(self, response: str) -> Dict[str, Any]:
         """Parse the JSON response from the LLM."""
-        try:
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return {
-                "error": "Failed to parse response",
-                "raw_response": response[:500],
-                "risks": [],
-                "risk_matrix_summary": {},
-                "overall_risk_score": 0.5,
-                "top_3_concerns": ["Unable to parse risk assessment"],
-                "confidence": 0.3
-            }
+        result = parse_json_response(response)
+        if result is not None:
+            return result
+        return {
+            "error": "Failed to parse response",
+            "raw_response": response[:500],
+            "risks": [],
+            "risk_matrix_summary": {},
+            "overall_risk_score": 0.5,
+            "top_3_concerns": ["Unable to parse risk assessment"],
+            "confidence": 0.3
+        }
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from app.agents.base import BaseAgent
+from app.schemas import AnalysisStatus
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a run hits its deadline; carries the nodes that did finish."""
+
+    def __init__(self, results: Dict[str, Any], pending: List[str]):
+        self.results = results
+        self.pending = pending
+        super().__init__(f"Deadline exceeded with {pending} unfinished")
+
+
+@dataclass
+class PipelineNode:
+    """A single agent phase in the analysis pipeline."""
+    key: str
+    agent: BaseAgent
+    status: AnalysisStatus
+    depends_on: List[str] = field(default_factory=list)
+    use_memory: bool = False
+
+
+def build_pipeline(
+    agents: Dict[str, BaseAgent],
+    statuses: Dict[str, AnalysisStatus],
+    memory_nodes: Iterable[str] = ()
+) -> List[PipelineNode]:
+    """
+    Build pipeline nodes from the inputs each agent declares.
+
+    An agent's ``input_keys`` name the ``previous_outputs`` entries it reads,
+    so every key is mapped back to the node whose agent produces it.
+    """
+    producers = {agent.name: key for key, agent in agents.items()}
+    memory_nodes = set(memory_nodes)
+
+    nodes = []
+    for key, agent in agents.items():
+        missing = [name for name in agent.input_keys if name not in producers]
+        if missing:
+            raise ValueError(f"Node '{key}' reads outputs nobody produces: {missing}")
+
+        nodes.append(PipelineNode(
+            key=key,
+            agent=agent,
+            status=statuses.get(key, AnalysisStatus.PENDING),
+            depends_on=[producers[name] for name in agent.input_keys],
+            use_memory=key in memory_nodes
+        ))
+    return nodes
+
+
+class DAGScheduler:
+    """
+    Runs pipeline nodes as soon as their dependencies are satisfied.
+
+    Independent nodes run concurrently; the first failure cancels everything
+    still in flight and is re-raised to the caller.
+    """
+
+    def __init__(self, nodes: List[PipelineNode]):
+        self.nodes = {node.key: node for node in nodes}
+        if len(self.nodes) != len(nodes):
+            raise ValueError("Pipeline node keys must be unique")
+        self._validate()
+
+    def _validate(self) -> None:
+        """Reject unknown dependencies and cycles."""
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"Node '{node.key}' depends on unknown node '{dep}'")
+
+        # Kahn's algorithm - any node left over is part of a cycle
+        remaining = {key: set(node.depends_on) for key, node in self.nodes.items()}
+        while remaining:
+            ready = [key for key, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Pipeline has a dependency cycle between: {sorted(remaining)}")
+            for key in ready:
+                del remaining[key]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    def topological_order(self) -> List[str]:
+        """Return node keys in a valid execution order."""
+        order: List[str] = []
+        done: Set[str] = set()
+        while len(order) < len(self.nodes):
+            for key, node in self.nodes.items():
+                if key not in done and all(dep in done for dep in node.depends_on):
+                    order.append(key)
+                    done.add(key)
+        return order
+
+    async def run(
+        self,
+        run_node: Callable[[PipelineNode], Awaitable[Any]],
+        completed: Optional[Iterable[str]] = None,
+        only: Optional[Iterable[str]] = None,
+        deadline: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute every node not already in ``completed``.
+
+        ``only`` restricts the run to a subset of nodes. With a ``deadline``
+        (event loop time) nodes still running when it passes are cancelled and
+        ``DeadlineExceeded`` is raised with the results gathered so far.
+
+        Returns the result of each node that ran, keyed by node key.
+        """
+        done: Set[str] = set(completed or [])
+        selected = set(only) if only is not None else set(self.nodes)
+        results: Dict[str, Any] = {}
+        running: Dict[asyncio.Task, str] = {}
+        loop = asyncio.get_running_loop()
+
+        def launch_ready() -> None:
+            started = set(running.values())
+            for key, node in self.nodes.items():
+                if key in done or key in started or key not in selected:
+                    continue
+                if all(dep in done for dep in node.depends_on):
+                    logger.debug(f"Scheduling node {key}")
+                    running[asyncio.create_task(run_node(node))] = key
+
+        launch_ready()
+        try:
+            while running:
+                timeout = None if deadline is None else max(deadline - loop.time(), 0)
+                finished, _ = await asyncio.wait(
+                    running.keys(),
+                    timeout=timeout,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if not finished:
+                    raise DeadlineExceeded(
+                        results,
+                        sorted(key for key in selected - done if key in self.nodes)
+                    )
+                for task in finished:
+                    key = running.pop(task)
+                    results[key] = task.result()
+                    done.add(key)
+                launch_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running.keys(), return_exceptions=True)
+
+        return results
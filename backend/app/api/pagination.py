@@ -0,0 +1,42 @@
+"""Opaque keyset cursors for paging through analyses newest first.
+
+A cursor names the last item of a page by its ``(created_at, analysis_id)``
+key; the next page starts strictly after it. Unlike ``skip``, the cost of a
+page does not grow with its depth, and analyses created while paging do
+not shift later pages.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from fastapi import HTTPException
+
+Cursor = Tuple[datetime, str]
+
+
+def encode_cursor(created_at: Any, analysis_id: str) -> str:
+    """Cursor for the item after which the next page starts."""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    raw = json.dumps([created_at, analysis_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Key encoded in a cursor; a malformed one is a 400."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        created_at, analysis_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(analysis_id)
+    except (ValueError, TypeError) as e:
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor") from e
+
+
+def after_query(cursor: Cursor) -> Dict[str, Any]:
+    """MongoDB filter for items sorted after ``cursor`` (newest first)."""
+    created_at, analysis_id = cursor
+    return {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "analysis_id": {"$lt": analysis_id}},
+    ]}
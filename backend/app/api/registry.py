@@ -0,0 +1,384 @@
+"""Bounded in-process registries for analysis state.
+
+The analysis routes keep in-flight state (result records and orchestrators)
+in module-level mappings. ``BoundedRegistry`` is a drop-in ``dict``
+replacement that caps entry count and approximate memory, expires finished
+entries after a TTL and evicts the least recently used ones. Entries that
+are still running are never evicted. Evicted entries can be spilled to a
+``SpillStore`` and are transparently loaded back on access.
+``IndexedRegistry`` additionally keeps its keys sorted, overall and per
+bucket, for paging through them without a scan.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate in-memory footprint as the size of the JSON encoding."""
+    try:
+        return len(json.dumps(jsonable_encoder(value), default=str))
+    except Exception:
+        return 0
+
+
+class SpillStore:
+    """SQLite-backed overflow storage for evicted registry entries."""
+
+    def __init__(
+        self,
+        path: str,
+        table: str = "spilled",
+        restore: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.table = table
+        self.restore = restore
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, spilled_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        logger.info(f"Spilling evicted {table} entries to {path}")
+
+    def _decode(self, raw: str) -> Any:
+        value = json.loads(raw)
+        return self.restore(value) if self.restore else value
+
+    def save(self, key: str, value: Any) -> None:
+        encoded = json.dumps(jsonable_encoder(value), default=str)
+        with self._lock:
+            self._db.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, spilled_at) VALUES (?, ?, ?)",
+                (key, encoded, time.time())
+            )
+            self._db.commit()
+
+    def load(self, key: str) -> Optional[Any]:
+        with self._lock:
+            row = self._db.execute(
+                f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._db.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._db.commit()
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute(f"SELECT key FROM {self.table}")]
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(f"SELECT key, value FROM {self.table}").fetchall()
+        for key, raw in rows:
+            yield key, self._decode(raw)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class BoundedRegistry(MutableMapping):
+    """
+    LRU registry with entry, memory and TTL bounds.
+
+    ``is_finished`` decides which entries may be evicted. Finished entries
+    idle for longer than ``ttl_seconds`` are expired, and the least recently
+    used finished entries go first when ``max_entries`` or ``max_bytes`` is
+    exceeded. Values mutated in place should be re-measured with ``touch``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 0,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0,
+        is_finished: Callable[[Any], bool] = lambda value: True,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        spill: Optional[SpillStore] = None,
+        on_evict: Optional[Callable[[str, Any], None]] = None
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.is_finished = is_finished
+        self.sizeof = sizeof
+        self.spill = spill
+        self.on_evict = on_evict
+        # key -> (value, size, last access)
+        self._entries: "OrderedDict[str, Tuple[Any, int, float]]" = OrderedDict()
+        self.total_bytes = 0
+        self.evicted = 0
+        self.expired = 0
+        self.spilled = 0
+        self.reloaded = 0
+
+    # Mapping protocol
+
+    def __getitem__(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], entry[1], time.monotonic())
+            self._entries.move_to_end(key)
+            return entry[0]
+
+        value = self.spill.load(key) if self.spill is not None else None
+        if value is None:
+            raise KeyError(key)
+        self.reloaded += 1
+        self.spill.delete(key)
+        self[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._discard(key)
+        size = self.sizeof(value) if self.sizeof else 0
+        self._entries[key] = (value, size, time.monotonic())
+        self.total_bytes += size
+        self._enforce(keep=key)
+
+    def __delitem__(self, key: str) -> None:
+        found = self._discard(key)
+        if self.spill is not None and self.spill.load(key) is not None:
+            self.spill.delete(key)
+            found = True
+        if not found:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._entries:
+            return True
+        return self.spill is not None and self.spill.load(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        yield from list(self._entries)
+        if self.spill is not None:
+            for key in self.spill.keys():
+                if key not in self._entries:
+                    yield key
+
+    def __len__(self) -> int:
+        return len(self._entries) + (len(self.spill) if self.spill is not None else 0)
+
+    def values(self) -> List[Any]:
+        """All values, reading spilled entries without promoting them."""
+        values = [value for value, _, _ in self._entries.values()]
+        if self.spill is not None:
+            values.extend(value for key, value in self.spill.items() if key not in self._entries)
+        return values
+
+    # Lifecycle
+
+    def touch(self, key: str) -> None:
+        """Re-measure an entry after it was mutated in place and apply the bounds."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        size = self.sizeof(entry[0]) if self.sizeof else 0
+        self.total_bytes += size - entry[1]
+        self._entries[key] = (entry[0], size, time.monotonic())
+        self._entries.move_to_end(key)
+        self._enforce(keep=key)
+
+    def sweep(self) -> None:
+        """Expire finished entries idle for longer than the TTL."""
+        self._enforce()
+
+    def _discard(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.total_bytes -= entry[1]
+        return True
+
+    def _over_budget(self) -> bool:
+        return (
+            (self.max_entries > 0 and len(self._entries) > self.max_entries)
+            or (self.max_bytes > 0 and self.total_bytes > self.max_bytes)
+        )
+
+    def _enforce(self, keep: Optional[str] = None) -> None:
+        now = time.monotonic()
+        # Oldest access first, so TTL and LRU candidates come up front
+        for key, (value, _, accessed) in list(self._entries.items()):
+            if key == keep or not self.is_finished(value):
+                continue
+            expired = self.ttl_seconds > 0 and now - accessed > self.ttl_seconds
+            if not expired and not self._over_budget():
+                break
+            if expired:
+                self.expired += 1
+            else:
+                self.evicted += 1
+            self._evict(key, value)
+
+        if self._over_budget():
+            logger.warning(
+                f"{self.name} registry over budget with {len(self._entries)} entries "
+                f"(~{self.total_bytes // 1024} KiB) still running"
+            )
+
+    def _evict(self, key: str, value: Any) -> None:
+        self._discard(key)
+        if self.spill is not None:
+            try:
+                self.spill.save(key, value)
+                self.spilled += 1
+            except Exception as e:
+                logger.error(f"Failed to spill {self.name} entry {key}: {e}")
+        if self.on_evict:
+            self.on_evict(key, value)
+        logger.debug(f"Evicted {self.name} entry {key}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Report size and eviction counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "approx_bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "evicted": self.evicted,
+            "expired": self.expired,
+            "spilled": self.spilled,
+            "reloaded": self.reloaded,
+        }
+
+
+class SortedIndex:
+    """Keys ordered by a sort key, overall and within buckets."""
+
+    def __init__(self):
+        # (sort key, key) pairs in ascending order
+        self._all: List[Tuple[Any, str]] = []
+        self._buckets: Dict[str, List[Tuple[Any, str]]] = {}
+        self._positions: Dict[str, Tuple[Any, str]] = {}
+
+    def add(self, key: str, sort_key: Any, bucket: str) -> None:
+        """Index ``key``, moving it if its sort key or bucket changed."""
+        current = self._positions.get(key)
+        if current == (sort_key, bucket):
+            return
+        if current is not None:
+            self.remove(key)
+        item = (sort_key, key)
+        insort(self._all, item)
+        insort(self._buckets.setdefault(bucket, []), item)
+        self._positions[key] = (sort_key, bucket)
+
+    def remove(self, key: str) -> None:
+        current = self._positions.pop(key, None)
+        if current is None:
+            return
+        sort_key, bucket = current
+        item = (sort_key, key)
+        for items in (self._all, self._buckets[bucket]):
+            del items[bisect_left(items, item)]
+        if not self._buckets[bucket]:
+            del self._buckets[bucket]
+
+    def count(self, bucket: Optional[str] = None) -> int:
+        if bucket is None:
+            return len(self._all)
+        return len(self._buckets.get(bucket, ()))
+
+    def counts(self) -> Dict[str, int]:
+        """Number of keys in each bucket."""
+        return {bucket: len(items) for bucket, items in self._buckets.items()}
+
+    def page(
+        self,
+        bucket: Optional[str] = None,
+        before: Optional[Tuple[Any, str]] = None,
+        offset: int = 0,
+        limit: int = 10
+    ) -> Tuple[List[str], bool]:
+        """
+        Keys in descending order, starting below the ``(sort key, key)`` pair
+        ``before`` and skipping ``offset`` of them; also whether more follow.
+        """
+        items = self._all if bucket is None else self._buckets.get(bucket, [])
+        end = bisect_left(items, before) if before is not None else len(items)
+        end = max(end - offset, 0)
+        start = max(end - limit, 0)
+        return [key for _, key in reversed(items[start:end])], start > 0
+
+
+class IndexedRegistry(BoundedRegistry):
+    """
+    ``BoundedRegistry`` whose entries, spilled ones included, are indexed by
+    ``sort_key`` and grouped by ``bucket``. Entries mutated in place are
+    re-indexed by ``touch``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        sort_key: Callable[[Any], Any],
+        bucket: Callable[[Any], str],
+        **kwargs: Any
+    ):
+        super().__init__(name, **kwargs)
+        self.sort_key = sort_key
+        self.bucket = bucket
+        self.index = SortedIndex()
+        if self.spill is not None:
+            for key, value in self.spill.items():
+                self._index(key, value)
+
+    def _index(self, key: str, value: Any) -> None:
+        self.index.add(key, self.sort_key(value), self.bucket(value))
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._index(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self.index.remove(key)
+
+    def touch(self, key: str) -> None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._index(key, entry[0])
+        super().touch(key)
+
+    def _evict(self, key: str, value: Any) -> None:
+        super()._evict(key, value)
+        if self.spill is None or self.spill.load(key) is None:
+            self.index.remove(key)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Value of an entry without refreshing it or loading it back from the spill."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry[0]
+        return self.spill.load(key) if self.spill is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "buckets": self.index.counts()}
@@ -1,4 +1,4 @@
 # API Routes module
-from app.api.routes import analysis, feedback, history
+from app.api.routes import analysis, feedback, history, updates
 
-__all__ = ["analysis", "feedback", "history"]
+__all__ = ["analysis", "feedback", "history", "updates"]
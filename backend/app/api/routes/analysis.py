@@ -1,42 +1,167 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends
-from fastapi.responses import StreamingResponse
-from typing import Optional, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from typing import Optional, Dict, Any, List, Tuple
 from uuid import UUID, uuid4
 from datetime import datetime
 import asyncio
 import json
 import logging
 
+from app.config import get_settings
 from app.schemas import (
     AnalysisRequest,
+    BatchAnalysisRequest,
     AnalysisResponse,
     AnalysisStatusResponse,
-    AnalysisStatus
+    AnalysisStatus,
+    AgentStep,
+    AgentOutput
 )
 from app.agents import AgentOrchestrator
+from app.agents.orchestrator import PHASE_PROGRESS
 from app.reasoning import ExplanationGenerator
-from app.db import AnalysisDocument, DecisionModel, ReasoningStepModel, is_connected
+from app.db import AnalysisDocument, AnalysisStatusView, DecisionModel, ReasoningStepModel, get_database, is_connected
+from app.db.stats import forget_in_memory, rebuild_memory_counters, record_transition
+from app.memory import search_similar_memories_batch
+from app.jobs import Job, get_job_queue
+from app.jobs.fair_queue import (
+    BATCH_PRIORITY,
+    DEFAULT_PRIORITY,
+    PRIORITY_RANKS,
+    PRIORITY_WEIGHTS,
+    get_fair_scheduler
+)
+from app.api.registry import BoundedRegistry, IndexedRegistry, SpillStore, estimate_size
+from app.api.status_cache import StatusCache, compute_etag
+from app.events import get_event_bus
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
+settings = get_settings()
+
+FINISHED_STATUSES = (AnalysisStatus.COMPLETED, AnalysisStatus.FAILED, AnalysisStatus.CANCELLED)
+
+# Status fields that change without the status changing
+VOLATILE_QUEUE_FIELDS = {"queue_depth", "queue_wait_ms"}
+
+
+def _restore_analysis(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """Undo the JSON encoding of a spilled analysis record."""
+    analysis["status"] = AnalysisStatus(analysis["status"])
+    return analysis
 
-# In-memory storage for active analyses (fallback when MongoDB not available)
-active_analyses: Dict[str, Dict[str, Any]] = {}
-analysis_orchestrators: Dict[str, AgentOrchestrator] = {}
+
+def restore_memory_counters() -> None:
+    """Count the analyses held (or spilled) by the in-memory fallback at startup."""
+    index = active_analyses.index
+    completed = AnalysisStatus.COMPLETED.value
+    ids, _ = index.page(completed, limit=index.count(completed))
+    rebuild_memory_counters(index.counts(), (
+        ((active_analyses.peek(analysis_id) or {}).get("result") or {}).get("decision")
+        for analysis_id in ids
+    ))
+
+
+def _forget_evicted(analysis_id: str, analysis: Dict[str, Any]) -> None:
+    """Keep the statistics in line with the results still held."""
+    if active_analyses.spill is None:
+        forget_in_memory(analysis["status"], (analysis.get("result") or {}).get("decision"))
+
+
+# In-memory storage for active analyses (fallback when MongoDB not available),
+# indexed by creation time and status for the history. Finished results are
+# evicted least recently used first, and finished orchestrators once idle for
+# ORCHESTRATOR_TTL_SECONDS.
+active_analyses: IndexedRegistry = IndexedRegistry(
+    "analyses",
+    sort_key=lambda analysis: analysis.get("created_at") or "",
+    bucket=lambda analysis: AnalysisStatus(analysis["status"]).value,
+    max_entries=settings.ANALYSIS_RESULTS_MAX_ENTRIES,
+    max_bytes=settings.ANALYSIS_RESULTS_MAX_MB * 1024 * 1024,
+    is_finished=lambda analysis: AnalysisStatus(analysis["status"]) in FINISHED_STATUSES,
+    sizeof=estimate_size,
+    spill=SpillStore(
+        settings.ANALYSIS_SPILL_PATH, "analyses", restore=_restore_analysis
+    ) if settings.ANALYSIS_SPILL_PATH else None,
+    on_evict=_forget_evicted
+)
+analysis_orchestrators: BoundedRegistry = BoundedRegistry(
+    "orchestrators",
+    max_entries=settings.ORCHESTRATOR_MAX_ENTRIES,
+    ttl_seconds=settings.ORCHESTRATOR_TTL_SECONDS,
+    is_finished=lambda orchestrator: orchestrator.status in FINISHED_STATUSES
+)
+# Batch records for the in-memory fallback; with MongoDB they live in
+# BATCHES_COLLECTION. Batch progress is derived from the item statuses.
+active_batches: BoundedRegistry = BoundedRegistry(
+    "batches",
+    max_entries=settings.BATCH_MAX_ENTRIES,
+    ttl_seconds=settings.BATCH_TTL_SECONDS
+)
+BATCHES_COLLECTION = "analysis_batches"
+_batch_index_ready = False
+
+# Pipeline task of every analysis running in this process, for cancellation
+running_analyses: Dict[str, asyncio.Task] = {}
+
+# Status responses served to pollers, refreshed by event bus updates
+status_cache = StatusCache(
+    lambda analysis_id: _build_status(analysis_id),
+    max_entries=settings.STATUS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.STATUS_CACHE_TTL_SECONDS
+)
+
+# Job kinds handled by the worker pool (see app.worker)
+ANALYSIS_JOB = "analysis"
+BATCH_JOB = "batch"
 
 
 @router.post("", response_model=Dict[str, Any])
 async def create_analysis(
     request: AnalysisRequest,
-    background_tasks: BackgroundTasks
+    x_priority: Optional[str] = Header(None),
+    x_client_id: Optional[str] = Header(None)
 ):
     """
     Start a new analysis.
-    Returns the analysis ID immediately, processing happens in background.
+    Returns the analysis ID immediately, processing happens on the job queue.
+    
+    The priority class (``interactive``, ``normal`` or ``bulk``) comes from
+    ``preferences.priority`` or the ``X-Priority`` header; execution slots are
+    shared fairly between the clients named by ``X-Client-ID``.
     """
     analysis_id = str(uuid4())
     created_at = datetime.now()
+    request = _with_scheduling(request, x_priority, x_client_id)
+    priority = request.preferences["priority"]
+    
+    await _create_analysis_record(analysis_id, request, created_at)
+    
+    # Hand off to the worker pool; the job ID is the analysis ID
+    await get_job_queue().enqueue(
+        ANALYSIS_JOB,
+        _analysis_job_payload(analysis_id, request, created_at),
+        job_id=analysis_id,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        priority=PRIORITY_RANKS[priority]
+    )
     
+    return {
+        "id": analysis_id,
+        "status": AnalysisStatus.PENDING,
+        "priority": priority,
+        "message": "Analysis started. Use the status endpoint to track progress.",
+        "created_at": created_at.isoformat()
+    }
+
+
+async def _create_analysis_record(
+    analysis_id: str,
+    request: AnalysisRequest,
+    created_at: datetime
+) -> None:
+    """Persist a pending analysis and register its orchestrator."""
     # Create analysis document
     if is_connected():
         # Use MongoDB
@@ -45,6 +170,7 @@ async def create_analysis(
             status=AnalysisStatus.PENDING.value,
             problem_statement=request.problem_statement,
             context=request.context,
+            preferences=request.preferences,
             created_at=created_at
         )
         await analysis_doc.insert()
@@ -56,49 +182,382 @@ async def create_analysis(
             "status": AnalysisStatus.PENDING,
             "problem_statement": request.problem_statement,
             "context": request.context,
+            "preferences": request.preferences,
             "created_at": created_at.isoformat(),
             "result": None,
             "error": None
         }
         logger.info(f"📝 Created analysis in memory: {analysis_id}")
     
-    # Create orchestrator
-    orchestrator = AgentOrchestrator(UUID(analysis_id))
-    analysis_orchestrators[analysis_id] = orchestrator
+    await record_transition(None, None, AnalysisStatus.PENDING)
+    
+    # The orchestrator is created by the process that reserves the job
+    # Announce it to the tenant-wide feed
+    await _publish_status(
+        analysis_id, AnalysisStatus.PENDING, client_id=(request.preferences or {}).get("client_id")
+    )
+
+
+def _with_scheduling(
+    request: AnalysisRequest,
+    priority: Optional[str],
+    client_id: Optional[str],
+    default_priority: str = DEFAULT_PRIORITY
+) -> AnalysisRequest:
+    """Resolve the priority class and client of a request into its preferences."""
+    preferences = dict(request.preferences or {})
+    priority = preferences.get("priority") or priority or default_priority
+    if priority not in PRIORITY_WEIGHTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown priority '{priority}'. Expected one of: {', '.join(PRIORITY_WEIGHTS)}"
+        )
+    preferences["priority"] = priority
+    # The header is set by the caller's gateway, so it wins over the body
+    preferences["client_id"] = client_id or preferences.get("client_id") or "anonymous"
+    return request.model_copy(update={"preferences": preferences})
+
+
+def _analysis_job_payload(
+    analysis_id: str,
+    request: AnalysisRequest,
+    created_at: datetime
+) -> Dict[str, Any]:
+    """Everything a worker needs to run (or re-create) an analysis."""
+    return {
+        "analysis_id": analysis_id,
+        "request": request.model_dump(),
+        "created_at": created_at.isoformat()
+    }
+
+
+@router.post("/batch", response_model=Dict[str, Any])
+async def create_batch_analysis(
+    request: BatchAnalysisRequest,
+    x_priority: Optional[str] = Header(None),
+    x_client_id: Optional[str] = Header(None)
+):
+    """
+    Start many analyses as one batch.
+    Items run with bounded concurrency and ``bulk`` priority unless the
+    ``X-Priority`` header or an item's preferences say otherwise; track them
+    with the batch status endpoint.
+    """
+    batch_id = str(uuid4())
+    created_at = datetime.now()
+    max_concurrency = request.max_concurrency or settings.BATCH_MAX_CONCURRENCY
+    batch_priority = x_priority or BATCH_PRIORITY
+    
+    items = []
+    for item in request.items:
+        item = _with_scheduling(item, batch_priority, x_client_id)
+        analysis_id = str(uuid4())
+        await _create_analysis_record(analysis_id, item, created_at)
+        items.append((analysis_id, item))
+    
+    analysis_ids = [analysis_id for analysis_id, _ in items]
+    await _save_batch(batch_id, analysis_ids, max_concurrency, created_at)
+    logger.info(f"📦 Created batch {batch_id} with {len(items)} analyses")
     
-    # Start background processing
-    background_tasks.add_task(
-        run_analysis,
-        analysis_id,
-        request.problem_statement,
-        request.preferences
+    await get_job_queue().enqueue(
+        BATCH_JOB,
+        {
+            "batch_id": batch_id,
+            "items": [_analysis_job_payload(analysis_id, item, created_at) for analysis_id, item in items],
+            "max_concurrency": max_concurrency
+        },
+        job_id=batch_id,
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        priority=PRIORITY_RANKS[batch_priority]
     )
     
     return {
-        "id": analysis_id,
+        "id": batch_id,
         "status": AnalysisStatus.PENDING,
-        "message": "Analysis started. Use the status endpoint to track progress.",
+        "total": len(items),
+        "analysis_ids": analysis_ids,
+        "max_concurrency": max_concurrency,
+        "message": "Batch started. Use the batch status endpoint to track progress.",
         "created_at": created_at.isoformat()
     }
 
 
+async def run_batch(
+    batch_id: str,
+    items: List[Tuple[str, AnalysisRequest]],
+    max_concurrency: int,
+    raise_errors: bool = False
+):
+    """
+    Background task to run a batch with at most ``max_concurrency`` analyses in flight.
+    
+    With ``raise_errors`` failed items are left pending and, once the rest
+    of the batch has finished, the first failure is re-raised so the job
+    queue retries them.
+    """
+    # One memory query for the whole batch; duplicate statements share an embedding
+    problems = list(dict.fromkeys(item.problem_statement for _, item in items))
+    memories_by_problem: Dict[str, List[Dict[str, Any]]] = {}
+    try:
+        results = search_similar_memories_batch(problems, n_results=3)
+        memories_by_problem = dict(zip(problems, results))
+    except Exception as e:
+        logger.warning(f"Batch memory lookup failed, analyses will query individually: {e}")
+    
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run_item(analysis_id: str, item: AnalysisRequest):
+        async with semaphore:
+            await run_analysis(
+                analysis_id,
+                item.problem_statement,
+                item.preferences,
+                memories=memories_by_problem.get(item.problem_statement),
+                raise_errors=raise_errors
+            )
+    
+    outcomes = await asyncio.gather(
+        *(run_item(analysis_id, item) for analysis_id, item in items),
+        return_exceptions=True
+    )
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    if errors:
+        logger.warning(f"📦 Batch {batch_id}: {len(errors)} of {len(items)} analyses failed")
+        raise errors[0]
+    logger.info(f"📦 Batch completed: {batch_id}")
+
+
+async def process_analysis_job(payload: Dict[str, Any]) -> None:
+    """
+    Job handler for a single analysis.
+    
+    Jobs are delivered at least once, so an analysis that already finished
+    is skipped, and state lost with a restarted process is re-created.
+    """
+    analysis_id = payload["analysis_id"]
+    request = AnalysisRequest(**payload["request"])
+    if not await _prepare_job(analysis_id, request, payload.get("created_at")):
+        return
+    await run_analysis(analysis_id, request.problem_statement, request.preferences, raise_errors=True)
+
+
+async def process_batch_job(payload: Dict[str, Any]) -> None:
+    """Job handler for a batch; finished items are skipped on redelivery."""
+    batch_id = payload["batch_id"]
+    items = []
+    for item in payload["items"]:
+        request = AnalysisRequest(**item["request"])
+        if await _prepare_job(item["analysis_id"], request, item.get("created_at")):
+            items.append((item["analysis_id"], request))
+    
+    await run_batch(batch_id, items, payload["max_concurrency"], raise_errors=True)
+
+
+async def fail_analysis_job(job: Job, error: str) -> None:
+    """Dead-letter handler: mark every unfinished analysis of a job that gave up as failed."""
+    payload = job.payload
+    items = payload.get("items", [payload])
+    for item in items:
+        analysis_id = item.get("analysis_id")
+        if analysis_id:
+            # Batch items that completed on an earlier attempt keep their result
+            if await _stored_status(analysis_id) not in FINISHED_STATUSES:
+                await _mark_failed(analysis_id, error)
+            analysis_orchestrators.pop(analysis_id, None)
+
+
+async def _prepare_job(
+    analysis_id: str,
+    request: AnalysisRequest,
+    created_at: Optional[str] = None
+) -> bool:
+    """
+    Ensure a record exists and create the orchestrator in the process that
+    runs the job; returns False if already finished.
+    """
+    status = await _stored_status(analysis_id)
+    if status in FINISHED_STATUSES:
+        return False
+    if status is None:
+        await _create_analysis_record(
+            analysis_id, request,
+            datetime.fromisoformat(created_at) if created_at else datetime.now()
+        )
+    
+    # A failed attempt leaves a spent orchestrator; retries start from a fresh one
+    orchestrator = analysis_orchestrators.get(analysis_id)
+    if orchestrator is None or orchestrator.status in FINISHED_STATUSES:
+        analysis_orchestrators[analysis_id] = AgentOrchestrator(UUID(analysis_id))
+    return True
+
+
+async def _stored_status(analysis_id: str) -> Optional[AnalysisStatus]:
+    """Status of the stored analysis record, or None if there is none."""
+    if is_connected():
+        analysis_doc = await _find_status(analysis_id)
+        return AnalysisStatus(analysis_doc.status) if analysis_doc else None
+    analysis = active_analyses.get(analysis_id)
+    return AnalysisStatus(analysis["status"]) if analysis else None
+
+
+@router.get("/batch/{batch_id}")
+async def get_batch_status(batch_id: str):
+    """
+    Get per-item progress of a batch.
+    The batch is completed once every item has finished, whichever worker
+    ran it.
+    """
+    batch = await _load_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    
+    items = []
+    counts: Dict[str, int] = {}
+    completed_at = None
+    for analysis_id in batch["analysis_ids"]:
+        status, progress, item_completed_at = await _get_progress(analysis_id)
+        counts[status] = counts.get(status, 0) + 1
+        if item_completed_at and (completed_at is None or item_completed_at > completed_at):
+            completed_at = item_completed_at
+        items.append({
+            "id": analysis_id,
+            "status": status,
+            "progress_percentage": progress
+        })
+    
+    finished = sum(counts.get(status.value, 0) for status in FINISHED_STATUSES)
+    done = finished == len(items)
+    return {
+        "id": batch_id,
+        "status": AnalysisStatus.COMPLETED if done else AnalysisStatus.PENDING,
+        "total": len(items),
+        "finished": finished,
+        "counts": counts,
+        "max_concurrency": batch["max_concurrency"],
+        "created_at": batch["created_at"],
+        "completed_at": completed_at if done else None,
+        "items": items
+    }
+
+
+async def _save_batch(
+    batch_id: str,
+    analysis_ids: List[str],
+    max_concurrency: int,
+    created_at: datetime
+) -> None:
+    """Store which analyses make up a batch; expires after BATCH_TTL_SECONDS."""
+    global _batch_index_ready
+    batch = {
+        "analysis_ids": analysis_ids,
+        "max_concurrency": max_concurrency,
+        "created_at": created_at
+    }
+    if is_connected():
+        collection = get_database()[BATCHES_COLLECTION]
+        if not _batch_index_ready:
+            await collection.create_index("created_at", expireAfterSeconds=int(settings.BATCH_TTL_SECONDS))
+            _batch_index_ready = True
+        await collection.insert_one({"_id": batch_id, **batch})
+    else:
+        active_batches[batch_id] = batch
+
+
+async def _load_batch(batch_id: str) -> Optional[Dict[str, Any]]:
+    if is_connected():
+        batch = await get_database()[BATCHES_COLLECTION].find_one({"_id": batch_id})
+    else:
+        batch = active_batches.get(batch_id)
+    if batch is None:
+        return None
+    return {**batch, "created_at": batch["created_at"].isoformat()}
+
+
+async def _get_progress(analysis_id: str) -> Tuple[str, int, Optional[str]]:
+    """Current status value, progress percentage and completion time of one analysis."""
+    orchestrator = analysis_orchestrators.get(analysis_id)
+    if orchestrator and orchestrator.status not in (AnalysisStatus.PENDING, AnalysisStatus.COMPLETED):
+        status = orchestrator.get_status()
+        return AnalysisStatus(status["status"]).value, status["progress_percentage"], None
+    
+    if is_connected():
+        analysis_doc = await _find_status(analysis_id)
+        status = analysis_doc.status if analysis_doc else AnalysisStatus.PENDING.value
+        completed_at = analysis_doc.completed_at.isoformat() if analysis_doc and analysis_doc.completed_at else None
+    else:
+        analysis = active_analyses.get(analysis_id, {})
+        status = AnalysisStatus(analysis.get("status", AnalysisStatus.PENDING)).value
+        completed_at = analysis.get("completed_at")
+    
+    return status, 100 if status == AnalysisStatus.COMPLETED.value else 0, completed_at
+
+
 async def run_analysis(
     analysis_id: str, 
     problem_statement: str,
-    preferences: Optional[Dict[str, Any]] = None
+    preferences: Optional[Dict[str, Any]] = None,
+    memories: Optional[List[Dict[str, Any]]] = None,
+    raise_errors: bool = False
 ):
-    """Background task to run the analysis."""
+    """
+    Run the analysis, resuming from any phases checkpointed by earlier attempts.
+    
+    With ``raise_errors`` a failure is re-raised so the job queue retries it
+    instead of the analysis being marked failed.
+    """
     try:
         orchestrator = analysis_orchestrators.get(analysis_id)
         if not orchestrator:
             logger.error(f"Orchestrator not found for {analysis_id}")
             return
         
-        # Run the multi-agent analysis
-        result = await orchestrator.execute(
-            problem_statement=problem_statement,
-            context=preferences
-        )
+        async def on_checkpoint(agent_name: str, output: AgentOutput) -> None:
+            step = next(
+                (step for step in reversed(orchestrator.reasoning_steps) if step.agent_name == agent_name),
+                None
+            )
+            await _save_checkpoint(analysis_id, agent_name, output, orchestrator.status, step)
+        
+        async def execute() -> Dict[str, Any]:
+            # Wait for an execution slot in priority and per-client fair order
+            async with get_fair_scheduler().slot(
+                analysis_id,
+                client_id=(preferences or {}).get("client_id") or "anonymous",
+                priority=(preferences or {}).get("priority") or DEFAULT_PRIORITY
+            ):
+                return await orchestrator.execute(
+                    problem_statement=problem_statement,
+                    context=preferences,
+                    memories=memories,
+                    checkpoints=await _load_checkpoints(analysis_id),
+                    on_checkpoint=on_checkpoint,
+                    load_outputs=_load_checkpoints
+                )
+        
+        # Run the multi-agent analysis as its own task so it can be cancelled,
+        # including while it still waits for a slot
+        events = orchestrator.subscribe()
+        forwarder = asyncio.create_task(_forward_events(
+            analysis_id, orchestrator, events, (preferences or {}).get("client_id")
+        ))
+        task = asyncio.create_task(execute())
+        running_analyses[analysis_id] = task
+        watcher = asyncio.create_task(_watch_for_cancellation(analysis_id, task))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if asyncio.current_task().cancelling():
+                # This worker is shutting down; let the job be redelivered
+                raise
+            logger.info(f"🛑 Analysis cancelled: {analysis_id}")
+            return
+        finally:
+            running_analyses.pop(analysis_id, None)
+            watcher.cancel()
+            # Flush the events emitted so far before the final status goes out
+            await events.put(None)
+            await asyncio.shield(forwarder)
+            orchestrator.unsubscribe(events)
         
         # Prepare result data
         completed_at = datetime.now()
@@ -159,86 +618,290 @@ async def run_analysis(
             )
         
         if result and "reasoning_steps" in result:
-            for step in result["reasoning_steps"]:
-                # Handle both Pydantic model and dict
-                if hasattr(step, 'model_dump'):
-                    step_dict = step.model_dump()
-                    # Map field names from AgentStep schema to ReasoningStepModel schema
-                    if 'agent_name' in step_dict:
-                        step_dict['agent'] = step_dict.pop('agent_name')
-                    if 'output_summary' in step_dict:
-                        step_dict['summary'] = step_dict.pop('output_summary')
-                elif hasattr(step, '__dict__'):
-                    # AgentStep has agent_name and output_summary, not agent and summary
-                    step_dict = {
-                        "step_number": getattr(step, 'step_number', 0),
-                        "agent": getattr(step, 'agent_name', ''),
-                        "action": getattr(step, 'action', ''),
-                        "summary": getattr(step, 'output_summary', ''),
-                        "reasoning": getattr(step, 'reasoning', ''),
-                        "confidence": getattr(step, 'confidence', 0.0),
-                        "duration_ms": getattr(step, 'duration_ms', 0),
-                        "timestamp": getattr(step, 'timestamp', '')
-                    }
-                else:
-                    step_dict = step
-                    # Also handle dict case where field names might be wrong
-                    if 'agent_name' in step_dict and 'agent' not in step_dict:
-                        step_dict['agent'] = step_dict.get('agent_name', '')
-                    if 'output_summary' in step_dict and 'summary' not in step_dict:
-                        step_dict['summary'] = step_dict.get('output_summary', '')
-                
-                # Convert timestamp to string if it's a datetime object
-                timestamp_value = step_dict.get("timestamp", "")
-                if hasattr(timestamp_value, 'isoformat'):
-                    timestamp_value = timestamp_value.isoformat()
-                elif not isinstance(timestamp_value, str):
-                    timestamp_value = str(timestamp_value) if timestamp_value else ""
-                
-                reasoning_steps_data.append(ReasoningStepModel(
-                    step_number=step_dict.get("step_number", 0),
-                    agent=step_dict.get("agent", ""),
-                    action=step_dict.get("action", ""),
-                    summary=step_dict.get("summary", ""),
-                    reasoning=step_dict.get("reasoning", ""),
-                    confidence=step_dict.get("confidence", 0.0),
-                    duration_ms=step_dict.get("duration_ms", 0),
-                    timestamp=timestamp_value
-                ))
+            reasoning_steps_data = [_reasoning_step_model(step) for step in result["reasoning_steps"]]
+        
+        # Every phase's output stays with the record, for reuse by near-duplicates
+        phase_outputs = {
+            name: output.model_dump(mode="json", exclude={"cached"})
+            for name, output in orchestrator.agent_outputs.items()
+        }
         
-        # Update storage
+        # Update storage; a cancel that landed after the pipeline returned wins
         if is_connected():
-            # Update MongoDB
-            analysis_doc = await AnalysisDocument.find_one(AnalysisDocument.analysis_id == analysis_id)
-            if analysis_doc:
-                analysis_doc.status = AnalysisStatus.COMPLETED.value
-                analysis_doc.completed_at = completed_at
-                analysis_doc.decision = decision_data
-                analysis_doc.reasoning_steps = reasoning_steps_data
-                await analysis_doc.save()
-                logger.info(f"✅ Analysis completed and saved to MongoDB: {analysis_id}")
+            # One atomic update carrying only the result fields
+            previous = await _update_returning_previous(analysis_id, {"$set": {
+                "status": AnalysisStatus.COMPLETED.value,
+                "completed_at": completed_at,
+                "decision": decision_data.model_dump() if decision_data else None,
+                "reasoning_steps": [step.model_dump() for step in reasoning_steps_data],
+                "reused_from": result.get("reused_from"),
+                "degradations": result.get("degradations") or [],
+                "checkpoints": phase_outputs,
+                "error": None
+            }}, unfinished_only=True)
+            if previous is None:
+                logger.info(f"🛑 Analysis finished elsewhere, result discarded: {analysis_id}")
+                analysis_orchestrators.touch(analysis_id)
+                return
+            await record_transition(
+                previous["status"], previous.get("decision"), AnalysisStatus.COMPLETED, decision_data
+            )
+            logger.info(f"✅ Analysis completed and saved to MongoDB: {analysis_id}")
         else:
             # Update in-memory
             if analysis_id in active_analyses:
+                previous = active_analyses[analysis_id]
+                if AnalysisStatus(previous["status"]) in FINISHED_STATUSES:
+                    logger.info(f"🛑 Analysis finished elsewhere, result discarded: {analysis_id}")
+                    analysis_orchestrators.touch(analysis_id)
+                    return
+                await record_transition(
+                    previous["status"], (previous.get("result") or {}).get("decision"),
+                    AnalysisStatus.COMPLETED, result.get("decision")
+                )
                 active_analyses[analysis_id]["status"] = AnalysisStatus.COMPLETED
                 active_analyses[analysis_id]["result"] = result
                 active_analyses[analysis_id]["completed_at"] = completed_at.isoformat()
+                active_analyses[analysis_id]["checkpoints"] = phase_outputs
+                active_analyses[analysis_id]["error"] = None
+                active_analyses.touch(analysis_id)
                 logger.info(f"✅ Analysis completed (in-memory): {analysis_id}")
         
+        await _publish_status(analysis_id, AnalysisStatus.COMPLETED)
+        
+        # The orchestrator is finished and now eligible for eviction
+        analysis_orchestrators.touch(analysis_id)
+        
     except Exception as e:
         logger.error(f"❌ Analysis failed: {analysis_id} - {str(e)}")
         
+        if raise_errors:
+            # Leave it pending for the retry; finished phases stay checkpointed
+            await _set_status(analysis_id, AnalysisStatus.PENDING, str(e))
+            raise
+        
         # Update error status
-        if is_connected():
-            analysis_doc = await AnalysisDocument.find_one(AnalysisDocument.analysis_id == analysis_id)
-            if analysis_doc:
-                analysis_doc.status = AnalysisStatus.FAILED.value
-                analysis_doc.error = str(e)
-                await analysis_doc.save()
-        else:
-            if analysis_id in active_analyses:
-                active_analyses[analysis_id]["status"] = AnalysisStatus.FAILED
-                active_analyses[analysis_id]["error"] = str(e)
+        await _mark_failed(analysis_id, str(e))
+
+
+async def _watch_for_cancellation(analysis_id: str, task: asyncio.Task) -> None:
+    """Cancel ``task`` once any process publishes a cancel event for the analysis."""
+    subscription = get_event_bus().subscribe([analysis_id])
+    try:
+        while not task.done():
+            event = await subscription.get()
+            if event["type"] == "cancel":
+                task.cancel()
+                return
+    finally:
+        subscription.close()
+
+
+def _status_snapshot(orchestrator: AgentOrchestrator) -> Dict[str, Any]:
+    """JSON-safe orchestrator status, including its reasoning steps, for the event bus."""
+    snapshot = jsonable_encoder(orchestrator.get_status())
+    snapshot["reasoning_steps"] = [step.model_dump(mode="json") for step in orchestrator.reasoning_steps]
+    return snapshot
+
+
+async def _forward_events(
+    analysis_id: str,
+    orchestrator: AgentOrchestrator,
+    events: asyncio.Queue,
+    client_id: Optional[str] = None
+) -> None:
+    """
+    Publish an orchestrator's events on the event bus until a ``None`` arrives.
+    
+    Events are published for the ``client_id`` tenant. Status and step
+    events also refresh the status snapshot. Terminal
+    statuses are left to ``_publish_status`` so that they only go out once
+    the result is stored.
+    """
+    bus = get_event_bus()
+    while True:
+        event = await events.get()
+        if event is None:
+            return
+        try:
+            if event["type"] == "status" and AnalysisStatus(event["data"]["status"]) in FINISHED_STATUSES:
+                continue
+            if event["type"] in ("status", "step"):
+                await bus.put_status(analysis_id, {**_status_snapshot(orchestrator), "client_id": client_id})
+            await bus.publish(analysis_id, event["type"], jsonable_encoder(event["data"]), tenant=client_id)
+        except Exception as e:
+            logger.warning(f"Failed to publish {event['type']} event for {analysis_id}: {e}")
+
+
+async def _publish_status(
+    analysis_id: str,
+    status: AnalysisStatus,
+    error: Optional[str] = None,
+    client_id: Optional[str] = None
+) -> None:
+    """
+    Announce a stored status change to every process through the event bus.
+    
+    The tenant is ``client_id``, else the one recorded in the snapshot.
+    """
+    bus = get_event_bus()
+    try:
+        snapshot = await bus.get_status(analysis_id) or {
+            "id": analysis_id,
+            "completed_steps": 0,
+            "latest_step": None,
+            "reasoning_steps": []
+        }
+        snapshot.pop("version", None)
+        snapshot["status"] = status.value
+        snapshot["error"] = error
+        snapshot["client_id"] = client_id or snapshot.get("client_id")
+        if status == AnalysisStatus.COMPLETED:
+            snapshot["progress_percentage"] = 100
+        elif status == AnalysisStatus.PENDING or "progress_percentage" not in snapshot:
+            snapshot["progress_percentage"] = 0
+        if status in FINISHED_STATUSES or status == AnalysisStatus.PENDING:
+            snapshot["current_agent"] = None
+        await bus.put_status(analysis_id, snapshot)
+        await bus.publish(analysis_id, "status", snapshot, tenant=snapshot["client_id"])
+    except Exception as e:
+        logger.warning(f"Failed to publish status of {analysis_id}: {e}")
+
+
+async def _save_checkpoint(
+    analysis_id: str,
+    agent_name: str,
+    output: AgentOutput,
+    status: Optional[AnalysisStatus] = None,
+    step: Optional[AgentStep] = None
+) -> None:
+    """
+    Persist the output of a finished phase.
+    
+    In MongoDB mode the phase's status and reasoning step go in the same
+    update, so readers on any node see progress as each phase completes.
+    """
+    data = output.model_dump(mode="json")
+    if is_connected():
+        query: Dict[str, Any] = {
+            "analysis_id": analysis_id,
+            # A phase finishing after a cancel must not revive the analysis
+            "status": {"$nin": [finished.value for finished in FINISHED_STATUSES]}
+        }
+        update: Dict[str, Any] = {"$set": {f"checkpoints.{agent_name}": data}}
+        if status is not None:
+            update["$set"]["status"] = status.value
+        if step is not None:
+            # Redelivered jobs must not list a phase's step twice
+            query["reasoning_steps.agent"] = {"$ne": step.agent_name}
+            update["$push"] = {"reasoning_steps": _reasoning_step_model(step).model_dump()}
+        await AnalysisDocument.find_one(query).update(update)
+    elif analysis_id in active_analyses:
+        active_analyses[analysis_id].setdefault("checkpoints", {})[agent_name] = data
+        active_analyses.touch(analysis_id)
+    logger.info(f"💾 Checkpointed {agent_name} for {analysis_id}")
+
+
+async def _load_checkpoints(analysis_id: str) -> Dict[str, Dict[str, Any]]:
+    """Phase outputs saved by earlier attempts or a completed run, keyed by agent name."""
+    if is_connected():
+        analysis_doc = await AnalysisDocument.find_one(AnalysisDocument.analysis_id == analysis_id)
+        return dict(analysis_doc.checkpoints) if analysis_doc else {}
+    analysis = active_analyses.get(analysis_id) or {}
+    return dict(analysis.get("checkpoints") or {})
+
+
+async def _set_status(analysis_id: str, status: AnalysisStatus, error: Optional[str] = None) -> None:
+    """Update the stored status and error of an analysis."""
+    if is_connected():
+        previous = await _update_returning_previous(
+            analysis_id, {"$set": {"status": status.value, "error": error}}
+        )
+        if previous:
+            await record_transition(previous["status"], previous.get("decision"), status, previous.get("decision"))
+    elif analysis_id in active_analyses:
+        previous = active_analyses[analysis_id]
+        decision = (previous.get("result") or {}).get("decision")
+        await record_transition(previous["status"], decision, status, decision)
+        active_analyses[analysis_id]["status"] = status
+        active_analyses[analysis_id]["error"] = error
+        active_analyses.touch(analysis_id)
+    await _publish_status(analysis_id, status, error)
+
+
+async def _update_returning_previous(
+    analysis_id: str,
+    update: Dict[str, Any],
+    unfinished_only: bool = False
+) -> Optional[Dict[str, Any]]:
+    """
+    Apply ``update`` to a stored analysis; returns its prior status and decision.
+    
+    With ``unfinished_only`` a finished analysis is left alone and None returned.
+    """
+    query: Dict[str, Any] = {"analysis_id": analysis_id}
+    if unfinished_only:
+        query["status"] = {"$nin": [finished.value for finished in FINISHED_STATUSES]}
+    return await AnalysisDocument.get_motor_collection().find_one_and_update(
+        query,
+        update,
+        projection={"status": 1, "decision": 1}
+    )
+
+
+async def _mark_failed(analysis_id: str, error: str) -> None:
+    """Record an analysis as failed."""
+    analysis_orchestrators.touch(analysis_id)
+    await _set_status(analysis_id, AnalysisStatus.FAILED, error)
+
+
+def _reasoning_step_model(step: Any) -> ReasoningStepModel:
+    """Storage form of an ``AgentStep`` (or an equivalent object or dict)."""
+    # Handle both Pydantic model and dict
+    if hasattr(step, 'model_dump'):
+        step_dict = step.model_dump()
+        # Map field names from AgentStep schema to ReasoningStepModel schema
+        if 'agent_name' in step_dict:
+            step_dict['agent'] = step_dict.pop('agent_name')
+        if 'output_summary' in step_dict:
+            step_dict['summary'] = step_dict.pop('output_summary')
+    elif hasattr(step, '__dict__'):
+        # AgentStep has agent_name and output_summary, not agent and summary
+        step_dict = {
+            "step_number": getattr(step, 'step_number', 0),
+            "agent": getattr(step, 'agent_name', ''),
+            "action": getattr(step, 'action', ''),
+            "summary": getattr(step, 'output_summary', ''),
+            "reasoning": getattr(step, 'reasoning', ''),
+            "confidence": getattr(step, 'confidence', 0.0),
+            "duration_ms": getattr(step, 'duration_ms', 0),
+            "timestamp": getattr(step, 'timestamp', '')
+        }
+    else:
+        step_dict = step
+        # Also handle dict case where field names might be wrong
+        if 'agent_name' in step_dict and 'agent' not in step_dict:
+            step_dict['agent'] = step_dict.get('agent_name', '')
+        if 'output_summary' in step_dict and 'summary' not in step_dict:
+            step_dict['summary'] = step_dict.get('output_summary', '')
+    
+    # Convert timestamp to string if it's a datetime object
+    timestamp_value = step_dict.get("timestamp", "")
+    if hasattr(timestamp_value, 'isoformat'):
+        timestamp_value = timestamp_value.isoformat()
+    elif not isinstance(timestamp_value, str):
+        timestamp_value = str(timestamp_value) if timestamp_value else ""
+    
+    return ReasoningStepModel(
+        step_number=step_dict.get("step_number", 0),
+        agent=step_dict.get("agent", ""),
+        action=step_dict.get("action", ""),
+        summary=step_dict.get("summary", ""),
+        reasoning=step_dict.get("reasoning", ""),
+        confidence=step_dict.get("confidence", 0.0),
+        duration_ms=step_dict.get("duration_ms", 0),
+        timestamp=timestamp_value
+    )
 
 
 @router.get("/{analysis_id}")
@@ -271,6 +934,13 @@ async def get_analysis(analysis_id: str):
                     step.model_dump() for step in analysis_doc.reasoning_steps
                 ]
             
+            if analysis_doc.reused_from:
+                result_data["result"]["reused_from"] = analysis_doc.reused_from
+            
+            if analysis_doc.degradations:
+                result_data["result"]["degraded"] = True
+                result_data["result"]["degradations"] = analysis_doc.degradations
+            
             if analysis_doc.error:
                 result_data["error"] = analysis_doc.error
             
@@ -292,8 +962,65 @@ async def get_analysis(analysis_id: str):
 
 
 @router.get("/{analysis_id}/status")
-async def get_analysis_status(analysis_id: str):
-    """Get real-time status of an analysis."""
+async def get_analysis_status(
+    analysis_id: str,
+    wait: float = Query(0, ge=0, le=settings.STATUS_MAX_WAIT_SECONDS),
+    if_none_match: Optional[str] = Header(None)
+):
+    """
+    Get real-time status of an analysis.
+    While it waits for (or holds) an execution slot in this process, the
+    response includes its priority, queue position, queue depth and wait time.
+    
+    Responses come from the in-process status cache and carry an ``ETag``;
+    a matching ``If-None-Match`` gets ``304 Not Modified``. With ``wait``
+    the request blocks for up to that many seconds until the status differs
+    from the one named by ``If-None-Match``.
+    """
+    entry = await status_cache.get(analysis_id)
+    response, etag = _with_queue_info(analysis_id, entry.response)
+    if wait and _etag_matches(if_none_match, etag):
+        deadline = asyncio.get_running_loop().time() + wait
+        while _etag_matches(if_none_match, etag):
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            entry = await status_cache.wait_for_change(analysis_id, entry.version, remaining)
+            response, etag = _with_queue_info(analysis_id, entry.response)
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(jsonable_encoder(response), headers=headers)
+
+
+def _with_queue_info(
+    analysis_id: str,
+    response: AnalysisStatusResponse
+) -> Tuple[AnalysisStatusResponse, str]:
+    """
+    Add this process's scheduling details to a status; returns it with its
+    ETag. Queue depth and wait time change on every poll while queued, so
+    they are left out of the ETag.
+    """
+    queue_info = get_fair_scheduler().describe(analysis_id)
+    if queue_info:
+        response = response.model_copy(update=queue_info)
+    return response, compute_etag(response.model_dump(exclude=VOLATILE_QUEUE_FIELDS))
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))
+
+
+async def _build_status(analysis_id: str) -> AnalysisStatusResponse:
+    """
+    Status from the local orchestrator while it runs in this process, else
+    from the event bus snapshot (published by whichever worker runs it), else
+    from storage.
+    """
     # Return completed status for demo ID
     if analysis_id == "demo-analysis-123":
         return AnalysisStatusResponse(
@@ -305,51 +1032,33 @@ async def get_analysis_status(analysis_id: str):
             latest_update="Analysis completed"
         )
     
+    orchestrator = analysis_orchestrators.get(analysis_id)
+    if orchestrator and analysis_id in running_analyses:
+        return _status_response(analysis_id, orchestrator.get_status())
+    
+    snapshot = await get_event_bus().get_status(analysis_id)
+    if snapshot:
+        return _status_response(analysis_id, snapshot)
+    
     # Try MongoDB first
     if is_connected():
-        analysis_doc = await AnalysisDocument.find_one(AnalysisDocument.analysis_id == analysis_id)
+        analysis_doc = await _find_status(analysis_id)
         if analysis_doc:
-            # Check if orchestrator is still running
-            orchestrator = analysis_orchestrators.get(analysis_id)
-            if orchestrator:
-                status = orchestrator.get_status()
-                latest_step = status.get("latest_step")
-                return AnalysisStatusResponse(
-                    id=UUID(analysis_id),
-                    status=status["status"],
-                    current_agent=status.get("current_agent"),
-                    current_step=latest_step.action if latest_step and hasattr(latest_step, 'action') else None,
-                    progress_percentage=status["progress_percentage"],
-                    latest_update=f"Step {status['completed_steps']}: {status.get('current_agent', 'Processing')}"
-                )
-            
-            # Return stored status
-            return AnalysisStatusResponse(
-                id=UUID(analysis_id),
-                status=AnalysisStatus(analysis_doc.status),
-                current_agent=None,
-                current_step=None,
-                progress_percentage=100 if analysis_doc.status == AnalysisStatus.COMPLETED.value else 0,
-                latest_update=analysis_doc.status
-            )
+            # Phases store their status and reasoning step as they finish
+            return _status_response(analysis_id, {
+                "status": analysis_doc.status,
+                "current_agent": None,
+                "progress_percentage": PHASE_PROGRESS.get(AnalysisStatus(analysis_doc.status), 0),
+                "completed_steps": analysis_doc.step_count,
+                "latest_step": analysis_doc.latest_step.model_dump() if analysis_doc.latest_step else None
+            })
     
     # Fallback to in-memory
     if analysis_id not in active_analyses:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    orchestrator = analysis_orchestrators.get(analysis_id)
-    
     if orchestrator:
-        status = orchestrator.get_status()
-        latest_step = status.get("latest_step")
-        return AnalysisStatusResponse(
-            id=UUID(analysis_id),
-            status=status["status"],
-            current_agent=status.get("current_agent"),
-            current_step=latest_step.action if latest_step and hasattr(latest_step, 'action') else None,
-            progress_percentage=status["progress_percentage"],
-            latest_update=f"Step {status['completed_steps']}: {status.get('current_agent', 'Processing')}"
-        )
+        return _status_response(analysis_id, orchestrator.get_status())
     
     analysis = active_analyses[analysis_id]
     return AnalysisStatusResponse(
@@ -362,43 +1071,154 @@ async def get_analysis_status(analysis_id: str):
     )
 
 
+async def _find_status(analysis_id: str) -> Optional[AnalysisStatusView]:
+    """Stored status of an analysis without loading its results."""
+    return await AnalysisDocument.find_one(
+        AnalysisDocument.analysis_id == analysis_id, projection_model=AnalysisStatusView
+    )
+
+
+def _status_response(analysis_id: str, status: Dict[str, Any]) -> AnalysisStatusResponse:
+    """Build the status response from an orchestrator status or bus snapshot."""
+    latest_step = status.get("latest_step")
+    if isinstance(latest_step, dict):
+        current_step = latest_step.get("action")
+    else:
+        current_step = latest_step.action if latest_step and hasattr(latest_step, 'action') else None
+    
+    if AnalysisStatus(status["status"]) in FINISHED_STATUSES:
+        latest_update = AnalysisStatus(status["status"]).value
+    else:
+        latest_update = f"Step {status['completed_steps']}: {status.get('current_agent') or 'Processing'}"
+    
+    return AnalysisStatusResponse(
+        id=UUID(analysis_id),
+        status=status["status"],
+        current_agent=status.get("current_agent"),
+        current_step=current_step,
+        progress_percentage=status["progress_percentage"],
+        latest_update=latest_update
+    )
+
+
+@router.post("/{analysis_id}/resume")
+async def resume_analysis(analysis_id: str):
+    """
+    Resume a failed or cancelled analysis.
+    Phases that finished before the failure are restored from their
+    checkpoints; only the missing ones run again.
+    """
+    if is_connected():
+        analysis_doc = await AnalysisDocument.find_one(AnalysisDocument.analysis_id == analysis_id)
+        if not analysis_doc:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        _ensure_resumable(AnalysisStatus(analysis_doc.status))
+        checkpoints = analysis_doc.checkpoints
+        request = AnalysisRequest.model_construct(
+            problem_statement=analysis_doc.problem_statement,
+            context=analysis_doc.context,
+            preferences=analysis_doc.preferences
+        )
+        created_at = analysis_doc.created_at
+    else:
+        if analysis_id not in active_analyses:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        analysis = active_analyses[analysis_id]
+        _ensure_resumable(AnalysisStatus(analysis["status"]))
+        checkpoints = analysis.get("checkpoints") or {}
+        request = AnalysisRequest.model_construct(
+            problem_statement=analysis["problem_statement"],
+            context=analysis.get("context"),
+            preferences=analysis.get("preferences")
+        )
+        created_at = datetime.fromisoformat(analysis["created_at"])
+    
+    await _set_status(analysis_id, AnalysisStatus.PENDING)
+    # The worker that reserves the resume job starts a fresh orchestrator
+    analysis_orchestrators.pop(analysis_id, None)
+    
+    # The original job is finished, so the resume gets a job of its own
+    await get_job_queue().enqueue(
+        ANALYSIS_JOB,
+        _analysis_job_payload(analysis_id, request, created_at),
+        job_id=f"{analysis_id}:resume:{uuid4().hex[:8]}",
+        max_attempts=settings.JOB_MAX_ATTEMPTS,
+        priority=PRIORITY_RANKS.get((request.preferences or {}).get("priority"), PRIORITY_RANKS[DEFAULT_PRIORITY])
+    )
+    logger.info(f"🔁 Resuming analysis {analysis_id} with {list(checkpoints)} checkpointed")
+    
+    return {
+        "id": analysis_id,
+        "status": AnalysisStatus.PENDING,
+        "checkpointed_phases": list(checkpoints),
+        "message": "Analysis resumed. Completed phases will not run again."
+    }
+
+
+def _ensure_resumable(status: AnalysisStatus) -> None:
+    if status not in (AnalysisStatus.FAILED, AnalysisStatus.CANCELLED):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Only failed or cancelled analyses can be resumed. Current status: {status.value}"
+        )
+
+
 @router.get("/{analysis_id}/status/stream")
-async def stream_analysis_status(analysis_id: str):
-    """Stream real-time status updates using Server-Sent Events."""
-    if analysis_id not in active_analyses:
-        raise HTTPException(status_code=404, detail="Analysis not found")
+async def stream_analysis_status(
+    analysis_id: str,
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Stream real-time status updates using Server-Sent Events.
+    
+    Events are pushed from the event bus as soon as they are published, so
+    the stream works the same whichever process runs the analysis. Status
+    updates are sent as default ``message`` events; each reasoning step as a
+    ``step`` event, agent output token by token as ``token`` events while it
+    streams, and each completed top-level result field as a ``field`` event.
+    Events carry IDs, so a reconnecting client that sends ``Last-Event-ID``
+    receives what it missed first. The last event has ``final`` set and
+    includes the stored result.
+    """
+    await _build_status(analysis_id)  # 404 for unknown analyses
+    # Subscribe before reading the current state so nothing falls in between
+    subscription = get_event_bus().subscribe([analysis_id])
     
     async def event_generator():
-        last_status = None
-        
-        while True:
-            orchestrator = analysis_orchestrators.get(analysis_id)
-            analysis = active_analyses.get(analysis_id)
+        try:
+            sent = set()
+            if last_event_id:
+                missed = await get_event_bus().history(analysis_id, after=last_event_id)
+                for event in missed:
+                    sent.add(event["id"])
+                    if _is_terminal(event):
+                        yield await _final_event(analysis_id, event["id"])
+                        return
+                    message = _sse_message(analysis_id, event)
+                    if message:
+                        yield message
             
-            if not analysis:
-                yield f"data: {json.dumps({'error': 'Analysis not found'})}\n\n"
-                break
+            status, _ = _with_queue_info(analysis_id, (await status_cache.get(analysis_id)).response)
+            if status.status in FINISHED_STATUSES:
+                yield await _final_event(analysis_id)
+                return
+            yield f"data: {json.dumps(jsonable_encoder(status))}\n\n"
             
-            # Get current status
-            if orchestrator:
-                current_status = orchestrator.get_status()
-            else:
-                current_status = {
-                    "status": analysis["status"],
-                    "progress_percentage": 100 if analysis["status"] == AnalysisStatus.COMPLETED else 0
-                }
-            
-            # Send update if status changed
-            if current_status != last_status:
-                yield f"data: {json.dumps(current_status, default=str)}\n\n"
-                last_status = current_status.copy()
-            
-            # Check if completed or failed
-            if analysis["status"] in [AnalysisStatus.COMPLETED, AnalysisStatus.FAILED]:
-                yield f"data: {json.dumps({'final': True, 'status': analysis['status'].value})}\n\n"
-                break
-            
-            await asyncio.sleep(1)  # Poll every second
+            while True:
+                event = await subscription.get(timeout=settings.SSE_KEEPALIVE_SECONDS)
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                if event["id"] in sent:
+                    continue
+                if _is_terminal(event):
+                    yield await _final_event(analysis_id, event["id"])
+                    return
+                message = _sse_message(analysis_id, event)
+                if message:
+                    yield message
+        finally:
+            subscription.close()
     
     return StreamingResponse(
         event_generator(),
@@ -406,19 +1226,49 @@ async def stream_analysis_status(analysis_id: str):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
         }
     )
 
 
+def _is_terminal(event: Dict[str, Any]) -> bool:
+    return event["type"] == "status" and AnalysisStatus(event["data"]["status"]) in FINISHED_STATUSES
+
+
+def _sse_message(analysis_id: str, event: Dict[str, Any]) -> Optional[str]:
+    """Format a bus event for the status stream; internal events give None."""
+    if event["type"] == "status":
+        data = jsonable_encoder(_status_response(analysis_id, event["data"]))
+        return f"id: {event['id']}\ndata: {json.dumps(data)}\n\n"
+    if event["type"] in ("step", "token", "field"):
+        # Tokens are never retained, so they do not move the resume point
+        id_line = "" if event["type"] == "token" else f"id: {event['id']}\n"
+        return f"{id_line}event: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+    return None
+
+
+async def _final_event(analysis_id: str, event_id: Optional[str] = None) -> str:
+    """Terminal stream event: the final status plus the stored result."""
+    data = jsonable_encoder(await _build_status(analysis_id))
+    data["final"] = True
+    data["result"] = None
+    if data["status"] == AnalysisStatus.COMPLETED.value:
+        try:
+            data["result"] = jsonable_encoder(await get_analysis(analysis_id))
+        except HTTPException:
+            pass
+    id_line = f"id: {event_id}\n" if event_id else ""
+    return f"{id_line}data: {json.dumps(data, default=str)}\n\n"
+
+
 @router.get("/{analysis_id}/reasoning")
 async def get_reasoning_timeline(analysis_id: str):
     """Get the reasoning timeline for an analysis."""
-    if analysis_id not in active_analyses:
+    steps = await _reasoning_steps(analysis_id)
+    if steps is None:
         raise HTTPException(status_code=404, detail="Analysis not found")
     
-    orchestrator = analysis_orchestrators.get(analysis_id)
-    
-    if orchestrator:
+    if steps:
         return {
             "analysis_id": analysis_id,
             "steps": [
@@ -432,9 +1282,9 @@ async def get_reasoning_timeline(analysis_id: str):
                     "duration_ms": step.duration_ms,
                     "timestamp": step.timestamp.isoformat()
                 }
-                for step in orchestrator.reasoning_steps
+                for step in steps
             ],
-            "total_steps": len(orchestrator.reasoning_steps)
+            "total_steps": len(steps)
         }
     
     return {
@@ -444,31 +1294,80 @@ async def get_reasoning_timeline(analysis_id: str):
     }
 
 
+async def _reasoning_steps(analysis_id: str) -> Optional[List[AgentStep]]:
+    """
+    Reasoning steps from the local orchestrator, the event bus snapshot of
+    whichever worker runs the analysis, or the stored result.
+    
+    Returns None for unknown analyses.
+    """
+    orchestrator = analysis_orchestrators.get(analysis_id)
+    if orchestrator and orchestrator.reasoning_steps:
+        return orchestrator.reasoning_steps
+    
+    snapshot = await get_event_bus().get_status(analysis_id)
+    if snapshot and snapshot.get("reasoning_steps"):
+        return [AgentStep(**step) for step in snapshot["reasoning_steps"]]
+    
+    if is_connected():
+        analysis_doc = await AnalysisDocument.find_one(AnalysisDocument.analysis_id == analysis_id)
+        if analysis_doc:
+            return [_agent_step(step, analysis_doc.created_at) for step in analysis_doc.reasoning_steps]
+    
+    if analysis_id in active_analyses:
+        analysis = active_analyses[analysis_id]
+        steps = (analysis.get("result") or {}).get("reasoning_steps", [])
+        return [step if isinstance(step, AgentStep) else AgentStep(**step) for step in steps]
+    
+    return [] if orchestrator or snapshot else None
+
+
+def _agent_step(step: ReasoningStepModel, fallback_time: datetime) -> AgentStep:
+    """Convert a stored reasoning step back to the agent schema."""
+    return AgentStep(
+        agent_name=step.agent,
+        step_number=step.step_number,
+        action=step.action,
+        input_summary="",
+        output_summary=step.summary,
+        reasoning=step.reasoning,
+        confidence=step.confidence,
+        duration_ms=step.duration_ms,
+        timestamp=step.timestamp or fallback_time
+    )
+
+
 @router.get("/{analysis_id}/explanation")
 async def get_explanation(analysis_id: str):
     """Get a human-friendly explanation of the analysis."""
-    if analysis_id not in active_analyses:
-        raise HTTPException(status_code=404, detail="Analysis not found")
-    
-    analysis = active_analyses[analysis_id]
+    if is_connected():
+        analysis_doc = await AnalysisDocument.find_one(AnalysisDocument.analysis_id == analysis_id)
+        if not analysis_doc:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        status = AnalysisStatus(analysis_doc.status)
+        decision = analysis_doc.decision
+    else:
+        if analysis_id not in active_analyses:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        analysis = active_analyses[analysis_id]
+        status = AnalysisStatus(analysis["status"])
+        decision = (analysis.get("result") or {}).get("decision")
     
-    if analysis["status"] != AnalysisStatus.COMPLETED:
+    if status != AnalysisStatus.COMPLETED:
         raise HTTPException(
             status_code=400,
-            detail=f"Analysis not completed. Current status: {analysis['status'].value}"
+            detail=f"Analysis not completed. Current status: {status.value}"
         )
     
-    orchestrator = analysis_orchestrators.get(analysis_id)
-    result = analysis.get("result", {})
-    decision = result.get("decision")
+    steps = await _reasoning_steps(analysis_id)
     
-    if decision and orchestrator:
+    if decision and steps:
         # Convert Decision object to dict if needed
         decision_dict = decision.model_dump() if hasattr(decision, 'model_dump') else decision
         
         explanation = ExplanationGenerator.generate_decision_explanation(
             decision_dict,
-            orchestrator.reasoning_steps
+            steps
         )
         return explanation
     
@@ -576,20 +1475,109 @@ async def get_mock_analysis():
         }
     }
     
-    # Store in active_analyses for status endpoint
+    # Store in active_analyses for status endpoint, counted like any other
+    previous = active_analyses.peek(mock_id)
     active_analyses[mock_id] = mock_analysis
+    if not is_connected():
+        await record_transition(
+            previous["status"] if previous else None,
+            (previous.get("result") or {}).get("decision") if previous else None,
+            AnalysisStatus.COMPLETED,
+            mock_analysis["result"]["decision"]
+        )
     
     return mock_analysis
 
 
 @router.delete("/{analysis_id}")
 async def delete_analysis(analysis_id: str):
-    """Delete an analysis."""
-    if analysis_id not in active_analyses:
-        raise HTTPException(status_code=404, detail="Analysis not found")
+    """Delete an analysis, cancelling it first if it is still running."""
+    if is_connected():
+        analysis_doc = await _find_status(analysis_id)
+        if not analysis_doc:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        await _cancel(analysis_id, AnalysisStatus(analysis_doc.status))
+        # Read the status as deleted, after any cancellation
+        deleted = await AnalysisDocument.get_motor_collection().find_one_and_delete(
+            {"analysis_id": analysis_id}, projection={"status": 1, "decision": 1}
+        )
+        if deleted:
+            await record_transition(deleted["status"], deleted.get("decision"), None)
+    else:
+        if analysis_id not in active_analyses:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        await _cancel(analysis_id, AnalysisStatus(active_analyses[analysis_id]["status"]))
+        deleted = active_analyses.pop(analysis_id)
+        await record_transition(deleted["status"], (deleted.get("result") or {}).get("decision"), None)
     
-    del active_analyses[analysis_id]
-    if analysis_id in analysis_orchestrators:
-        del analysis_orchestrators[analysis_id]
+    analysis_orchestrators.pop(analysis_id, None)
+    bus = get_event_bus()
+    # Cached statuses in every process drop it
+    await bus.publish(analysis_id, "deleted", {})
+    await bus.delete(analysis_id)
+    status_cache.discard(analysis_id)
     
     return {"message": f"Analysis {analysis_id} deleted"}
+
+
+@router.post("/{analysis_id}/cancel")
+async def cancel_analysis(analysis_id: str):
+    """
+    Cancel a queued or running analysis.
+    In-flight LLM calls are aborted and their concurrency slots released.
+    """
+    if is_connected():
+        analysis_doc = await _find_status(analysis_id)
+        if not analysis_doc:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        status = AnalysisStatus(analysis_doc.status)
+    else:
+        if analysis_id not in active_analyses:
+            raise HTTPException(status_code=404, detail="Analysis not found")
+        status = AnalysisStatus(active_analyses[analysis_id]["status"])
+    
+    if status in FINISHED_STATUSES:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Analysis already finished. Current status: {status.value}"
+        )
+    
+    was_running = await _cancel(analysis_id, status)
+    
+    return {
+        "id": analysis_id,
+        "status": AnalysisStatus.CANCELLED,
+        "was_running": was_running,
+        "message": "Analysis cancelled."
+    }
+
+
+async def _cancel(analysis_id: str, status: AnalysisStatus) -> bool:
+    """
+    Record an unfinished analysis as cancelled and stop its pipeline.
+    
+    Returns whether a pipeline was running in this process. A queued job
+    skips the analysis once it sees the cancelled status, and workers in
+    other processes receive the ``cancel`` event in ``_watch_for_cancellation``.
+    """
+    if status in FINISHED_STATUSES:
+        return False
+    
+    await _set_status(analysis_id, AnalysisStatus.CANCELLED)
+    try:
+        await get_event_bus().publish(analysis_id, "cancel", {})
+    except Exception as e:
+        logger.warning(f"Failed to publish cancellation of {analysis_id}: {e}")
+    
+    task = running_analyses.get(analysis_id)
+    if task is not None:
+        task.cancel()
+        # Wait for in-flight LLM calls to unwind so their slots are free on return
+        await asyncio.gather(task, return_exceptions=True)
+        logger.info(f"🛑 Cancelled running analysis {analysis_id}")
+    
+    orchestrator = analysis_orchestrators.get(analysis_id)
+    if orchestrator:
+        orchestrator.status = AnalysisStatus.CANCELLED
+        orchestrator.current_agent = None
+    return task is not None
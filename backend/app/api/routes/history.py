@@ -11,15 +11,23 @@ router = APIRouter()
 async def get_analysis_history(
     limit: int = Query(default=10, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
-    status: Optional[str] = None
+    status: Optional[str] = None,
+    after: Optional[str] = None,
+    include_total: bool = Query(default=True)
 ):
     """
     Get analysis history for the current user.
     In production, this would filter by authenticated user.
+    
+    Pass the ``next_after`` cursor of a page as ``after`` to get the next
+    one; ``offset`` is ignored then. ``include_total=false`` skips counting
+    the matching analyses and returns a null ``total``.
     """
-    from app.db import AnalysisDocument, is_connected
+    from app.db import AnalysisDocument, AnalysisSummary, is_connected
     from app.api.routes.analysis import active_analyses
+    from app.api.pagination import after_query, decode_cursor, encode_cursor
     
+    cursor = decode_cursor(after) if after else None
     all_analyses = []
     
     # Try MongoDB first
@@ -30,10 +38,18 @@ async def get_analysis_history(
             query["status"] = status
         
         # Get total count
-        total = await AnalysisDocument.find(query).count()
+        total = await AnalysisDocument.find(query).count() if include_total else None
         
-        # Query with pagination and sorting
-        docs = await AnalysisDocument.find(query).sort("-created_at").skip(offset).limit(limit).to_list()
+        # Query a page past the cursor, or past the offset
+        if cursor:
+            query.update(after_query(cursor))
+        # Only the listed fields are read, computed by the server
+        docs = AnalysisDocument.find(query, projection_model=AnalysisSummary).sort("-created_at", "-analysis_id")
+        if not cursor:
+            docs = docs.skip(offset)
+        docs = await docs.limit(limit + 1).to_list()
+        has_more = len(docs) > limit
+        docs = docs[:limit]
         
         # Convert to response format
         for doc in docs:
@@ -41,8 +57,8 @@ async def get_analysis_history(
                 "id": doc.analysis_id,
                 "problem_statement": doc.problem_statement[:100] + "..." if len(doc.problem_statement) > 100 else doc.problem_statement,
                 "status": doc.status,
-                "verdict": doc.decision.verdict if doc.decision else None,
-                "confidence": doc.decision.confidence if doc.decision else None,
+                "verdict": doc.verdict,
+                "confidence": doc.confidence,
                 "created_at": doc.created_at.isoformat(),
                 "completed_at": doc.completed_at.isoformat() if doc.completed_at else None
             }
@@ -52,24 +68,17 @@ async def get_analysis_history(
             "analyses": all_analyses,
             "total": total,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_after": encode_cursor(docs[-1].created_at, docs[-1].analysis_id) if has_more else None
         }
     
-    # Fallback to in-memory
-    all_analyses_data = list(active_analyses.values())
-    
-    # Filter by status if provided
-    if status:
-        all_analyses_data = [a for a in all_analyses_data if a.get("status", "").value == status]
-    
-    # Sort by created_at descending
-    all_analyses_data.sort(
-        key=lambda x: x.get("created_at", ""), 
-        reverse=True
+    # Fallback to in-memory, paged through its creation-time index
+    before = (cursor[0].isoformat(), cursor[1]) if cursor else None
+    ids, has_more = active_analyses.index.page(
+        status, before=before, offset=0 if cursor else offset, limit=limit
     )
-    
-    # Apply pagination
-    paginated = all_analyses_data[offset:offset + limit]
+    total = active_analyses.index.count(status) if include_total else None
+    paginated = [analysis for analysis in map(active_analyses.peek, ids) if analysis is not None]
     
     # Simplify for list view
     history = []
@@ -89,95 +98,20 @@ async def get_analysis_history(
     
     return {
         "analyses": history,
-        "total": len(all_analyses_data),
+        "total": total,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_after": encode_cursor(paginated[-1]["created_at"], ids[-1]) if has_more and paginated else None
     }
 
 
 @router.get("/stats")
-async def get_analysis_stats():
-    """Get statistics about analyses."""
-    from app.db import AnalysisDocument, is_connected
-    from app.api.routes.analysis import active_analyses
-    
-    # Try MongoDB first
-    if is_connected():
-        all_docs = await AnalysisDocument.find_all().to_list()
-        
-        if not all_docs:
-            return {
-                "total_analyses": 0,
-                "completed": 0,
-                "pending": 0,
-                "failed": 0,
-                "average_confidence": None,
-                "verdict_distribution": {}
-            }
-        
-        completed = [d for d in all_docs if d.status == "completed"]
-        pending = [d for d in all_docs if d.status in ["pending", "researching", "analyzing", "assessing_risks", "deciding"]]
-        failed = [d for d in all_docs if d.status == "failed"]
-        
-        # Calculate verdict distribution and average confidence
-        verdict_dist = {}
-        confidences = []
-        
-        for doc in completed:
-            if doc.decision:
-                if doc.decision.verdict:
-                    verdict_dist[doc.decision.verdict] = verdict_dist.get(doc.decision.verdict, 0) + 1
-                if doc.decision.confidence:
-                    confidences.append(doc.decision.confidence)
-        
-        return {
-            "total_analyses": len(all_docs),
-            "completed": len(completed),
-            "pending": len(pending),
-            "failed": len(failed),
-            "average_confidence": sum(confidences) / len(confidences) if confidences else None,
-            "verdict_distribution": verdict_dist
-        }
-    
-    # Fallback to in-memory
-    all_analyses = list(active_analyses.values())
-    
-    if not all_analyses:
-        return {
-            "total_analyses": 0,
-            "completed": 0,
-            "pending": 0,
-            "failed": 0,
-            "average_confidence": None,
-            "verdict_distribution": {}
-        }
-    
-    completed = [a for a in all_analyses if str(a.get("status", "")) == "completed"]
-    pending = [a for a in all_analyses if str(a.get("status", "")) in ["pending", "researching", "analyzing", "assessing_risks", "deciding"]]
-    failed = [a for a in all_analyses if str(a.get("status", "")) == "failed"]
-    
-    # Calculate verdict distribution
-    verdict_dist = {}
-    confidences = []
-    
-    for analysis in completed:
-        result = analysis.get("result", {})
-        decision = result.get("decision") if result else None
-        
-        if decision:
-            verdict = decision.verdict if hasattr(decision, 'verdict') else decision.get("verdict")
-            if verdict:
-                verdict_dist[verdict] = verdict_dist.get(verdict, 0) + 1
-            
-            conf = decision.confidence_score if hasattr(decision, 'confidence_score') else decision.get("confidence_score")
-            if conf:
-                confidences.append(conf)
+async def get_analysis_stats(refresh: bool = Query(default=False)):
+    """
+    Get statistics about analyses.
+    Served from counters maintained on every status change; ``refresh``
+    recounts them with an aggregation first.
+    """
+    from app.db.stats import get_counters, summarize
     
-    return {
-        "total_analyses": len(all_analyses),
-        "completed": len(completed),
-        "pending": len(pending),
-        "failed": len(failed),
-        "average_confidence": sum(confidences) / len(confidences) if confidences else None,
-        "verdict_distribution": verdict_dist
-    }
+    return summarize(await get_counters(refresh))
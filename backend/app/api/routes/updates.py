@@ -0,0 +1,159 @@
+from fastapi import APIRouter, Header, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.encoders import jsonable_encoder
+from typing import Optional, List, Dict, Any
+import asyncio
+import json
+import logging
+
+from app.config import get_settings
+from app.events import Subscription, get_event_bus
+from app.api.routes.analysis import _build_status, _status_response
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+settings = get_settings()
+
+# Bus events worth a dashboard frame; tokens and fields stay on the SSE stream
+UPDATE_EVENTS = ("status", "step")
+
+
+@router.websocket("/ws")
+async def analysis_updates(websocket: WebSocket, x_client_id: Optional[str] = Header(None)):
+    """
+    Progress of many analyses over one connection.
+
+    Clients send ``{"action": "subscribe" | "unsubscribe", "analysis_ids":
+    [...]}`` and/or ``"feed": "tenant"`` for every analysis of their tenant.
+    As for submissions, the tenant is the ``X-Client-ID`` header, which the
+    API trusts as is: it must be set by a gateway that authenticates the
+    caller and overwrites any value the client sent. Each
+    message is acknowledged with a ``subscribed`` frame; newly subscribed
+    analyses get their current status in the next frame. Updates are sent as
+    ``updates`` frames batched over ``WS_BATCH_INTERVAL_MS``, keeping only the
+    latest status of each analysis per frame.
+    """
+    tenant = x_client_id or "anonymous"
+    await websocket.accept()
+    subscription = get_event_bus().subscribe(
+        analysis_ids=[], max_queued=settings.WS_MAX_QUEUED_EVENTS, event_types=UPDATE_EVENTS
+    )
+    send_lock = asyncio.Lock()
+    sender = asyncio.create_task(_send_batches(websocket, subscription, send_lock))
+    try:
+        while True:
+            reply = await _handle_message(await websocket.receive_text(), subscription, tenant)
+            async with send_lock:
+                await websocket.send_json(reply)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        subscription.close()
+
+
+async def _handle_message(text: str, subscription: Subscription, tenant: str) -> Dict[str, Any]:
+    """Apply a subscribe/unsubscribe message; returns the reply frame."""
+    try:
+        message = json.loads(text)
+    except ValueError:
+        return {"type": "error", "detail": "Messages must be JSON"}
+    if not isinstance(message, dict) or message.get("action") not in ("subscribe", "unsubscribe"):
+        return {"type": "error", "detail": "Expected action 'subscribe' or 'unsubscribe'"}
+    action = message["action"]
+    analysis_ids = message.get("analysis_ids", [])
+    feed = message.get("feed")
+    if not isinstance(analysis_ids, list) or not all(isinstance(i, str) for i in analysis_ids):
+        return {"type": "error", "detail": "analysis_ids must be a list of strings"}
+    if feed not in (None, "tenant"):
+        return {"type": "error", "detail": "The only feed is 'tenant'"}
+    tenants = [tenant] if feed else []
+
+    unknown = []
+    if action == "unsubscribe":
+        subscription.unwatch(analysis_ids, tenants)
+    else:
+        new_ids = [i for i in dict.fromkeys(analysis_ids) if i not in subscription.analysis_ids]
+        if len(subscription.analysis_ids) + len(new_ids) > settings.WS_MAX_SUBSCRIPTIONS:
+            return {
+                "type": "error",
+                "detail": f"At most {settings.WS_MAX_SUBSCRIPTIONS} analyses per connection"
+            }
+        known = []
+        for analysis_id, status in zip(new_ids, await asyncio.gather(
+            *(_current_status(analysis_id) for analysis_id in new_ids)
+        )):
+            if status is None:
+                unknown.append(analysis_id)
+                continue
+            known.append(analysis_id)
+            subscription.deliver({
+                "id": None,
+                "analysis_id": analysis_id,
+                "type": "snapshot",
+                "data": status
+            })
+        subscription.watch(known, tenants)
+
+    return {
+        "type": "subscribed",
+        "analysis_ids": sorted(subscription.analysis_ids),
+        "tenant": tenant if tenant in subscription.tenants else None,
+        "unknown": unknown
+    }
+
+
+async def _current_status(analysis_id: str) -> Optional[Dict[str, Any]]:
+    try:
+        return jsonable_encoder(await _build_status(analysis_id))
+    except HTTPException:
+        return None
+
+
+async def _send_batches(websocket: WebSocket, subscription: Subscription, send_lock: asyncio.Lock) -> None:
+    """Send the subscription's events in frames, one per batching window."""
+    loop = asyncio.get_running_loop()
+    interval = settings.WS_BATCH_INTERVAL_MS / 1000
+    while True:
+        batch = [await subscription.get()]
+        deadline = loop.time() + interval
+        while len(batch) < settings.WS_MAX_BATCH_EVENTS:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            event = await subscription.get(timeout=remaining)
+            if event is None:
+                break
+            batch.append(event)
+
+        updates = _coalesce(batch)
+        if updates:
+            async with send_lock:
+                await websocket.send_json({"type": "updates", "updates": updates})
+
+
+def _coalesce(events: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Frame entries for a batch, keeping the latest status of each analysis."""
+    updates: List[Optional[Dict[str, Any]]] = []
+    status_at: Dict[str, int] = {}
+    for event in events:
+        if event["type"] == "snapshot":
+            data = event["data"]
+        elif event["type"] == "status":
+            data = jsonable_encoder(_status_response(event["analysis_id"], event["data"]))
+        else:
+            data = event["data"]
+
+        kind = "status" if event["type"] == "snapshot" else event["type"]
+        if kind == "status":
+            previous = status_at.get(event["analysis_id"])
+            if previous is not None:
+                updates[previous] = None
+            status_at[event["analysis_id"]] = len(updates)
+        updates.append({
+            "analysis_id": event["analysis_id"],
+            "event": kind,
+            "id": event["id"],
+            "data": data
+        })
+    return [update for update in updates if update is not None]
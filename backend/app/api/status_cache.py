@@ -0,0 +1,152 @@
+"""Versioned in-process cache of analysis status responses.
+
+Status polls are answered from here instead of storage. Every cached
+analysis is watched on the event bus: its status and step events reload the
+entry, and a changed response bumps the entry's version and wakes requests
+long-polling for it. Entries are also reloaded after ``ttl_seconds`` so a
+missed event cannot keep a stale status around for long.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+
+from app.events import Subscription, get_event_bus
+
+logger = logging.getLogger(__name__)
+
+# Bus events after which a cached status is reloaded (or dropped)
+STATUS_EVENTS = ("status", "step", "deleted")
+
+
+def compute_etag(value: Any) -> str:
+    """Weak ETag over the JSON encoding, identical in every process."""
+    encoded = json.dumps(jsonable_encoder(value), sort_keys=True, default=str)
+    return f'W/"{hashlib.sha1(encoded.encode()).hexdigest()[:20]}"'
+
+
+@dataclass
+class StatusEntry:
+    """A cached status response and its version in this process."""
+    response: Any
+    version: int = 1
+    loaded_at: float = field(default_factory=time.monotonic)
+    changed: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class StatusCache:
+    """LRU cache of status responses built by ``loader``, kept fresh by bus events."""
+
+    def __init__(
+        self,
+        loader: Callable[[str], Awaitable[Any]],
+        max_entries: int = 10000,
+        ttl_seconds: float = 30.0
+    ):
+        self.loader = loader
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, StatusEntry]" = OrderedDict()
+        self._subscription: Optional[Subscription] = None
+        self._listener: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    async def get(self, analysis_id: str) -> StatusEntry:
+        """Cached entry, loading it on a miss or once it is older than the TTL."""
+        self._ensure_listening()
+        entry = self._entries.get(analysis_id)
+        if entry is not None and time.monotonic() - entry.loaded_at < self.ttl_seconds:
+            self._entries.move_to_end(analysis_id)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return await self._load(analysis_id)
+
+    async def wait_for_change(self, analysis_id: str, version: int, timeout: float) -> StatusEntry:
+        """Entry once its version differs from ``version``, or after ``timeout`` seconds."""
+        entry = await self.get(analysis_id)
+        if entry.version == version:
+            try:
+                await asyncio.wait_for(entry.changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            entry = await self.get(analysis_id)
+        return entry
+
+    def discard(self, analysis_id: str) -> None:
+        """Forget an analysis, waking anyone waiting on it."""
+        entry = self._entries.pop(analysis_id, None)
+        if entry is not None:
+            entry.changed.set()
+            if self._subscription is not None:
+                self._subscription.unwatch([analysis_id])
+
+    async def _load(self, analysis_id: str) -> StatusEntry:
+        response = await self.loader(analysis_id)
+        entry = self._entries.get(analysis_id)
+        if entry is None:
+            entry = StatusEntry(response)
+            self._entries[analysis_id] = entry
+            self._subscription.watch([analysis_id])
+            while len(self._entries) > self.max_entries:
+                self.discard(next(iter(self._entries)))
+        elif response != entry.response:
+            entry.response = response
+            entry.version += 1
+            # Wake the current waiters; later ones wait for the next change
+            entry.changed.set()
+            entry.changed = asyncio.Event()
+        entry.loaded_at = time.monotonic()
+        return entry
+
+    def _ensure_listening(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._listener is not None and not self._listener.done() and self._listener.get_loop() is loop:
+            return
+        # Entries hold loop-bound events; start over on a new loop
+        if self._subscription is not None:
+            self._subscription.close()
+        self._entries.clear()
+        self._subscription = get_event_bus().subscribe(
+            analysis_ids=[], max_queued=self.max_entries, event_types=STATUS_EVENTS
+        )
+        self._listener = asyncio.create_task(self._listen(self._subscription))
+
+    async def _listen(self, subscription: Subscription) -> None:
+        async for event in subscription:
+            analysis_id = event["analysis_id"]
+            if analysis_id not in self._entries:
+                continue
+            try:
+                await self._load(analysis_id)
+                self.reloads += 1
+            except Exception as e:
+                logger.debug(f"Dropping cached status of {analysis_id}: {e}")
+                self.discard(analysis_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+        }
+
+    async def close(self) -> None:
+        # Closing the subscription ends the listener; cancel it if it is busy
+        if self._subscription is not None:
+            self._subscription.close()
+            self._subscription = None
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        self._entries.clear()
@@ -14,6 +14,35 @@ class Settings(BaseSettings):
     # OpenRouter API
     OPENROUTER_API_KEY: str
     OPENROUTER_MODEL: str = "xiaomi/mimo-v2-flash:free"
+    OPENROUTER_BASE_URL: str = "https://openrouter.ai/api/v1"
+    
+    # LLM HTTP connection pool (shared by all agents)
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    LLM_REQUEST_TIMEOUT_SECONDS: float = 120.0
+    LLM_STREAMING_ENABLED: bool = True
+    
+    # LLM rate limits per model (0 = unlimited) and global in-flight cap
+    LLM_REQUESTS_PER_MINUTE: int = 60
+    LLM_TOKENS_PER_MINUTE: int = 0
+    LLM_MAX_CONCURRENT_CALLS: int = 8
+    
+    # LLM deadlines and hedging (agents may override the deadlines)
+    LLM_SOFT_DEADLINE_SECONDS: float = 30.0
+    LLM_HARD_DEADLINE_SECONDS: float = 90.0
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_PERCENTILE: float = 95.0
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    
+    # Token budget for upstream agent outputs embedded in a prompt
+    PROMPT_CONTEXT_TOKEN_BUDGET: int = 3000
+    
+    # LLM response cache (exact prompt match)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_MAX_ENTRIES: int = 512
+    LLM_CACHE_TTL_SECONDS: int = 3600
+    LLM_CACHE_PATH: Optional[str] = None  # e.g. ./data/llm_cache.sqlite
     
     # Supabase
     SUPABASE_URL: str
@@ -26,6 +55,59 @@ class Settings(BaseSettings):
     # ChromaDB
     CHROMA_PERSIST_DIR: str = "./chroma_db"
     
+    # Reuse of near-duplicate past analyses (opt-in, per request via preferences.allow_reuse)
+    ANALYSIS_REUSE_ENABLED: bool = False
+    ANALYSIS_REUSE_MAX_DISTANCE: float = 0.15
+    ANALYSIS_REUSE_MAX_AGE_HOURS: float = 168
+    ANALYSIS_REUSE_MODE: str = "full"  # "full" or "research"
+    
+    # Batch analysis
+    BATCH_MAX_CONCURRENCY: int = 4
+    BATCH_MAX_ENTRIES: int = 1000  # batches kept in memory without MongoDB
+    BATCH_TTL_SECONDS: float = 7 * 24 * 3600
+    
+    # Degraded execution for analyses with preferences.deadline_ms
+    DEADLINE_SKIP_MEMORY_BELOW_MS: int = 30000
+    DEADLINE_FUSE_BELOW_MS: int = 10000
+    DEADLINE_FINAL_PHASE_SHARE: float = 0.35  # of the budget, held back for the decision
+    LLM_OUTPUT_TOKENS_PER_SECOND: float = 40.0  # used to cap max_tokens to the time left
+    DEADLINE_MIN_MAX_TOKENS: int = 256
+    
+    # Bounds for in-process analysis state (0 = unbounded)
+    ANALYSIS_RESULTS_MAX_ENTRIES: int = 1000
+    ANALYSIS_RESULTS_MAX_MB: int = 256
+    ORCHESTRATOR_MAX_ENTRIES: int = 200
+    ORCHESTRATOR_TTL_SECONDS: float = 900
+    ANALYSIS_SPILL_PATH: Optional[str] = None  # e.g. ./data/analyses.sqlite
+    
+    # Durable job queue ("auto" = MongoDB when connected, else SQLite)
+    JOB_QUEUE_BACKEND: str = "auto"  # "auto", "mongodb" or "sqlite"
+    JOB_QUEUE_SQLITE_PATH: str = "./data/job_queue.sqlite"
+    # Jobs a process reserves at once; analyses beyond ANALYSIS_MAX_RUNNING
+    # wait in the fair scheduler, ordered by priority class and client
+    JOB_WORKER_CONCURRENCY: int = 16
+    ANALYSIS_MAX_RUNNING: int = 4
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 120.0
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_MAX_ATTEMPTS: int = 3
+    # Status snapshots and analysis events shared by all processes
+    # ("auto" = MongoDB capped collection when connected, else in-process)
+    EVENT_BUS_BACKEND: str = "auto"  # "auto", "mongodb" or "memory"
+    EVENT_BUS_CAPPED_MB: int = 64
+    # Comment line sent on idle status streams so proxies keep them open
+    SSE_KEEPALIVE_SECONDS: float = 15.0
+    # In-process status cache behind GET /status and the longest ?wait= long-poll
+    STATUS_CACHE_MAX_ENTRIES: int = 10000
+    STATUS_CACHE_TTL_SECONDS: float = 30.0
+    STATUS_MAX_WAIT_SECONDS: float = 60.0
+    # WebSocket progress channel: batching window, frame and subscription limits
+    WS_BATCH_INTERVAL_MS: int = 250
+    WS_MAX_BATCH_EVENTS: int = 500
+    WS_MAX_SUBSCRIPTIONS: int = 1000
+    WS_MAX_QUEUED_EVENTS: int = 10000
+    # Run workers inside the web process; disable when running `python -m app.worker`
+    RUN_EMBEDDED_WORKERS: bool = True
+    
     # MongoDB Atlas (Optional)
     MONGODB_URL: Optional[str] = None
     
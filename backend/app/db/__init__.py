@@ -1,6 +1,12 @@
 """Database package."""
 from app.db.database import init_db, close_db, get_database, is_connected
-from app.db.models import AnalysisDocument, DecisionModel, ReasoningStepModel
+from app.db.models import (
+    AnalysisDocument,
+    AnalysisStatusView,
+    AnalysisSummary,
+    DecisionModel,
+    ReasoningStepModel
+)
 
 __all__ = [
     "init_db",
@@ -10,4 +16,6 @@ __all__ = [
     "AnalysisDocument",
     "DecisionModel",
     "ReasoningStepModel",
+    "AnalysisSummary",
+    "AnalysisStatusView",
 ]
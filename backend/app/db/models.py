@@ -1,9 +1,10 @@
 """Database models for MongoDB using Beanie ODM."""
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from uuid import UUID, uuid4
 from beanie import Document
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class DecisionModel(BaseModel):
@@ -37,6 +38,7 @@ class AnalysisDocument(Document):
     status: str  # pending, researching, analyzing, assessing_risks, deciding, completed, failed
     problem_statement: str
     context: Optional[str] = None
+    preferences: Optional[Dict[str, Any]] = None
     created_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
     
@@ -44,6 +46,15 @@ class AnalysisDocument(Document):
     decision: Optional[DecisionModel] = None
     reasoning_steps: List[ReasoningStepModel] = []
     
+    # Output of each finished phase keyed by agent name, used to resume; kept
+    # once completed so near-duplicate problems can reuse them
+    checkpoints: Dict[str, Dict[str, Any]] = {}
+    
+    # Set when the result was served from a near-duplicate past analysis
+    reused_from: Optional[Dict[str, Any]] = None
+    # Shortcuts taken to meet preferences.deadline_ms (empty for full runs)
+    degradations: List[str] = []
+    
     # Error tracking
     error: Optional[str] = None
     
@@ -53,6 +64,9 @@ class AnalysisDocument(Document):
             "analysis_id",
             "status",
             "created_at",
+            # Keyset pages of the history, newest first, with and without a status filter
+            IndexModel([("created_at", DESCENDING), ("analysis_id", DESCENDING)]),
+            IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("analysis_id", DESCENDING)]),
         ]
     
     class Config:
@@ -76,3 +90,45 @@ class AnalysisDocument(Document):
                 "reasoning_steps": []
             }
         }
+
+
+# Projections: partial reads of an AnalysisDocument computed by the server
+
+class AnalysisSummary(BaseModel):
+    """History list entry; the problem statement is cut to 101 characters."""
+    analysis_id: str
+    status: str
+    problem_statement: str
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    verdict: Optional[str] = None
+    confidence: Optional[float] = None
+    
+    class Settings:
+        projection = {
+            "analysis_id": 1,
+            "status": 1,
+            "problem_statement": {"$substrCP": ["$problem_statement", 0, 101]},
+            "created_at": 1,
+            "completed_at": 1,
+            "verdict": "$decision.verdict",
+            "confidence": "$decision.confidence",
+        }
+
+
+class AnalysisStatusView(BaseModel):
+    """Status of an analysis with its step count and latest step only."""
+    status: str
+    error: Optional[str] = None
+    completed_at: Optional[datetime] = None
+    step_count: int = 0
+    latest_step: Optional[ReasoningStepModel] = None
+    
+    class Settings:
+        projection = {
+            "status": 1,
+            "error": 1,
+            "completed_at": 1,
+            "step_count": {"$size": {"$ifNull": ["$reasoning_steps", []]}},
+            "latest_step": {"$arrayElemAt": ["$reasoning_steps", -1]},
+        }
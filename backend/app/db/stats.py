@@ -0,0 +1,199 @@
+"""Materialized analysis counters behind the history statistics.
+
+Every status transition applies the difference between what the analysis
+contributed to the counters before and after it: one to the total and to
+its status bucket, and, once completed, one to its verdict plus its decision
+confidence. With MongoDB the counters live in a single document updated
+with ``$inc``; otherwise the same document shape is kept in memory. Reading
+the statistics is then O(1); an aggregation over the analyses rebuilds the
+document when it is missing or on request.
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from app.db.database import get_database, is_connected
+from app.db.models import AnalysisDocument
+from app.schemas import AnalysisStatus
+
+logger = logging.getLogger(__name__)
+
+COUNTERS_COLLECTION = "analysis_stats"
+COUNTERS_ID = "analyses"
+
+# Statuses reported individually; everything else is still in progress
+FINAL_BUCKETS = (AnalysisStatus.COMPLETED.value, AnalysisStatus.FAILED.value, AnalysisStatus.CANCELLED.value)
+IN_PROGRESS_BUCKET = "pending"
+
+
+def status_bucket(status: Any) -> str:
+    value = AnalysisStatus(status).value
+    return value if value in FINAL_BUCKETS else IN_PROGRESS_BUCKET
+
+
+def decision_stats(decision: Any) -> Tuple[Optional[str], Optional[float]]:
+    """Verdict and confidence of a stored decision (model, object or dict)."""
+    if decision is None:
+        return None, None
+    if isinstance(decision, dict):
+        verdict = decision.get("verdict")
+        confidence = decision.get("confidence") or decision.get("confidence_score")
+    else:
+        verdict = getattr(decision, "verdict", None)
+        confidence = getattr(decision, "confidence", None) or getattr(decision, "confidence_score", None)
+    if verdict is not None:
+        verdict = str(getattr(verdict, "value", verdict))
+    return verdict, confidence
+
+
+def _decision_contribution(decision: Any) -> Dict[str, float]:
+    counts: Dict[str, float] = {}
+    verdict, confidence = decision_stats(decision)
+    if verdict:
+        # Field names cannot contain dots
+        counts[f"verdicts.{verdict.replace('.', '_')}"] = 1
+    if confidence:
+        counts["confidence_sum"] = confidence
+        counts["confidence_count"] = 1
+    return counts
+
+
+def _contribution(status: Any, decision: Any) -> Dict[str, float]:
+    if status is None:
+        return {}
+    bucket = status_bucket(status)
+    counts = {"total": 1, f"status.{bucket}": 1}
+    if bucket == AnalysisStatus.COMPLETED.value:
+        counts.update(_decision_contribution(decision))
+    return counts
+
+
+def counter_delta(
+    old_status: Any,
+    old_decision: Any,
+    new_status: Any,
+    new_decision: Any = None
+) -> Dict[str, float]:
+    """``$inc`` document for a transition; a status of None means absent."""
+    delta = _contribution(new_status, new_decision)
+    for key, value in _contribution(old_status, old_decision).items():
+        delta[key] = delta.get(key, 0) - value
+    return {key: value for key, value in delta.items() if value}
+
+
+def apply_delta(counters: Dict[str, Any], delta: Dict[str, float]) -> None:
+    """Apply a dotted-path ``$inc`` document to nested counters in place."""
+    for path, value in delta.items():
+        target = counters
+        *parents, leaf = path.split(".")
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[leaf] = target.get(leaf, 0) + value
+
+
+def summarize(counters: Dict[str, Any]) -> Dict[str, Any]:
+    """Statistics response for a counters document."""
+    statuses = counters.get("status") or {}
+    confidence_count = counters.get("confidence_count") or 0
+    return {
+        "total_analyses": counters.get("total", 0),
+        "completed": statuses.get(AnalysisStatus.COMPLETED.value, 0),
+        "pending": statuses.get(IN_PROGRESS_BUCKET, 0),
+        "failed": statuses.get(AnalysisStatus.FAILED.value, 0),
+        "cancelled": statuses.get(AnalysisStatus.CANCELLED.value, 0),
+        "average_confidence": counters["confidence_sum"] / confidence_count if confidence_count else None,
+        "verdict_distribution": {verdict: count for verdict, count in (counters.get("verdicts") or {}).items() if count}
+    }
+
+
+def counters_from_groups(groups: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counters document from ``$group`` rows keyed by status and verdict."""
+    counters: Dict[str, Any] = {}
+    for group in groups:
+        status = group["_id"].get("status")
+        try:
+            bucket = status_bucket(status)
+        except ValueError:
+            continue
+        delta = {"total": group["count"], f"status.{bucket}": group["count"]}
+        verdict = group["_id"].get("verdict")
+        if bucket == AnalysisStatus.COMPLETED.value:
+            if verdict:
+                delta[f"verdicts.{verdict.replace('.', '_')}"] = group["count"]
+            if group.get("confidence_count"):
+                delta["confidence_sum"] = group["confidence_sum"]
+                delta["confidence_count"] = group["confidence_count"]
+        apply_delta(counters, delta)
+    return counters
+
+
+# Counters for the in-memory fallback
+memory_counters: Dict[str, Any] = {}
+
+
+def _collection():
+    return get_database()[COUNTERS_COLLECTION]
+
+
+async def record_transition(
+    old_status: Any,
+    old_decision: Any,
+    new_status: Any,
+    new_decision: Any = None
+) -> None:
+    """Count a stored status change (None for creation or deletion)."""
+    delta = counter_delta(old_status, old_decision, new_status, new_decision)
+    if not delta:
+        return
+    if not is_connected():
+        apply_delta(memory_counters, delta)
+        return
+    try:
+        await _collection().update_one({"_id": COUNTERS_ID}, {"$inc": delta}, upsert=True)
+    except Exception as e:
+        # Drift is repaired by rebuild_counters
+        logger.warning(f"Failed to update analysis counters: {e}")
+
+
+def rebuild_memory_counters(status_counts: Dict[str, int], completed_decisions: Iterable[Any]) -> None:
+    """Recount the in-memory fallback from its per-status counts and completed decisions."""
+    memory_counters.clear()
+    for status, count in status_counts.items():
+        try:
+            bucket = status_bucket(status)
+        except ValueError:
+            continue
+        apply_delta(memory_counters, {"total": count, f"status.{bucket}": count})
+    for decision in completed_decisions:
+        apply_delta(memory_counters, _decision_contribution(decision))
+
+
+def forget_in_memory(status: Any, decision: Any) -> None:
+    """Stop counting an analysis dropped from the in-memory fallback."""
+    apply_delta(memory_counters, counter_delta(status, decision, None))
+
+
+async def rebuild_counters() -> Dict[str, Any]:
+    """Recount every analysis with an aggregation and store the result."""
+    pipeline = [
+        {"$group": {
+            "_id": {"status": "$status", "verdict": "$decision.verdict"},
+            "count": {"$sum": 1},
+            "confidence_sum": {"$sum": "$decision.confidence"},
+            "confidence_count": {"$sum": {"$cond": [{"$gt": ["$decision.confidence", 0]}, 1, 0]}}
+        }}
+    ]
+    groups = await AnalysisDocument.get_motor_collection().aggregate(pipeline).to_list(None)
+    counters = counters_from_groups(groups)
+    await _collection().replace_one({"_id": COUNTERS_ID}, counters, upsert=True)
+    logger.info("Rebuilt analysis counters")
+    return counters
+
+
+async def get_counters(refresh: bool = False) -> Dict[str, Any]:
+    """Current counters document, rebuilding it if missing or ``refresh`` is set."""
+    if not is_connected():
+        return memory_counters
+    counters = None if refresh else await _collection().find_one({"_id": COUNTERS_ID})
+    if counters is None:
+        counters = await rebuild_counters()
+    return counters
@@ -0,0 +1,11 @@
+# Cross-process analysis events and status snapshots
+from app.events.base import EventBus, Subscription
+from app.events.bus import get_event_bus, start_event_bus, close_event_bus
+
+__all__ = [
+    "EventBus",
+    "Subscription",
+    "get_event_bus",
+    "start_event_bus",
+    "close_event_bus",
+]
@@ -0,0 +1,228 @@
+"""Event bus interface shared by the pub/sub backends."""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Event types that are never persisted, only delivered within the process
+TRANSIENT_EVENTS = {"token"}
+
+
+class Subscription:
+    """
+    A subscriber's queue of analysis events.
+
+    ``analysis_ids`` and ``tenants`` limit delivery to events of those
+    analyses or published for those tenants; with neither the subscription
+    receives every event. ``event_types``, when given, further limits it to
+    those types, so unwanted events never take up its queue. Slow subscribers
+    drop events instead of blocking publishers. Closing a subscription ends iteration over it.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        analysis_ids: Optional[Iterable[str]] = None,
+        max_queued: int = 1000,
+        tenants: Optional[Iterable[str]] = None,
+        event_types: Optional[Iterable[str]] = None
+    ):
+        self.bus = bus
+        self.firehose = analysis_ids is None and tenants is None
+        self.analysis_ids: Set[str] = set(analysis_ids or ())
+        self.tenants: Set[str] = set(tenants or ())
+        self.event_types: Optional[Set[str]] = set(event_types) if event_types is not None else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+        self.dropped = 0
+        self.closed = False
+
+    def wants(self, event_type: str) -> bool:
+        return self.event_types is None or event_type in self.event_types
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        return self.wants(event["type"]) and (
+            self.firehose
+            or event["analysis_id"] in self.analysis_ids
+            or event.get("tenant") in self.tenants
+        )
+
+    def watch(self, analysis_ids: Iterable[str] = (), tenants: Iterable[str] = ()) -> None:
+        """Also receive events of ``analysis_ids`` and ``tenants``."""
+        self.bus._unindex(self)
+        self.analysis_ids.update(analysis_ids)
+        self.tenants.update(tenants)
+        self.bus._index(self)
+
+    def unwatch(self, analysis_ids: Iterable[str] = (), tenants: Iterable[str] = ()) -> None:
+        """Stop receiving events of ``analysis_ids`` and ``tenants``."""
+        self.bus._unindex(self)
+        self.analysis_ids.difference_update(analysis_ids)
+        self.tenants.difference_update(tenants)
+        self.bus._index(self)
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            logger.debug(f"Dropping {event['type']} event for slow subscriber")
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Next event, or None once ``timeout`` seconds pass without one or once closed."""
+        if self.closed and self.queue.empty():
+            return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self.bus.unsubscribe(self)
+        if self.queue.empty():
+            # Wake a consumer waiting for the next event
+            try:
+                self.queue.put_nowait(None)
+            except RuntimeError:
+                # Its event loop is already closed
+                pass
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        event = await self.queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class EventBus(ABC):
+    """
+    Publishes analysis events and keeps the latest status snapshot per analysis.
+
+    Events are dicts with ``id``, ``analysis_id``, ``tenant``, ``type``,
+    ``data`` and ``ts``; the tenant is the client that submitted the
+    analysis, when the publisher knows it. Any process connected to the same backend can subscribe to the
+    events and read the snapshots, so reads do not depend on which worker
+    runs an analysis.
+    """
+
+    def __init__(self):
+        # Subscriptions indexed by analysis and tenant, so an event only
+        # touches its own subscribers no matter how many idle streams are open
+        self._by_analysis: Dict[str, Set[Subscription]] = {}
+        self._by_tenant: Dict[str, Set[Subscription]] = {}
+        self._firehose: Set[Subscription] = set()
+        # Every open subscription, indexed or not
+        self._open: Set[Subscription] = set()
+
+    @property
+    def _subscriptions(self) -> Set[Subscription]:
+        subscriptions = set(self._firehose)
+        for index in (self._by_analysis, self._by_tenant):
+            for group in index.values():
+                subscriptions.update(group)
+        return subscriptions
+
+    def subscribe(
+        self,
+        analysis_ids: Optional[Iterable[str]] = None,
+        max_queued: int = 1000,
+        tenants: Optional[Iterable[str]] = None,
+        event_types: Optional[Iterable[str]] = None
+    ) -> Subscription:
+        """
+        Start receiving events for ``analysis_ids`` and ``tenants``
+        (all events when both are None), only of ``event_types`` if given.
+        """
+        subscription = Subscription(self, analysis_ids, max_queued, tenants, event_types)
+        self._open.add(subscription)
+        self._index(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._open.discard(subscription)
+        self._unindex(subscription)
+
+    def close_subscriptions(self) -> None:
+        """Close every open subscription, ending their consumers' iteration."""
+        for subscription in list(self._open):
+            subscription.close()
+
+    def _index(self, subscription: Subscription) -> None:
+        if subscription.firehose:
+            self._firehose.add(subscription)
+            return
+        for analysis_id in subscription.analysis_ids:
+            self._by_analysis.setdefault(analysis_id, set()).add(subscription)
+        for tenant in subscription.tenants:
+            self._by_tenant.setdefault(tenant, set()).add(subscription)
+
+    def _unindex(self, subscription: Subscription) -> None:
+        self._firehose.discard(subscription)
+        for index, keys in (
+            (self._by_analysis, subscription.analysis_ids),
+            (self._by_tenant, subscription.tenants)
+        ):
+            for key in keys:
+                group = index.get(key)
+                if group is not None:
+                    group.discard(subscription)
+                    if not group:
+                        del index[key]
+
+    def _dispatch(self, event: Dict[str, Any]) -> None:
+        """Fan an event out to the matching local subscribers."""
+        targets = set(self._by_analysis.get(event["analysis_id"], ()))
+        if event.get("tenant") is not None:
+            targets.update(self._by_tenant.get(event["tenant"], ()))
+        targets.update(self._firehose)
+        for subscription in targets:
+            if subscription.wants(event["type"]):
+                subscription.deliver(event)
+
+    @abstractmethod
+    async def publish(
+        self,
+        analysis_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Publish an event to every subscriber of the analysis or tenant; returns the event."""
+
+    @abstractmethod
+    async def history(self, analysis_id: str, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Retained events of an analysis published after event ``after``, oldest first."""
+
+    @abstractmethod
+    async def put_status(self, analysis_id: str, snapshot: Dict[str, Any]) -> int:
+        """Replace the status snapshot of an analysis; returns its new version."""
+
+    @abstractmethod
+    async def get_status(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Latest status snapshot (with its ``version``), or None if never published."""
+
+    @abstractmethod
+    async def delete(self, analysis_id: str) -> None:
+        """Forget the snapshot of a deleted analysis."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Report subscriber counts."""
+        return {
+            "subscribers": len(self._subscriptions),
+            "dropped": sum(subscription.dropped for subscription in self._subscriptions),
+        }
+
+    async def start(self) -> None:
+        """Begin receiving events from other processes; call before subscribing."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
@@ -0,0 +1,58 @@
+"""Selection of the configured event bus backend."""
+import logging
+from typing import Optional
+
+from app.config import get_settings
+from app.db import get_database, is_connected
+from app.events.base import EventBus
+
+logger = logging.getLogger(__name__)
+
+_event_bus: Optional[EventBus] = None
+
+
+def get_event_bus() -> EventBus:
+    """
+    Get the process-wide event bus.
+
+    ``EVENT_BUS_BACKEND=auto`` uses MongoDB when it is connected, so that
+    every API and worker process sees the same events and status snapshots,
+    and an in-process bus otherwise.
+    """
+    global _event_bus
+
+    if _event_bus is None:
+        settings = get_settings()
+        backend = settings.EVENT_BUS_BACKEND
+        if backend == "auto":
+            backend = "mongodb" if is_connected() else "memory"
+
+        if backend == "mongodb":
+            if not is_connected():
+                raise RuntimeError("EVENT_BUS_BACKEND=mongodb but MongoDB is not connected")
+            from app.events.mongodb import MongoEventBus
+            _event_bus = MongoEventBus(
+                get_database(),
+                capped_bytes=settings.EVENT_BUS_CAPPED_MB * 1024 * 1024
+            )
+        elif backend == "memory":
+            from app.events.memory import InProcessEventBus
+            _event_bus = InProcessEventBus()
+        else:
+            raise ValueError(f"Unknown EVENT_BUS_BACKEND '{settings.EVENT_BUS_BACKEND}'")
+    return _event_bus
+
+
+async def start_event_bus() -> None:
+    """Start the event bus backend before the first subscriber."""
+    await get_event_bus().start()
+
+
+async def close_event_bus() -> None:
+    """Close the event bus backend."""
+    global _event_bus
+
+    bus, _event_bus = _event_bus, None
+    if bus is not None:
+        bus.close_subscriptions()
+        await bus.close()
@@ -0,0 +1,85 @@
+"""In-process event bus for single-worker deployments and tests."""
+import itertools
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.events.base import TRANSIENT_EVENTS, EventBus
+
+
+class InProcessEventBus(EventBus):
+    """
+    Delivers events to subscribers in this process and keeps snapshots in memory.
+
+    The last ``max_history`` persistent events of each analysis are retained
+    for resuming streams.
+    """
+
+    def __init__(self, max_snapshots: int = 10000, max_history: int = 500):
+        super().__init__()
+        self.max_snapshots = max_snapshots
+        self.max_history = max_history
+        self._ids = itertools.count(1)
+        self._snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self.published = 0
+
+    async def publish(
+        self,
+        analysis_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        event = {
+            "id": str(next(self._ids)),
+            "analysis_id": analysis_id,
+            "tenant": tenant,
+            "type": event_type,
+            "data": data,
+            "ts": time.time(),
+        }
+        self.published += 1
+        if event_type not in TRANSIENT_EVENTS:
+            history = self._history.pop(analysis_id, None) or deque(maxlen=self.max_history)
+            history.append(event)
+            self._history[analysis_id] = history
+            while len(self._history) > self.max_snapshots:
+                self._history.popitem(last=False)
+        self._dispatch(event)
+        return event
+
+    async def history(self, analysis_id: str, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        events = list(self._history.get(analysis_id, ()))
+        if after is None:
+            return events
+        try:
+            after_id = int(after)
+        except ValueError:
+            return events
+        return [event for event in events if int(event["id"]) > after_id]
+
+    async def put_status(self, analysis_id: str, snapshot: Dict[str, Any]) -> int:
+        previous = self._snapshots.pop(analysis_id, None)
+        version = (previous["version"] if previous else 0) + 1
+        self._snapshots[analysis_id] = {**snapshot, "version": version}
+        # Least recently updated snapshots go first
+        while len(self._snapshots) > self.max_snapshots:
+            self._snapshots.popitem(last=False)
+        return version
+
+    async def get_status(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        snapshot = self._snapshots.get(analysis_id)
+        return dict(snapshot) if snapshot else None
+
+    async def delete(self, analysis_id: str) -> None:
+        self._snapshots.pop(analysis_id, None)
+        self._history.pop(analysis_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "memory",
+            "published": self.published,
+            "snapshots": len(self._snapshots),
+            **super().stats(),
+        }
@@ -0,0 +1,186 @@
+"""MongoDB event bus shared by web and worker processes across hosts."""
+import asyncio
+import itertools
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi.encoders import jsonable_encoder
+from pymongo import ASCENDING, CursorType, ReturnDocument
+
+from app.events.base import TRANSIENT_EVENTS, EventBus
+
+logger = logging.getLogger(__name__)
+
+
+class MongoEventBus(EventBus):
+    """
+    Events go through a capped collection that every process tails.
+
+    Capped collections keep insertion order and support tailable cursors on
+    standalone servers, unlike change streams which need a replica set.
+    Status snapshots live in an ordinary collection keyed by analysis ID.
+    """
+
+    def __init__(
+        self,
+        database,
+        events_collection: str = "analysis_events",
+        status_collection: str = "analysis_status",
+        capped_bytes: int = 64 * 1024 * 1024,
+        poll_interval: float = 0.5
+    ):
+        super().__init__()
+        self._database = database
+        self._events_name = events_collection
+        self._events = database[events_collection]
+        self._status = database[status_collection]
+        self.capped_bytes = capped_bytes
+        self.poll_interval = poll_interval
+        self._ready = False
+        self._tail_task: Optional[asyncio.Task] = None
+        self._local_ids = itertools.count(1)
+        self.published = 0
+
+    async def _ensure_collections(self) -> None:
+        if self._ready:
+            return
+        if self._events_name not in await self._database.list_collection_names():
+            try:
+                await self._database.create_collection(
+                    self._events_name, capped=True, size=self.capped_bytes
+                )
+            except Exception as e:
+                # Another process created it first
+                logger.debug(f"Event collection not created: {e}")
+        await self._events.create_index([("analysis_id", ASCENDING), ("_id", ASCENDING)])
+        self._ready = True
+        logger.info("MongoDB event bus ready")
+
+    async def start(self) -> None:
+        """Start tailing from the newest event, before anyone subscribes."""
+        if self._tail_task is None or self._tail_task.done():
+            await self._ensure_collections()
+            latest = await self._events.find_one(sort=[("$natural", -1)])
+            self._start_tail(latest["_id"] if latest else None)
+
+    def subscribe(self, analysis_ids=None, max_queued: int = 1000, tenants=None, event_types=None):
+        if self._tail_task is None or self._tail_task.done():
+            # Not started: tail from the start of the current second, so an
+            # event inserted before the tail's first query is not skipped;
+            # a few earlier events may be replayed instead
+            self._start_tail(ObjectId.from_datetime(datetime.now(timezone.utc)))
+        return super().subscribe(analysis_ids, max_queued, tenants, event_types)
+
+    def _start_tail(self, last_id: Optional[ObjectId]) -> None:
+        self._tail_task = asyncio.create_task(self._tail(last_id))
+
+    async def _tail(self, last_id: Optional[ObjectId]) -> None:
+        """Deliver events inserted by any process after ``last_id`` to the local subscribers."""
+        await self._ensure_collections()
+        while True:
+            query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+            cursor = self._events.find(query, cursor_type=CursorType.TAILABLE_AWAIT)
+            try:
+                async for doc in cursor:
+                    last_id = doc["_id"]
+                    self._dispatch(self._to_event(doc))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event bus tail interrupted: {e}")
+            # The cursor dies while the collection is empty; try again shortly
+            await asyncio.sleep(self.poll_interval)
+
+    @staticmethod
+    def _to_event(doc: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "id": str(doc["_id"]),
+            "analysis_id": doc["analysis_id"],
+            "tenant": doc.get("tenant"),
+            "type": doc["type"],
+            "data": doc.get("data") or {},
+            "ts": doc.get("ts"),
+        }
+
+    async def publish(
+        self,
+        analysis_id: str,
+        event_type: str,
+        data: Dict[str, Any],
+        tenant: Optional[str] = None
+    ) -> Dict[str, Any]:
+        self.published += 1
+        if event_type in TRANSIENT_EVENTS:
+            event = {
+                "id": f"local-{next(self._local_ids)}",
+                "analysis_id": analysis_id,
+                "tenant": tenant,
+                "type": event_type,
+                "data": data,
+                "ts": time.time(),
+            }
+            self._dispatch(event)
+            return event
+
+        await self._ensure_collections()
+        doc = {
+            "analysis_id": analysis_id,
+            "tenant": tenant,
+            "type": event_type,
+            "data": jsonable_encoder(data),
+            "ts": time.time(),
+        }
+        result = await self._events.insert_one(doc)
+        # Local subscribers receive it through the tail like everyone else
+        return self._to_event({**doc, "_id": result.inserted_id})
+
+    async def history(self, analysis_id: str, after: Optional[str] = None) -> List[Dict[str, Any]]:
+        await self._ensure_collections()
+        query: Dict[str, Any] = {"analysis_id": analysis_id}
+        if after is not None:
+            try:
+                query["_id"] = {"$gt": ObjectId(after)}
+            except (InvalidId, TypeError):
+                pass
+        cursor = self._events.find(query).sort("_id", ASCENDING)
+        return [self._to_event(doc) async for doc in cursor]
+
+    async def put_status(self, analysis_id: str, snapshot: Dict[str, Any]) -> int:
+        doc = await self._status.find_one_and_update(
+            {"_id": analysis_id},
+            {
+                "$set": {"snapshot": jsonable_encoder(snapshot), "updated_at": time.time()},
+                "$inc": {"version": 1},
+            },
+            upsert=True,
+            projection={"version": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc["version"]
+
+    async def get_status(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        doc = await self._status.find_one({"_id": analysis_id})
+        if doc is None:
+            return None
+        return {**doc["snapshot"], "version": doc["version"]}
+
+    async def delete(self, analysis_id: str) -> None:
+        await self._status.delete_one({"_id": analysis_id})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": "mongodb",
+            "published": self.published,
+            "tailing": self._tail_task is not None and not self._tail_task.done(),
+            **super().stats(),
+        }
+
+    async def close(self) -> None:
+        if self._tail_task is not None:
+            self._tail_task.cancel()
+            await asyncio.gather(self._tail_task, return_exceptions=True)
+            self._tail_task = None
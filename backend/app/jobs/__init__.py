@@ -0,0 +1,16 @@
+# Durable job queue module
+from app.jobs.base import Job, JobQueue
+from app.jobs.queue import get_job_queue, close_job_queue
+from app.jobs.worker import WorkerPool, JobHandler
+from app.jobs.fair_queue import FairScheduler, get_fair_scheduler
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "get_job_queue",
+    "close_job_queue",
+    "WorkerPool",
+    "JobHandler",
+    "FairScheduler",
+    "get_fair_scheduler",
+]
@@ -0,0 +1,78 @@
+"""Job queue interface shared by the storage backends."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# Job lifecycle states
+QUEUED = "queued"
+RESERVED = "reserved"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """A unit of work handed to a worker."""
+    id: str
+    kind: str
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    max_attempts: int = 3
+    reserved_by: Optional[str] = None
+    error: Optional[str] = None
+
+
+class JobQueue(ABC):
+    """
+    Durable queue with visibility timeouts and at-least-once delivery.
+
+    A reserved job stays invisible to other workers until its lease expires;
+    a worker that dies without acknowledging it lets the job be delivered
+    again. Handlers must therefore be idempotent. Given a ``worker_id``,
+    ``extend``, ``ack`` and ``nack`` only apply while that worker still
+    holds the lease, so a worker whose lease expired cannot settle a job
+    another worker has since reserved.
+    """
+
+    @abstractmethod
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = 3,
+        priority: int = 0
+    ) -> str:
+        """Add a job; enqueueing an existing ``job_id`` again is a no-op."""
+
+    @abstractmethod
+    async def reserve(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        """Lease the oldest visible job of the highest priority, or None when the queue is empty."""
+
+    @abstractmethod
+    async def extend(self, job_id: str, visibility_timeout: float, worker_id: Optional[str] = None) -> None:
+        """Push back the lease of a job that is still being worked on."""
+
+    @abstractmethod
+    async def ack(self, job_id: str, worker_id: Optional[str] = None) -> bool:
+        """Mark a job done; returns False when the job (or lease) was not found."""
+
+    @abstractmethod
+    async def nack(
+        self,
+        job_id: str,
+        error: str,
+        retry_in: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Release a job; requeue it after ``retry_in`` seconds or fail it when
+        None. Returns False when the job (or lease) was not found.
+        """
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, Any]:
+        """Count jobs by state."""
+
+    async def close(self) -> None:
+        """Release backend resources."""
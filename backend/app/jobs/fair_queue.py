@@ -0,0 +1,217 @@
+"""Priority classes and per-client fair admission for analysis execution.
+
+Analyses wait here for one of ``max_running`` execution slots. Waiting
+analyses are ordered by weighted fair queuing: every client has a virtual
+clock that advances by ``1 / weight`` of the priority class for each
+analysis it submits, and the analysis with the earliest virtual finish time
+runs next. A client submitting a large burst therefore only delays its own
+later analyses, and interactive work overtakes bulk work without starving it.
+
+Slots belong to attempts, not analyses: a redelivered job whose earlier
+attempt still holds a slot takes a slot of its own, and each attempt
+releases only its own.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Share of execution slots per class, relative to each other
+PRIORITY_WEIGHTS = {
+    "interactive": 8,
+    "normal": 4,
+    "bulk": 1,
+}
+DEFAULT_PRIORITY = "normal"
+BATCH_PRIORITY = "bulk"
+
+# Ordering of the classes in the durable job queue (higher is reserved first)
+PRIORITY_RANKS = {"interactive": 2, "normal": 1, "bulk": 0}
+
+
+@dataclass(order=True)
+class Ticket:
+    """A waiting or admitted attempt to run an analysis; ``seq`` identifies it."""
+    finish: float
+    seq: int
+    analysis_id: str = field(compare=False)
+    client_id: str = field(compare=False)
+    priority: str = field(compare=False)
+    start: float = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    admitted_at: Optional[float] = field(default=None, compare=False)
+    future: Optional[asyncio.Future] = field(default=None, compare=False)
+
+    @property
+    def wait_ms(self) -> int:
+        end = self.admitted_at if self.admitted_at is not None else time.monotonic()
+        return int((end - self.enqueued_at) * 1000)
+
+
+class FairScheduler:
+    """Weighted fair queuing of analyses across clients and priority classes."""
+
+    def __init__(self, max_running: int = 4, weights: Optional[Dict[str, int]] = None):
+        self.max_running = max_running
+        self.weights = weights or PRIORITY_WEIGHTS
+        self._heap: List[Ticket] = []
+        # Tickets by seq, and the latest attempt of each analysis
+        self._waiting: Dict[int, Ticket] = {}
+        self._running: Dict[int, Ticket] = {}
+        self._latest: Dict[str, Ticket] = {}
+        self._finish: Dict[str, float] = {}
+        self._virtual_time = 0.0
+        self._seq = itertools.count()
+        self.admitted = 0
+        self.total_wait_ms = 0
+        self._recent_waits: Dict[str, List[int]] = {}
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        analysis_id: str,
+        client_id: str = "anonymous",
+        priority: str = DEFAULT_PRIORITY
+    ) -> AsyncIterator[Ticket]:
+        """Wait for an execution slot in fair order, holding it for the block."""
+        ticket = self._enqueue(analysis_id, client_id, priority)
+        try:
+            if ticket.future is not None:
+                await ticket.future
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        try:
+            yield ticket
+        finally:
+            self._release(ticket)
+
+    def _enqueue(self, analysis_id: str, client_id: str, priority: str) -> Ticket:
+        weight = self.weights.get(priority, self.weights[DEFAULT_PRIORITY])
+        start = max(self._virtual_time, self._finish.get(client_id, 0.0))
+        ticket = Ticket(
+            finish=start + 1.0 / weight,
+            seq=next(self._seq),
+            analysis_id=analysis_id,
+            client_id=client_id,
+            priority=priority,
+            start=start,
+            enqueued_at=time.monotonic()
+        )
+        self._finish[client_id] = ticket.finish
+        if analysis_id in self._latest:
+            logger.warning(f"Analysis {analysis_id} already holds a place; another attempt joins the queue")
+        self._latest[analysis_id] = ticket
+
+        if len(self._running) < self.max_running and not self._waiting:
+            self._admit(ticket)
+        else:
+            ticket.future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._heap, ticket)
+            self._waiting[ticket.seq] = ticket
+            logger.info(
+                f"Analysis {analysis_id} queued ({priority}, client {client_id}); "
+                f"{len(self._waiting)} waiting"
+            )
+        return ticket
+
+    def _admit(self, ticket: Ticket) -> None:
+        ticket.admitted_at = time.monotonic()
+        self._running[ticket.seq] = ticket
+        self._virtual_time = max(self._virtual_time, ticket.start)
+        self.admitted += 1
+        self.total_wait_ms += ticket.wait_ms
+        waits = self._recent_waits.setdefault(ticket.priority, [])
+        waits.append(ticket.wait_ms)
+        del waits[:-200]
+        if ticket.future is not None and not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _release(self, ticket: Ticket) -> None:
+        self._running.pop(ticket.seq, None)
+        self._forget(ticket)
+        self._dispatch()
+
+    def _abandon(self, ticket: Ticket) -> None:
+        """Drop a ticket whose waiter was cancelled."""
+        if self._waiting.pop(ticket.seq, None) is ticket:
+            # Lazily skipped when it reaches the top of the heap
+            ticket.future = None
+            self._forget(ticket)
+        elif ticket.seq in self._running:
+            self._release(ticket)
+
+    def _forget(self, ticket: Ticket) -> None:
+        if self._latest.get(ticket.analysis_id) is ticket:
+            del self._latest[ticket.analysis_id]
+
+    def _dispatch(self) -> None:
+        while self._heap and len(self._running) < self.max_running:
+            ticket = heapq.heappop(self._heap)
+            if self._waiting.pop(ticket.seq, None) is not ticket:
+                continue
+            self._admit(ticket)
+
+        # Forget the clocks of idle clients
+        if not self._heap and not self._running:
+            self._finish.clear()
+
+    def describe(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Queue position and wait time of the latest attempt of a waiting or running analysis."""
+        ticket = self._latest.get(analysis_id)
+        if ticket is None:
+            return None
+        if ticket.seq in self._waiting:
+            position = 1 + sum(1 for other in self._waiting.values() if other < ticket)
+            return {
+                "priority": ticket.priority,
+                "queue_position": position,
+                "queue_depth": len(self._waiting),
+                "queue_wait_ms": ticket.wait_ms,
+            }
+        if ticket.seq in self._running:
+            return {
+                "priority": ticket.priority,
+                "queue_position": 0,
+                "queue_depth": len(self._waiting),
+                "queue_wait_ms": ticket.wait_ms,
+            }
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Report queue depth and wait times per priority class."""
+        waiting_by_class: Dict[str, int] = {}
+        for ticket in self._waiting.values():
+            waiting_by_class[ticket.priority] = waiting_by_class.get(ticket.priority, 0) + 1
+        return {
+            "max_running": self.max_running,
+            "running": len(self._running),
+            "waiting": len(self._waiting),
+            "waiting_by_priority": waiting_by_class,
+            "admitted": self.admitted,
+            "average_wait_ms": self.total_wait_ms / self.admitted if self.admitted else None,
+            "p95_wait_ms": {
+                priority: sorted(waits)[max(0, int(len(waits) * 0.95) - 1)]
+                for priority, waits in self._recent_waits.items() if waits
+            },
+        }
+
+
+_fair_scheduler: Optional[FairScheduler] = None
+
+
+def get_fair_scheduler() -> FairScheduler:
+    """Get the process-wide analysis admission scheduler."""
+    global _fair_scheduler
+
+    if _fair_scheduler is None:
+        _fair_scheduler = FairScheduler(max_running=get_settings().ANALYSIS_MAX_RUNNING)
+    return _fair_scheduler
@@ -0,0 +1,144 @@
+"""MongoDB job queue shared by web and worker processes across hosts."""
+import logging
+import time
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app.jobs.base import DONE, FAILED, QUEUED, RESERVED, Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class MongoJobQueue(JobQueue):
+    """Job queue stored in a MongoDB collection; reservations are atomic find-and-modify."""
+
+    def __init__(self, database, collection: str = "job_queue"):
+        self._collection = database[collection]
+        self._indexed = False
+
+    async def _ensure_indexes(self) -> None:
+        if self._indexed:
+            return
+        await self._collection.create_index([("status", ASCENDING), ("available_at", ASCENDING)])
+        await self._collection.create_index([("status", ASCENDING), ("lease_expires_at", ASCENDING)])
+        # Matches the reserve filter and sort
+        await self._collection.create_index(
+            [("status", ASCENDING), ("priority", DESCENDING), ("created_at", ASCENDING)]
+        )
+        self._indexed = True
+        logger.info("MongoDB job queue ready")
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = 3,
+        priority: int = 0
+    ) -> str:
+        await self._ensure_indexes()
+        job_id = job_id or str(uuid4())
+        now = time.time()
+        try:
+            await self._collection.insert_one({
+                "_id": job_id,
+                "kind": kind,
+                "payload": payload,
+                "status": QUEUED,
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "priority": priority,
+                "available_at": now,
+                "lease_expires_at": None,
+                "reserved_by": None,
+                "error": None,
+                "created_at": now,
+                "updated_at": now,
+            })
+        except DuplicateKeyError:
+            pass
+        return job_id
+
+    async def reserve(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        await self._ensure_indexes()
+        now = time.time()
+        doc = await self._collection.find_one_and_update(
+            {"$or": [
+                {"status": QUEUED, "available_at": {"$lte": now}},
+                {"status": RESERVED, "lease_expires_at": {"$lte": now}},
+            ]},
+            {
+                "$set": {
+                    "status": RESERVED,
+                    "reserved_by": worker_id,
+                    "lease_expires_at": now + visibility_timeout,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("priority", DESCENDING), ("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is None:
+            return None
+        return Job(
+            id=doc["_id"],
+            kind=doc["kind"],
+            payload=doc.get("payload", {}),
+            attempts=doc["attempts"],
+            max_attempts=doc["max_attempts"],
+            reserved_by=worker_id,
+            error=doc.get("error")
+        )
+
+    @staticmethod
+    def _held(job_id: str, worker_id: Optional[str]) -> Dict[str, Any]:
+        """Filter for a job, restricted to the lease of ``worker_id`` when given."""
+        query: Dict[str, Any] = {"_id": job_id}
+        if worker_id is not None:
+            query.update(status=RESERVED, reserved_by=worker_id)
+        return query
+
+    async def extend(self, job_id: str, visibility_timeout: float, worker_id: Optional[str] = None) -> None:
+        now = time.time()
+        await self._collection.update_one(
+            {**self._held(job_id, worker_id), "status": RESERVED},
+            {"$set": {"lease_expires_at": now + visibility_timeout, "updated_at": now}}
+        )
+
+    async def ack(self, job_id: str, worker_id: Optional[str] = None) -> bool:
+        result = await self._collection.update_one(
+            self._held(job_id, worker_id),
+            {"$set": {"status": DONE, "lease_expires_at": None, "updated_at": time.time()}}
+        )
+        return result.matched_count > 0
+
+    async def nack(
+        self,
+        job_id: str,
+        error: str,
+        retry_in: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        now = time.time()
+        result = await self._collection.update_one(
+            self._held(job_id, worker_id),
+            {"$set": {
+                "status": FAILED if retry_in is None else QUEUED,
+                "available_at": now if retry_in is None else now + retry_in,
+                "lease_expires_at": None,
+                "reserved_by": None,
+                "error": error,
+                "updated_at": now,
+            }}
+        )
+        return result.matched_count > 0
+
+    async def stats(self) -> Dict[str, Any]:
+        counts = {QUEUED: 0, RESERVED: 0, DONE: 0, FAILED: 0}
+        async for row in self._collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return {"backend": "mongodb", **counts}
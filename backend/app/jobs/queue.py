@@ -0,0 +1,48 @@
+"""Selection of the configured job queue backend."""
+import logging
+from typing import Optional
+
+from app.config import get_settings
+from app.db import get_database, is_connected
+from app.jobs.base import JobQueue
+
+logger = logging.getLogger(__name__)
+
+_job_queue: Optional[JobQueue] = None
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the process-wide job queue.
+
+    ``JOB_QUEUE_BACKEND=auto`` uses MongoDB when it is connected and the
+    embedded SQLite file otherwise.
+    """
+    global _job_queue
+
+    if _job_queue is None:
+        settings = get_settings()
+        backend = settings.JOB_QUEUE_BACKEND
+        if backend == "auto":
+            backend = "mongodb" if is_connected() else "sqlite"
+
+        if backend == "mongodb":
+            if not is_connected():
+                raise RuntimeError("JOB_QUEUE_BACKEND=mongodb but MongoDB is not connected")
+            from app.jobs.mongodb import MongoJobQueue
+            _job_queue = MongoJobQueue(get_database())
+        elif backend == "sqlite":
+            from app.jobs.sqlite import SQLiteJobQueue
+            _job_queue = SQLiteJobQueue(settings.JOB_QUEUE_SQLITE_PATH)
+        else:
+            raise ValueError(f"Unknown JOB_QUEUE_BACKEND '{settings.JOB_QUEUE_BACKEND}'")
+    return _job_queue
+
+
+async def close_job_queue() -> None:
+    """Close the job queue backend."""
+    global _job_queue
+
+    queue, _job_queue = _job_queue, None
+    if queue is not None:
+        await queue.close()
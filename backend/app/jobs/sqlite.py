@@ -0,0 +1,165 @@
+"""Embedded SQLite job queue for single-host deployments."""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
+from app.jobs.base import DONE, FAILED, QUEUED, RESERVED, Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Job queue stored in a local SQLite file.
+
+    Reservations run in an IMMEDIATE transaction, so several worker
+    processes on the same host can share one file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, payload TEXT NOT NULL, "
+            "status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0, "
+            "max_attempts INTEGER NOT NULL, available_at REAL NOT NULL, "
+            "lease_expires_at REAL, reserved_by TEXT, error TEXT, "
+            "created_at REAL NOT NULL, updated_at REAL NOT NULL, "
+            "priority INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "priority" not in columns:
+            self._db.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_visible ON jobs (status, available_at)")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_priority ON jobs (status, priority DESC, created_at)"
+        )
+        logger.info(f"SQLite job queue at {path}")
+
+    async def _run(self, fn, *args):
+        def locked():
+            with self._lock:
+                return fn(*args)
+        return await asyncio.to_thread(locked)
+
+    async def enqueue(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = 3,
+        priority: int = 0
+    ) -> str:
+        job_id = job_id or str(uuid4())
+        now = time.time()
+        await self._run(
+            self._db.execute,
+            "INSERT OR IGNORE INTO jobs (id, kind, payload, status, max_attempts, "
+            "available_at, created_at, updated_at, priority) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(payload, default=str), QUEUED, max_attempts, now, now, now, priority)
+        )
+        return job_id
+
+    def _reserve(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        now = time.time()
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            row = self._db.execute(
+                "SELECT id FROM jobs WHERE (status = ? AND available_at <= ?) "
+                "OR (status = ? AND lease_expires_at <= ?) ORDER BY priority DESC, created_at LIMIT 1",
+                (QUEUED, now, RESERVED, now)
+            ).fetchone()
+            if row is None:
+                self._db.execute("COMMIT")
+                return None
+            row = self._db.execute(
+                "UPDATE jobs SET status = ?, reserved_by = ?, lease_expires_at = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ? "
+                "RETURNING id, kind, payload, attempts, max_attempts, error",
+                (RESERVED, worker_id, now + visibility_timeout, now, row[0])
+            ).fetchone()
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        return Job(
+            id=row[0],
+            kind=row[1],
+            payload=json.loads(row[2]),
+            attempts=row[3],
+            max_attempts=row[4],
+            reserved_by=worker_id,
+            error=row[5]
+        )
+
+    async def reserve(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        return await self._run(self._reserve, worker_id, visibility_timeout)
+
+    @staticmethod
+    def _held(job_id: str, worker_id: Optional[str]) -> Tuple[str, tuple]:
+        """WHERE clause for a job, restricted to the lease of ``worker_id`` when given."""
+        if worker_id is None:
+            return "id = ?", (job_id,)
+        return "id = ? AND status = ? AND reserved_by = ?", (job_id, RESERVED, worker_id)
+
+    async def extend(self, job_id: str, visibility_timeout: float, worker_id: Optional[str] = None) -> None:
+        now = time.time()
+        where, params = self._held(job_id, worker_id)
+        await self._run(
+            self._db.execute,
+            f"UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE {where} AND status = ?",
+            (now + visibility_timeout, now, *params, RESERVED)
+        )
+
+    async def ack(self, job_id: str, worker_id: Optional[str] = None) -> bool:
+        where, params = self._held(job_id, worker_id)
+        cursor = await self._run(
+            self._db.execute,
+            f"UPDATE jobs SET status = ?, lease_expires_at = NULL, updated_at = ? WHERE {where}",
+            (DONE, time.time(), *params)
+        )
+        return cursor.rowcount > 0
+
+    async def nack(
+        self,
+        job_id: str,
+        error: str,
+        retry_in: Optional[float] = None,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        now = time.time()
+        if retry_in is None:
+            status, available_at = FAILED, now
+        else:
+            status, available_at = QUEUED, now + retry_in
+        where, params = self._held(job_id, worker_id)
+        cursor = await self._run(
+            self._db.execute,
+            "UPDATE jobs SET status = ?, available_at = ?, lease_expires_at = NULL, "
+            f"reserved_by = NULL, error = ?, updated_at = ? WHERE {where}",
+            (status, available_at, error, now, *params)
+        )
+        return cursor.rowcount > 0
+
+    async def stats(self) -> Dict[str, Any]:
+        rows = await self._run(
+            lambda: self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        )
+        counts = {QUEUED: 0, RESERVED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return {"backend": "sqlite", **counts}
+
+    async def close(self) -> None:
+        await self._run(self._db.close)
@@ -0,0 +1,159 @@
+"""Worker pool that drains a job queue."""
+import asyncio
+import logging
+import os
+import socket
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.jobs.base import Job, JobQueue
+
+logger = logging.getLogger(__name__)
+
+# Runs one job's payload; raising makes the job eligible for another attempt
+JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Called once a job has used up its attempts
+DeadLetterHandler = Callable[[Job, str], Awaitable[None]]
+
+
+class WorkerPool:
+    """
+    Runs ``concurrency`` workers that reserve jobs and dispatch them by kind.
+
+    While a handler runs its lease is extended in the background, so the
+    visibility timeout only has to cover the heartbeat interval, not the
+    whole job. Failed jobs are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, JobHandler],
+        concurrency: int = 4,
+        visibility_timeout: float = 300.0,
+        poll_interval: float = 1.0,
+        max_retry_delay: float = 60.0,
+        on_dead_letter: Optional[DeadLetterHandler] = None
+    ):
+        self.queue = queue
+        self.handlers = handlers
+        self.concurrency = concurrency
+        self.visibility_timeout = visibility_timeout
+        self.poll_interval = poll_interval
+        self.max_retry_delay = max_retry_delay
+        self.on_dead_letter = on_dead_letter
+        self.name = f"{socket.gethostname()}:{os.getpid()}"
+        self._workers: List[asyncio.Task] = []
+        self._running: Dict[str, Job] = {}
+        self.processed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._work(f"{self.name}/{i}"))
+            for i in range(self.concurrency)
+        ]
+        logger.info(f"Worker pool started with {self.concurrency} workers")
+
+    async def stop(self) -> None:
+        """
+        Stop the workers, handing jobs they were running back to the queue.
+        """
+        workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        logger.info("Worker pool stopped")
+
+    async def run_once(self, worker_id: Optional[str] = None) -> bool:
+        """Reserve and run a single job; returns False when the queue was empty."""
+        job = await self.queue.reserve(worker_id or self.name, self.visibility_timeout)
+        if job is None:
+            return False
+        await self._process(job)
+        return True
+
+    async def _work(self, worker_id: str) -> None:
+        while True:
+            try:
+                found = await self.run_once(worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {worker_id} failed to reserve a job: {e}")
+                found = False
+            if not found:
+                await asyncio.sleep(self.poll_interval)
+
+    async def _process(self, job: Job) -> None:
+        if job.attempts > job.max_attempts:
+            await self._dead_letter(job, job.error or "Job exceeded its visibility timeout too often")
+            return
+
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await self._dead_letter(job, f"No handler for job kind '{job.kind}'")
+            return
+
+        self._running[job.id] = job
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await handler(job.payload)
+        except asyncio.CancelledError:
+            # Shutting down: make the job visible again right away
+            await asyncio.shield(self.queue.nack(job.id, "Worker stopped", retry_in=0, worker_id=job.reserved_by))
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Job {job.id} ({job.kind}) attempt {job.attempts} failed: {e}")
+            if job.attempts >= job.max_attempts:
+                await self._dead_letter(job, str(e))
+            else:
+                await self.queue.nack(
+                    job.id, str(e), retry_in=min(2 ** job.attempts, self.max_retry_delay), worker_id=job.reserved_by
+                )
+        else:
+            if await asyncio.shield(self.queue.ack(job.id, worker_id=job.reserved_by)):
+                self.processed += 1
+            else:
+                logger.warning(f"Job {job.id} finished after its lease passed to another worker")
+        finally:
+            heartbeat.cancel()
+            self._running.pop(job.id, None)
+
+    async def _heartbeat(self, job: Job) -> None:
+        interval = max(self.visibility_timeout / 3, 0.01)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.extend(job.id, self.visibility_timeout, worker_id=job.reserved_by)
+            except Exception as e:
+                logger.warning(f"Failed to extend lease of job {job.id}: {e}")
+
+    async def _dead_letter(self, job: Job, error: str) -> None:
+        logger.error(f"Job {job.id} ({job.kind}) failed permanently: {error}")
+        if not await self.queue.nack(job.id, error, worker_id=job.reserved_by):
+            # Another worker holds the job now; leave it to that one
+            logger.warning(f"Job {job.id} was not dead-lettered: its lease passed to another worker")
+            return
+        if self.on_dead_letter:
+            try:
+                await self.on_dead_letter(job, error)
+            except Exception as e:
+                logger.error(f"Dead-letter handler failed for job {job.id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Report worker counters."""
+        return {
+            "workers": len(self._workers),
+            "running": len(self._running),
+            "processed": self.processed,
+            "failed": self.failed,
+        }
@@ -0,0 +1,18 @@
+# LLM module
+from app.llm.clients import get_chat_model, get_http_client, close_llm_clients
+from app.llm.cache import ResponseCache, get_response_cache
+from app.llm.limiter import RateLimiter, get_rate_limiter
+from app.llm.hedging import Hedger, LLMTimeoutError, get_hedger
+
+__all__ = [
+    "get_chat_model",
+    "get_http_client",
+    "close_llm_clients",
+    "ResponseCache",
+    "get_response_cache",
+    "RateLimiter",
+    "get_rate_limiter",
+    "Hedger",
+    "LLMTimeoutError",
+    "get_hedger",
+]
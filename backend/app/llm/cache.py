@@ -0,0 +1,170 @@
+"""Exact-match cache for LLM completions.
+
+Entries live in a bounded in-memory LRU with TTL. An optional SQLite file
+acts as a persistent second tier so identical prompts survive restarts.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + optional SQLite) cache for LLM responses."""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600,
+        persist_path: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        if persist_path:
+            self._open_db(persist_path)
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        task: str,
+        memory_context: Optional[str],
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Hash everything that determines the completion."""
+        payload = json.dumps(
+            [model, system_prompt, task, memory_context, temperature, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _open_db(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._db.commit()
+        logger.info(f"LLM response cache persisting to {path}")
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached response, checking memory before disk."""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        if self._db is not None:
+            row = await asyncio.to_thread(self._db_get, key, now)
+            if row is not None:
+                expires_at, value = row
+                self._remember(key, value, expires_at)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a response in both tiers."""
+        expires_at = time.time() + self.ttl_seconds
+        self._remember(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._db_set, key, value, expires_at)
+
+    def _remember(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _db_get(self, key: str, now: float) -> Optional[Tuple[float, Dict[str, Any]]]:
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+        return row[1], json.loads(row[0])
+
+    def _db_set(self, key: str, value: Dict[str, Any], expires_at: float) -> None:
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        """Drop every entry and reset counters."""
+        self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM llm_cache")
+                self._db.commit()
+        self.hits = self.misses = self.disk_hits = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "persistent": self._db is not None,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Get the process-wide response cache, or None when caching is disabled."""
+    global _response_cache
+
+    settings = get_settings()
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+            persist_path=settings.LLM_CACHE_PATH
+        )
+    return _response_cache
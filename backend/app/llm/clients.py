@@ -0,0 +1,110 @@
+"""Process-wide registry of pooled LLM clients.
+
+Agents borrow a shared ``ChatOpenAI`` instance instead of constructing their
+own, so every analysis reuses the same keep-alive HTTP connection pool to
+OpenRouter rather than paying for fresh TLS handshakes per agent.
+"""
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "HTTP-Referer": "https://aegis-ai.vercel.app",
+    "X-Title": "AegisAI Decision System",
+}
+
+ClientKey = Tuple[str, str, Tuple[Tuple[str, str], ...]]
+
+# Global pooled clients
+_http_client: Optional[httpx.AsyncClient] = None
+_chat_models: Dict[ClientKey, ChatOpenAI] = {}
+_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared async HTTP client, creating the pool on first use."""
+    global _http_client
+
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            settings = get_settings()
+            _http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+                timeout=httpx.Timeout(settings.LLM_REQUEST_TIMEOUT_SECONDS, connect=10.0),
+            )
+            logger.info(
+                f"LLM connection pool created "
+                f"(max={settings.LLM_MAX_CONNECTIONS}, keepalive={settings.LLM_MAX_KEEPALIVE_CONNECTIONS})"
+            )
+        return _http_client
+
+
+def _make_key(
+    model: str,
+    base_url: str,
+    headers: Dict[str, str]
+) -> ClientKey:
+    return (model, base_url, tuple(sorted(headers.items())))
+
+
+def get_chat_model(
+    model: Optional[str] = None,
+    base_url: Optional[str] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> ChatOpenAI:
+    """
+    Borrow the shared chat model for (model, base_url, headers).
+
+    Per-agent settings such as temperature and max_tokens are not part of the
+    key; bind them per call with ``get_chat_model().bind(...)``.
+    """
+    settings = get_settings()
+    model = model or settings.OPENROUTER_MODEL
+    base_url = base_url or settings.OPENROUTER_BASE_URL
+    headers = headers if headers is not None else DEFAULT_HEADERS
+    key = _make_key(model, base_url, headers)
+
+    llm = _chat_models.get(key)
+    if llm is not None:
+        return llm
+
+    http_client = get_http_client()
+    with _lock:
+        llm = _chat_models.get(key)
+        if llm is None:
+            llm = ChatOpenAI(
+                api_key=settings.OPENROUTER_API_KEY,
+                model=model,
+                base_url=base_url,
+                default_headers=dict(headers),
+                http_async_client=http_client,
+                stream_usage=True,
+            )
+            _chat_models[key] = llm
+            logger.info(f"Registered shared LLM client for model {model}")
+        return llm
+
+
+async def close_llm_clients() -> None:
+    """Close the shared connection pool and drop all registered clients."""
+    global _http_client
+
+    with _lock:
+        client = _http_client
+        _http_client = None
+        _chat_models.clear()
+
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.info("LLM connection pool closed")
@@ -0,0 +1,313 @@
+"""Deadlines and hedged requests for LLM calls.
+
+Once a call runs past the tail of recent latencies (or its soft deadline) a
+duplicate request is sent; the first valid response wins and the other one is
+cancelled. A hard deadline bounds the call as a whole, so a single stalled
+provider response can no longer hold up an analysis indefinitely.
+"""
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LLMTimeoutError(TimeoutError):
+    """Raised when an LLM call exceeds its hard deadline."""
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per key."""
+
+    def __init__(self, window: int = 200):
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, key: str, seconds: float) -> None:
+        if key not in self._samples:
+            self._samples[key] = deque(maxlen=self.window)
+        self._samples[key].append(seconds)
+
+    def count(self, key: str) -> int:
+        return len(self._samples.get(key, ()))
+
+    def percentile(self, key: str, pct: float, min_samples: int = 1) -> Optional[float]:
+        """Nearest-rank percentile, or None with fewer than ``min_samples``."""
+        samples = self._samples.get(key)
+        if not samples or len(samples) < max(min_samples, 1):
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+
+@dataclass
+class HedgeStats:
+    """Hedging counters for one key."""
+    calls: int = 0
+    hedged: int = 0
+    hedge_wins: int = 0
+    timeouts: int = 0
+
+
+class Hedger:
+    """Applies deadlines and hedging to LLM calls, keyed by agent."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        window: int = 200
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.tracker = LatencyTracker(window)
+        self._stats: Dict[str, HedgeStats] = {}
+
+    def _stats_for(self, key: str) -> HedgeStats:
+        if key not in self._stats:
+            self._stats[key] = HedgeStats()
+        return self._stats[key]
+
+    def hedge_delay(self, key: str, soft_deadline: float) -> Optional[float]:
+        """
+        Seconds to wait before sending a hedge, or None when hedging is off.
+
+        Uses the latency percentile once enough samples exist, never later
+        than the soft deadline.
+        """
+        if not self.enabled:
+            return None
+        threshold = self.tracker.percentile(key, self.percentile, self.min_samples)
+        return soft_deadline if threshold is None else min(threshold, soft_deadline)
+
+    async def call(
+        self,
+        key: str,
+        factory: Callable[[], Awaitable[T]],
+        soft_deadline: float,
+        hard_deadline: float,
+        validate: Optional[Callable[[T], bool]] = None,
+        on_hedge: Optional[Callable[[], None]] = None
+    ) -> T:
+        """
+        Run ``factory()``, hedging it with a second attempt when it is slow.
+
+        The first result accepted by ``validate`` wins. If no attempt yields
+        a valid result, the last invalid result is returned, or the last error
+        raised. Raises LLMTimeoutError once ``hard_deadline`` passes.
+        """
+        stats = self._stats_for(key)
+        stats.calls += 1
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        deadline = start + hard_deadline
+        delay = self.hedge_delay(key, soft_deadline)
+
+        started: Dict[asyncio.Future, float] = {asyncio.ensure_future(factory()): start}
+        hedge: Optional[asyncio.Future] = None
+        fallback: Optional[tuple] = None
+        error: Optional[BaseException] = None
+
+        try:
+            while started:
+                timeout = deadline - loop.time()
+                if hedge is None and delay is not None:
+                    timeout = min(timeout, start + delay - loop.time())
+                done, _ = await asyncio.wait(
+                    started, timeout=max(timeout, 0), return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    if loop.time() >= deadline:
+                        stats.timeouts += 1
+                        self.tracker.record(key, loop.time() - start)
+                        raise LLMTimeoutError(f"LLM call exceeded hard deadline of {hard_deadline:g}s")
+                    hedge = asyncio.ensure_future(factory())
+                    started[hedge] = loop.time()
+                    stats.hedged += 1
+                    if on_hedge:
+                        on_hedge()
+                    logger.info(f"{key} passed {loop.time() - start:.1f}s, sending hedged request")
+                    continue
+
+                for task in done:
+                    task_start = started.pop(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    result = task.result()
+                    if validate is None or validate(result):
+                        self.tracker.record(key, loop.time() - task_start)
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                            logger.info(f"Hedged request won for {key}")
+                        return result
+                    fallback = (result,)
+        finally:
+            await _cancel(started)
+
+        if fallback is not None:
+            return fallback[0]
+        raise error
+
+    async def stream(
+        self,
+        key: str,
+        factory: Callable[[], AsyncIterator[T]],
+        soft_deadline: float,
+        on_hedge: Optional[Callable[[], None]] = None
+    ) -> AsyncIterator[T]:
+        """
+        Open a stream, hedging on the time to its first chunk.
+
+        Whichever attempt produces a chunk first is streamed to the end and
+        the other is cancelled, so no fragment is ever forwarded twice. The
+        caller applies the hard deadline to the whole stream.
+        """
+        stats = self._stats_for(key)
+        stats.calls += 1
+        # Time to first chunk is its own distribution, apart from whole calls
+        latency_key = _first_chunk_key(key)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        delay = self.hedge_delay(latency_key, soft_deadline)
+
+        def launch() -> asyncio.Future:
+            iterator = factory().__aiter__()
+            task = asyncio.ensure_future(iterator.__anext__())
+            attempts[task] = (iterator, loop.time())
+            return task
+
+        attempts: Dict[asyncio.Future, tuple] = {}
+        hedge: Optional[asyncio.Future] = None
+        winner = None
+        error: Optional[BaseException] = None
+        launch()
+
+        try:
+            while attempts and winner is None:
+                timeout = None
+                if hedge is None and delay is not None:
+                    timeout = max(start + delay - loop.time(), 0)
+                done, _ = await asyncio.wait(
+                    attempts, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    hedge = launch()
+                    stats.hedged += 1
+                    if on_hedge:
+                        on_hedge()
+                    logger.info(f"{key} has no first chunk after {loop.time() - start:.1f}s, sending hedged request")
+                    continue
+
+                for task in done:
+                    iterator, task_start = attempts.pop(task)
+                    exc = task.exception()
+                    if exc is not None and not isinstance(exc, StopAsyncIteration):
+                        error = exc
+                        continue
+                    self.tracker.record(latency_key, loop.time() - task_start)
+                    if task is hedge:
+                        stats.hedge_wins += 1
+                        logger.info(f"Hedged stream won for {key}")
+                    winner = (task, iterator)
+                    break
+        finally:
+            await _cancel(attempts)
+            for iterator, _ in attempts.values():
+                await _close(iterator)
+
+        if winner is None:
+            raise error
+
+        task, iterator = winner
+        if task.exception() is not None:
+            return
+        yield task.result()
+        async for chunk in iterator:
+            yield chunk
+
+    async def with_deadline(self, key: str, awaitable: Awaitable[T], hard_deadline: float) -> T:
+        """Await ``awaitable`` under a hard deadline."""
+        try:
+            return await asyncio.wait_for(awaitable, timeout=hard_deadline)
+        except asyncio.TimeoutError:
+            self._stats_for(key).timeouts += 1
+            raise LLMTimeoutError(f"LLM call exceeded hard deadline of {hard_deadline:g}s") from None
+
+    def stats(self) -> Dict[str, Any]:
+        """Report hedge rates, wins, call latency and time-to-first-chunk percentiles per key."""
+        keys = {}
+        for key, stats in self._stats.items():
+            keys[key] = {
+                "calls": stats.calls,
+                "hedged": stats.hedged,
+                "hedge_rate": stats.hedged / stats.calls if stats.calls else 0.0,
+                "hedge_wins": stats.hedge_wins,
+                "hedge_win_rate": stats.hedge_wins / stats.hedged if stats.hedged else None,
+                "timeouts": stats.timeouts,
+                "p50_ms": _ms(self.tracker.percentile(key, 50)),
+                "p99_ms": _ms(self.tracker.percentile(key, 99)),
+                "first_chunk_p50_ms": _ms(self.tracker.percentile(_first_chunk_key(key), 50)),
+                "first_chunk_p99_ms": _ms(self.tracker.percentile(_first_chunk_key(key), 99)),
+            }
+        return {
+            "enabled": self.enabled,
+            "percentile": self.percentile,
+            "agents": keys,
+        }
+
+
+def _first_chunk_key(key: str) -> str:
+    """Tracker key for the time to a stream's first chunk."""
+    return f"{key}:ttfb"
+
+
+def _ms(seconds: Optional[float]) -> Optional[int]:
+    return int(seconds * 1000) if seconds is not None else None
+
+
+async def _cancel(tasks) -> None:
+    """Cancel pending attempts and wait for them to unwind."""
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _close(iterator) -> None:
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception:
+        pass
+
+
+_hedger: Optional[Hedger] = None
+
+
+def get_hedger() -> Hedger:
+    """Get the process-wide LLM hedger."""
+    global _hedger
+
+    if _hedger is None:
+        settings = get_settings()
+        _hedger = Hedger(
+            enabled=settings.LLM_HEDGE_ENABLED,
+            percentile=settings.LLM_HEDGE_PERCENTILE,
+            min_samples=settings.LLM_HEDGE_MIN_SAMPLES
+        )
+    return _hedger
@@ -0,0 +1,184 @@
+"""Rate limiting and concurrency control for LLM calls.
+
+Each model gets a requests-per-minute and a tokens-per-minute token bucket,
+and a global semaphore caps calls in flight. Callers queue in arrival
+order, so a burst is smoothed out instead of turning into provider 429s.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Continuously refilling bucket; a capacity of 0 means unlimited."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.refill_per_second = per_minute / 60.0
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` can be consumed."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        if not self.unlimited:
+            self._refill()
+            self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Return (positive) or charge (negative) tokens after the fact."""
+        if not self.unlimited:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + delta)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the provider reports a rate limit."""
+        if not self.unlimited:
+            self._refill()
+            self.tokens = min(self.tokens, 0.0)
+
+
+class LimiterLease:
+    """Handle for one admitted call, used to reconcile actual token usage."""
+
+    def __init__(self, limiter: "RateLimiter", model: str, estimated_tokens: int):
+        self._limiter = limiter
+        self.model = model
+        self.estimated_tokens = estimated_tokens
+
+    def record_usage(self, tokens_used: int) -> None:
+        """Correct the token bucket by the difference from the estimate."""
+        if tokens_used > 0:
+            self._limiter._tokens_bucket(self.model).adjust(self.estimated_tokens - tokens_used)
+
+    def charge_extra_request(self) -> None:
+        """Charge a duplicate (hedged) request against the model's budgets."""
+        self._limiter._requests_bucket(self.model).consume(1)
+        self._limiter._tokens_bucket(self.model).consume(self.estimated_tokens)
+
+
+class RateLimiter:
+    """Per-model RPM/TPM limits plus a global cap on in-flight calls."""
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_concurrent: int = 8
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrent = max_concurrent
+        self._request_buckets: Dict[str, TokenBucket] = {}
+        self._token_buckets: Dict[str, TokenBucket] = {}
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._admission_lock = asyncio.Lock()
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted = 0
+        self.throttled = 0
+        self.total_wait_ms = 0
+
+    def _requests_bucket(self, model: str) -> TokenBucket:
+        if model not in self._request_buckets:
+            self._request_buckets[model] = TokenBucket(self.requests_per_minute)
+        return self._request_buckets[model]
+
+    def _tokens_bucket(self, model: str) -> TokenBucket:
+        if model not in self._token_buckets:
+            self._token_buckets[model] = TokenBucket(self.tokens_per_minute)
+        return self._token_buckets[model]
+
+    @asynccontextmanager
+    async def acquire(self, model: str, estimated_tokens: int) -> AsyncIterator[LimiterLease]:
+        """
+        Wait for rate budget and a concurrency slot, then hold the slot.
+
+        The admission lock is FIFO, so callers are admitted in arrival order.
+        """
+        start = time.monotonic()
+        self.queued += 1
+        try:
+            async with self._admission_lock:
+                requests = self._requests_bucket(model)
+                tokens = self._tokens_bucket(model)
+                while True:
+                    wait = max(requests.wait_time(1), tokens.wait_time(estimated_tokens))
+                    if wait <= 0:
+                        break
+                    self.throttled += 1
+                    logger.debug(f"Rate limit reached for {model}, waiting {wait:.2f}s")
+                    await asyncio.sleep(wait)
+                requests.consume(1)
+                tokens.consume(estimated_tokens)
+
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        self.admitted += 1
+        self.total_wait_ms += int((time.monotonic() - start) * 1000)
+        try:
+            yield LimiterLease(self, model, estimated_tokens)
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def backoff(self, model: str) -> None:
+        """Drain a model's request budget after the provider returned 429."""
+        self._requests_bucket(model).drain()
+        logger.warning(f"Provider rate limit hit for {model}, draining request budget")
+
+    def stats(self) -> Dict[str, Any]:
+        """Report queueing counters."""
+        return {
+            "requests_per_minute": self.requests_per_minute,
+            "tokens_per_minute": self.tokens_per_minute,
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "average_wait_ms": self.total_wait_ms / self.admitted if self.admitted else None,
+        }
+
+
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide LLM rate limiter."""
+    global _rate_limiter
+
+    if _rate_limiter is None:
+        settings = get_settings()
+        _rate_limiter = RateLimiter(
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            max_concurrent=settings.LLM_MAX_CONCURRENT_CALLS
+        )
+    return _rate_limiter
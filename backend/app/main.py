@@ -4,7 +4,7 @@ from contextlib import asynccontextmanager
 import logging
 
 from app.config import get_settings, CORS_ORIGINS
-from app.api.routes import analysis, feedback, history
+from app.api.routes import analysis, feedback, history, updates
 from app.memory.vector_store import init_vector_store
 
 # Configure logging
@@ -21,19 +21,44 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting AegisAI Backend...")
     
     # Initialize MongoDB (optional, falls back to in-memory if not configured)
-    from app.db import init_db
+    from app.db import init_db, is_connected
     await init_db()
+    if not is_connected():
+        # Spilled analyses from earlier runs count towards the stats
+        analysis.restore_memory_counters()
+    
+    # Tail other processes' events before any stream subscribes
+    from app.events import start_event_bus
+    await start_event_bus()
     
     # Initialize vector store
     init_vector_store()
     logger.info("✅ Vector store initialized")
     
+    # Run queued analyses in this process unless dedicated workers do
+    from app.worker import start_worker_pool, stop_worker_pool
+    if settings.RUN_EMBEDDED_WORKERS:
+        start_worker_pool()
+    
     yield
     
     # Shutdown
     logger.info("👋 Shutting down AegisAI Backend...")
+    await stop_worker_pool()
+    
+    from app.jobs import close_job_queue
+    await close_job_queue()
+    
+    await analysis.status_cache.close()
+    
+    from app.events import close_event_bus
+    await close_event_bus()
+    
     from app.db import close_db
     await close_db()
+    
+    from app.llm import close_llm_clients
+    await close_llm_clients()
 
 
 app = FastAPI(
@@ -56,6 +81,7 @@ app.add_middleware(
 app.include_router(analysis.router, prefix="/api/v1/analysis", tags=["Analysis"])
 app.include_router(feedback.router, prefix="/api/v1/feedback", tags=["Feedback"])
 app.include_router(history.router, prefix="/api/v1/history", tags=["History"])
+app.include_router(updates.router, prefix="/api/v1/updates", tags=["Updates"])
 
 
 @app.get("/")
@@ -71,3 +97,29 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    from app.llm import get_response_cache, get_rate_limiter, get_hedger
+    from app.jobs import get_job_queue, get_fair_scheduler
+    from app.events import get_event_bus
+    from app.worker import get_worker_pool
+    
+    cache = get_response_cache()
+    pool = get_worker_pool()
+    return {
+        "llm_cache": cache.stats() if cache else {"enabled": False},
+        "llm_rate_limiter": get_rate_limiter().stats(),
+        "llm_hedging": get_hedger().stats(),
+        "job_queue": await get_job_queue().stats(),
+        "workers": pool.stats() if pool else {"workers": 0},
+        "scheduler": get_fair_scheduler().stats(),
+        "event_bus": get_event_bus().stats(),
+        "status_cache": analysis.status_cache.stats(),
+        "analysis_registry": {
+            "results": analysis.active_analyses.stats(),
+            "orchestrators": analysis.analysis_orchestrators.stats(),
+            "batches": analysis.active_batches.stats()
+        }
+    }
@@ -4,6 +4,7 @@ from app.memory.vector_store import (
     get_collection,
     add_memory,
     search_similar_memories,
+    search_similar_memories_batch,
     update_memory_from_feedback,
 )
 
@@ -12,5 +13,6 @@ __all__ = [
     "get_collection", 
     "add_memory",
     "search_similar_memories",
+    "search_similar_memories_batch",
     "update_memory_from_feedback",
 ]
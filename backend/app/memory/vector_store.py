@@ -90,6 +90,43 @@ def search_similar_memories(
     return memories
 
 
+def search_similar_memories_batch(
+    queries: List[str],
+    n_results: int = 5,
+    category_filter: Optional[str] = None
+) -> List[List[Dict[str, Any]]]:
+    """Search memories for several queries with a single embedding pass."""
+    if not queries:
+        return []
+    
+    collection = get_collection()
+    
+    where_filter = None
+    if category_filter:
+        where_filter = {"category": category_filter}
+    
+    results = collection.query(
+        query_texts=queries,
+        n_results=n_results,
+        where=where_filter
+    )
+    
+    all_memories = []
+    for q in range(len(queries)):
+        memories = []
+        if results and results['documents']:
+            for i, doc in enumerate(results['documents'][q]):
+                memories.append({
+                    "id": results['ids'][q][i] if results['ids'] else None,
+                    "text": doc,
+                    "metadata": results['metadatas'][q][i] if results['metadatas'] else {},
+                    "distance": results['distances'][q][i] if results.get('distances') else None
+                })
+        all_memories.append(memories)
+    
+    return all_memories
+
+
 def update_memory_from_feedback(
     analysis_id: str,
     feedback_data: Dict[str, Any]
@@ -1,6 +1,7 @@
 from app.schemas.analysis import (
     AnalysisStatus,
     AnalysisRequest,
+    BatchAnalysisRequest,
     AnalysisResponse,
     AnalysisStatusResponse,
     AgentStep,
@@ -14,6 +15,7 @@ from app.schemas.agent import AgentConfig, AgentInput, AgentOutput, Orchestrator
 __all__ = [
     "AnalysisStatus",
     "AnalysisRequest",
+    "BatchAnalysisRequest",
     "AnalysisResponse",
     "AnalysisStatusResponse",
     "AgentStep",
@@ -10,6 +10,9 @@ class AgentConfig(BaseModel):
     allowed_tools: List[str] = []
     temperature: float = Field(default=0.7, ge=0, le=2)
     max_tokens: int = Field(default=2000, ge=100, le=8000)
+    # Per-agent LLM deadlines in seconds (None = global default)
+    soft_deadline_seconds: Optional[float] = Field(default=None, gt=0)
+    hard_deadline_seconds: Optional[float] = Field(default=None, gt=0)
 
 
 class AgentInput(BaseModel):
@@ -17,7 +20,11 @@ class AgentInput(BaseModel):
     task: str
     context: Dict[str, Any] = {}
     previous_outputs: Dict[str, Any] = {}
+    prompt_context: Dict[str, str] = {}
     memory_context: Optional[str] = None
+    use_cache: bool = True
+    # Completion cap below the agent's configured max_tokens (latency budgets)
+    max_tokens: Optional[int] = Field(default=None, ge=1)
 
 
 class AgentOutput(BaseModel):
@@ -29,6 +36,9 @@ class AgentOutput(BaseModel):
     tools_used: List[str] = []
     tokens_used: int = 0
     duration_ms: int = 0
+    cached: bool = False
+    # The LLM call itself failed (as opposed to returning unparseable text)
+    failed: bool = False
 
 
 class OrchestratorState(BaseModel):
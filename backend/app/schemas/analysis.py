@@ -13,6 +13,7 @@ class AnalysisStatus(str, Enum):
     DECIDING = "deciding"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 
 class AnalysisRequest(BaseModel):
@@ -22,6 +23,12 @@ class AnalysisRequest(BaseModel):
     preferences: Optional[Dict[str, Any]] = None
 
 
+class BatchAnalysisRequest(BaseModel):
+    """Request to start many analyses as one batch."""
+    items: List[AnalysisRequest] = Field(..., min_length=1, max_length=500)
+    max_concurrency: Optional[int] = Field(None, ge=1, le=50)
+
+
 class AgentStep(BaseModel):
     """A single step in the agent reasoning process."""
     agent_name: str
@@ -98,3 +105,8 @@ class AnalysisStatusResponse(BaseModel):
     current_step: Optional[str] = None
     progress_percentage: int = Field(ge=0, le=100)
     latest_update: str
+    # Execution queue, while the analysis waits for or holds a slot
+    priority: Optional[str] = None
+    queue_position: Optional[int] = None  # 0 once running
+    queue_depth: Optional[int] = None
+    queue_wait_ms: Optional[int] = None
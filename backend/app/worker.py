@@ -0,0 +1,93 @@
+"""
+Analysis worker process.
+
+Run with ``python -m app.worker`` to execute queued analyses outside the
+web process. Standalone workers need MongoDB so that web and worker
+processes share analysis state; set ``RUN_EMBEDDED_WORKERS=false`` on the
+web processes when using them.
+"""
+import asyncio
+import logging
+import signal
+from typing import Dict, Optional
+
+from app.config import get_settings
+from app.jobs import JobHandler, WorkerPool, get_job_queue
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[WorkerPool] = None
+
+
+def get_job_handlers() -> Dict[str, JobHandler]:
+    """Map job kinds to their handlers."""
+    from app.api.routes import analysis
+
+    return {
+        analysis.ANALYSIS_JOB: analysis.process_analysis_job,
+        analysis.BATCH_JOB: analysis.process_batch_job,
+    }
+
+
+def get_worker_pool() -> Optional[WorkerPool]:
+    """The worker pool started in this process, if any."""
+    return _pool
+
+
+def start_worker_pool() -> WorkerPool:
+    """Start a worker pool on the configured job queue."""
+    global _pool
+    from app.api.routes.analysis import fail_analysis_job
+
+    settings = get_settings()
+    _pool = WorkerPool(
+        get_job_queue(),
+        get_job_handlers(),
+        concurrency=settings.JOB_WORKER_CONCURRENCY,
+        visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        on_dead_letter=fail_analysis_job
+    )
+    _pool.start()
+    return _pool
+
+
+async def stop_worker_pool() -> None:
+    """Stop the worker pool, returning in-flight jobs to the queue."""
+    global _pool
+
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.stop()
+
+
+async def main() -> None:
+    from app.db import init_db, close_db
+    from app.events import close_event_bus, start_event_bus
+    from app.jobs import close_job_queue
+    from app.llm import close_llm_clients
+    from app.memory.vector_store import init_vector_store
+
+    await init_db()
+    await start_event_bus()
+    init_vector_store()
+    start_worker_pool()
+    logger.info("👷 Analysis worker running")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    logger.info("👋 Shutting down analysis worker...")
+    await stop_worker_pool()
+    await close_job_queue()
+    await close_event_bus()
+    await close_db()
+    await close_llm_clients()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
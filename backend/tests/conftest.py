@@ -1,7 +1,11 @@
 """
 Pytest configuration and shared fixtures for AegisAI tests.
 """
+import asyncio
+import json
 import pytest
+from unittest.mock import patch
+from uuid import UUID
 from fastapi.testclient import TestClient
 from app.main import app
 
@@ -81,3 +85,115 @@ def mock_analysis_response():
             ]
         }
     }
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Give every test a fresh LLM rate limiter, hedger and analysis scheduler."""
+    from app.jobs import fair_queue
+    from app.llm import hedging, limiter
+    limiter._rate_limiter = None
+    hedging._hedger = None
+    fair_queue._fair_scheduler = None
+    yield
+    limiter._rate_limiter = None
+    hedging._hedger = None
+    fair_queue._fair_scheduler = None
+
+
+@pytest.fixture(autouse=True)
+def job_queue(tmp_path):
+    """Back the job queue with a throwaway SQLite file."""
+    from app.jobs import queue
+    from app.jobs.sqlite import SQLiteJobQueue
+    queue._job_queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite"))
+    yield queue._job_queue
+    queue._job_queue._db.close()
+    queue._job_queue = None
+
+
+async def _cancel_tasks(tasks):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+@pytest.fixture(autouse=True)
+def event_bus(event_loop):
+    """
+    Use the in-process event bus in place of the MongoDB one.
+    Subscriptions left open are closed, and tasks left behind on the test's
+    event loop are cancelled, before the loop closes.
+    """
+    from app.events import bus
+    from app.events.memory import InProcessEventBus
+    bus._event_bus = InProcessEventBus()
+    yield bus._event_bus
+    bus._event_bus.close_subscriptions()
+    bus._event_bus = None
+    pending = asyncio.all_tasks(event_loop) if not event_loop.is_closed() else set()
+    if pending and not event_loop.is_running():
+        event_loop.run_until_complete(_cancel_tasks(pending))
+
+
+@pytest.fixture(autouse=True)
+def status_cache(event_bus, event_loop, monkeypatch):
+    """Give each test an empty status cache listening on its event bus."""
+    from app.api.routes import analysis
+    from app.api.status_cache import StatusCache
+    cache = StatusCache(analysis._build_status)
+    monkeypatch.setattr(analysis, "status_cache", cache)
+    yield cache
+    if cache._listener is not None and cache._listener.get_loop() is event_loop:
+        event_loop.run_until_complete(cache.close())
+
+
+@pytest.fixture
+def mongo_database():
+    """Empty in-memory stand-in for a Motor database."""
+    from mongomock_motor import AsyncMongoMockClient
+    return AsyncMongoMockClient()["aegis_test"]
+
+
+class HangingLLM:
+    """LLM whose stream never yields; ``started`` is set once it is called."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+
+    async def astream(self, messages, **kwargs):
+        self.started.set()
+        await asyncio.sleep(60)
+        yield
+
+
+@pytest.fixture
+def fake_orchestrator():
+    """
+    Register orchestrators whose agents answer with canned JSON, or all use
+    ``llm`` when given. Memory search and storage are stubbed out meanwhile.
+    """
+    from app.agents import AgentOrchestrator
+    from app.api.routes import analysis
+    from tests.test_base_agent import FakeLLM
+    from tests.test_orchestrator import AGENT_RESPONSES
+
+    def attach(analysis_id, llm=None):
+        orchestrator = AgentOrchestrator(UUID(analysis_id))
+        for agent in orchestrator.agents.values():
+            agent.llm = llm or FakeLLM(json.dumps(AGENT_RESPONSES[agent.name]))
+        analysis.analysis_orchestrators[analysis_id] = orchestrator
+        return orchestrator
+
+    with patch('app.agents.orchestrator.search_similar_memories', return_value=[]), \
+         patch('app.agents.orchestrator.add_memory'):
+        yield attach
+
+
+@pytest.fixture(autouse=True)
+def analysis_counters():
+    """Start each test with empty in-memory analysis counters."""
+    from app.db import stats
+    stats.memory_counters.clear()
+    yield stats.memory_counters
+    stats.memory_counters.clear()
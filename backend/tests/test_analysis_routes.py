@@ -132,3 +132,769 @@ class TestAnalysisValidation:
             response = client.post("/api/v1/analysis", json=request_without_context)
             
             assert response.status_code == 200
+
+
+@pytest.mark.unit
+class TestBatchAnalysis:
+    """Test the batch analysis endpoints."""
+    
+    def test_create_batch_success(self, client, sample_analysis_request):
+        """Test creating a batch returns one ID per item."""
+        with patch('app.api.routes.analysis.run_batch') as mock_run:
+            mock_run.return_value = None
+            
+            response = client.post("/api/v1/analysis/batch", json={
+                "items": [sample_analysis_request] * 3,
+                "max_concurrency": 2
+            })
+            
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 3
+            assert len(data["analysis_ids"]) == 3
+            assert data["max_concurrency"] == 2
+    
+    def test_get_batch_status(self, client, sample_analysis_request):
+        """Test batch progress lists every item."""
+        with patch('app.api.routes.analysis.run_batch'):
+            batch = client.post("/api/v1/analysis/batch", json={
+                "items": [sample_analysis_request] * 2
+            }).json()
+        
+        response = client.get(f"/api/v1/analysis/batch/{batch['id']}")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 2
+        assert data["counts"] == {"pending": 2}
+        assert [item["id"] for item in data["items"]] == batch["analysis_ids"]
+    
+    def test_batch_completes_from_item_statuses(self, client, sample_analysis_request):
+        """Test that a batch run by another worker completes with its items."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        batch = client.post("/api/v1/analysis/batch", json={
+            "items": [sample_analysis_request] * 2
+        }).json()
+        for analysis_id in batch["analysis_ids"]:
+            analysis.active_analyses[analysis_id]["status"] = AnalysisStatus.COMPLETED
+            analysis.active_analyses[analysis_id]["completed_at"] = "2024-01-11T10:05:00"
+        
+        data = client.get(f"/api/v1/analysis/batch/{batch['id']}").json()
+        
+        assert data["status"] == "completed"
+        assert data["finished"] == 2
+        assert data["completed_at"]
+    
+    def test_get_batch_not_found(self, client):
+        """Test getting an unknown batch."""
+        response = client.get("/api/v1/analysis/batch/nonexistent-id")
+        
+        assert response.status_code == 404
+    
+    def test_create_batch_empty_items(self, client):
+        """Test that a batch needs at least one item."""
+        response = client.post("/api/v1/analysis/batch", json={"items": []})
+        
+        assert response.status_code == 422
+    
+    async def test_run_batch_bounds_concurrency(self, sample_analysis_request):
+        """Test that no more than max_concurrency analyses run at once."""
+        import asyncio
+        from app.api.routes import analysis
+        from app.schemas import AnalysisRequest
+        
+        in_flight = 0
+        peak = 0
+        
+        async def fake_run_analysis(analysis_id, problem, preferences, memories=None, raise_errors=False):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+        
+        items = [(str(uuid4()), AnalysisRequest(**sample_analysis_request)) for _ in range(6)]
+        
+        with patch('app.api.routes.analysis.run_analysis', side_effect=fake_run_analysis), \
+             patch('app.api.routes.analysis.search_similar_memories_batch', return_value=[[]]) as mock_search:
+            await analysis.run_batch("batch-1", items, max_concurrency=2)
+        
+        assert peak == 2
+        # Identical statements are embedded once for the whole batch
+        mock_search.assert_called_once_with([sample_analysis_request["problem_statement"]], n_results=3)
+
+
+@pytest.mark.unit
+class TestAnalysisJobs:
+    """Test that analyses run through the job queue."""
+    
+    def test_create_analysis_enqueues_job(self, client, sample_analysis_request, job_queue):
+        """Test that creating an analysis queues a job keyed by its ID."""
+        import asyncio
+        
+        response = client.post("/api/v1/analysis", json=sample_analysis_request)
+        
+        job = asyncio.run(job_queue.reserve("test-worker", 60))
+        assert job.id == response.json()["id"]
+        assert job.kind == "analysis"
+        assert job.payload["request"]["problem_statement"] == sample_analysis_request["problem_statement"]
+
+    async def test_orchestrator_only_where_job_runs(self, sample_analysis_request):
+        """Test that the web process leaves the orchestrator to the worker."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisRequest
+        
+        analysis_id = str(uuid4())
+        request = AnalysisRequest(**sample_analysis_request)
+        await analysis._create_analysis_record(analysis_id, request, analysis.datetime.now())
+        assert analysis_id not in analysis.analysis_orchestrators
+        
+        assert await analysis._prepare_job(analysis_id, request)
+        assert analysis_id in analysis.analysis_orchestrators
+
+    def test_priority_and_client_from_headers(self, client, sample_analysis_request, job_queue):
+        """Test that scheduling headers are carried into the job payload."""
+        import asyncio
+
+        response = client.post(
+            "/api/v1/analysis",
+            json=sample_analysis_request,
+            headers={"X-Priority": "interactive", "X-Client-ID": "tenant-a"}
+        )
+
+        assert response.json()["priority"] == "interactive"
+        job = asyncio.run(job_queue.reserve("test-worker", 60))
+        assert job.payload["request"]["preferences"] == {"priority": "interactive", "client_id": "tenant-a"}
+
+    def test_unknown_priority_rejected(self, client, sample_analysis_request):
+        """Test that an unknown priority class is a validation error."""
+        response = client.post(
+            "/api/v1/analysis",
+            json={**sample_analysis_request, "preferences": {"priority": "urgent"}}
+        )
+
+        assert response.status_code == 422
+
+    async def test_redelivered_finished_analysis_is_skipped(self, sample_analysis_request):
+        """Test that a completed analysis is not run again on redelivery."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.COMPLETED}
+        
+        with patch('app.api.routes.analysis.run_analysis') as mock_run:
+            await analysis.process_analysis_job({
+                "analysis_id": analysis_id,
+                "request": sample_analysis_request
+            })
+        
+        mock_run.assert_not_called()
+    
+    async def test_failed_batch_item_is_retried(self, sample_analysis_request):
+        """Test that a failing batch item fails the job, and the retry runs only that item."""
+        from app.api.routes import analysis
+        from app.jobs.base import Job
+        from app.schemas import AnalysisStatus
+        
+        good, bad = str(uuid4()), str(uuid4())
+        payload = {
+            "batch_id": "batch-1",
+            "items": [{"analysis_id": i, "request": sample_analysis_request} for i in (good, bad)],
+            "max_concurrency": 2
+        }
+        runs = []
+        
+        async def fake_run_analysis(analysis_id, problem, preferences, memories=None, raise_errors=False):
+            runs.append((analysis_id, raise_errors))
+            if analysis_id == bad:
+                raise RuntimeError("provider down")
+            analysis.active_analyses[analysis_id]["status"] = AnalysisStatus.COMPLETED
+        
+        with patch('app.api.routes.analysis.run_analysis', side_effect=fake_run_analysis), \
+             patch('app.api.routes.analysis.search_similar_memories_batch', return_value=[[]]):
+            with pytest.raises(RuntimeError, match="provider down"):
+                await analysis.process_batch_job(payload)
+            with pytest.raises(RuntimeError):
+                await analysis.process_batch_job(payload)
+        await analysis.fail_analysis_job(Job(id="batch-1", kind="batch", payload=payload), "provider down")
+        
+        assert sorted(runs[:2]) == sorted([(good, True), (bad, True)])
+        assert runs[2:] == [(bad, True)]
+        assert analysis.active_analyses[good]["status"] == AnalysisStatus.COMPLETED
+        assert analysis.active_analyses[bad]["status"] == AnalysisStatus.FAILED
+    
+    async def test_lost_analysis_is_recreated(self, sample_analysis_request):
+        """Test that a job outliving its process state re-creates the record."""
+        from app.api.routes import analysis
+        
+        analysis_id = str(uuid4())
+        
+        with patch('app.api.routes.analysis.run_analysis') as mock_run:
+            await analysis.process_analysis_job({
+                "analysis_id": analysis_id,
+                "request": sample_analysis_request
+            })
+        
+        assert analysis_id in analysis.active_analyses
+        assert analysis_id in analysis.analysis_orchestrators
+        mock_run.assert_called_once()
+    
+    async def test_reuse_reads_outputs_from_record(self, fake_orchestrator):
+        """Test that a completed record keeps its phase outputs for near-duplicates to reuse."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        first, second = str(uuid4()), str(uuid4())
+        for analysis_id in (first, second):
+            analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        fake_orchestrator(first)
+        with patch('app.agents.orchestrator.add_memory') as mock_add:
+            await analysis.run_analysis(first, "Should we open a second roastery?", {"bypass_cache": True})
+        memory = {"id": "m", "text": "roastery", "distance": 0.01, "metadata": mock_add.call_args.kwargs["metadata"]}
+        
+        orchestrator = fake_orchestrator(second)
+        with patch('app.agents.orchestrator.search_similar_memories', return_value=[memory]):
+            await analysis.run_analysis(
+                second, "Should we open a second roastery?", {"bypass_cache": True, "allow_reuse": True}
+            )
+        
+        assert set(analysis.active_analyses[first]["checkpoints"]) == set(orchestrator.agent_outputs)
+        assert sum(agent.llm.calls for agent in orchestrator.agents.values()) == 0
+        assert analysis.active_analyses[second]["result"]["reused_from"]["analysis_id"] == first
+        assert analysis.active_analyses[second]["status"] == AnalysisStatus.COMPLETED
+    
+    def test_reasoning_survives_orchestrator_eviction(self, client):
+        """Test that reasoning is served from the stored result once the orchestrator is gone."""
+        from datetime import datetime
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {
+            "id": analysis_id,
+            "status": AnalysisStatus.COMPLETED,
+            "result": {"reasoning_steps": [{
+                "agent_name": "Research Agent",
+                "step_number": 1,
+                "action": "Market research",
+                "input_summary": "Problem",
+                "output_summary": "Summary",
+                "reasoning": "Because",
+                "confidence": 0.8,
+                "duration_ms": 10,
+                "timestamp": datetime.now().isoformat()
+            }]}
+        }
+        
+        response = client.get(f"/api/v1/analysis/{analysis_id}/reasoning")
+        
+        assert response.status_code == 200
+        assert response.json()["total_steps"] == 1
+        assert response.json()["steps"][0]["agent"] == "Research Agent"
+    
+    def test_resume_failed_analysis(self, client, sample_analysis_request, job_queue):
+        """Test that resuming a failed analysis queues a new job."""
+        import asyncio
+        from datetime import datetime
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {
+            "id": analysis_id,
+            "status": AnalysisStatus.FAILED,
+            "problem_statement": sample_analysis_request["problem_statement"],
+            "context": None,
+            "preferences": {"bypass_cache": True},
+            "created_at": datetime.now().isoformat(),
+            "checkpoints": {"Research Agent": {}},
+            "error": "Decision Agent failed: timeout"
+        }
+        
+        response = client.post(f"/api/v1/analysis/{analysis_id}/resume")
+        
+        assert response.status_code == 200
+        assert response.json()["checkpointed_phases"] == ["Research Agent"]
+        assert analysis.active_analyses[analysis_id]["status"] == AnalysisStatus.PENDING
+        job = asyncio.run(job_queue.reserve("test-worker", 60))
+        assert job.payload["analysis_id"] == analysis_id
+        assert job.payload["request"]["preferences"] == {"bypass_cache": True}
+    
+    def test_resume_requires_failed_status(self, client):
+        """Test that only failed analyses can be resumed."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.COMPLETED}
+        
+        response = client.post(f"/api/v1/analysis/{analysis_id}/resume")
+        
+        assert response.status_code == 409
+
+
+@pytest.mark.unit
+class TestCancellation:
+    """Test cancelling queued and running analyses."""
+    
+    def add_analysis(self, status):
+        from datetime import datetime
+        from app.api.routes import analysis
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {
+            "id": analysis_id,
+            "status": status,
+            "problem_statement": "Should we open a second coffee roastery downtown?",
+            "created_at": datetime.now().isoformat(),
+            "result": None,
+            "error": None
+        }
+        return analysis_id
+    
+    async def test_cancel_running_analysis_releases_slots(self, fake_orchestrator):
+        """Test that cancellation aborts the in-flight LLM call and frees its slot."""
+        import asyncio
+        from app.api.routes import analysis
+        from app.llm import get_rate_limiter
+        from app.schemas import AnalysisStatus
+        from tests.conftest import HangingLLM
+        
+        llm = HangingLLM()
+        analysis_id = self.add_analysis(AnalysisStatus.PENDING)
+        orchestrator = fake_orchestrator(analysis_id, llm)
+        
+        run = asyncio.create_task(analysis.run_analysis(
+            analysis_id, "Should we open a second roastery?", {"bypass_cache": True}
+        ))
+        await asyncio.wait_for(llm.started.wait(), timeout=5)
+        assert get_rate_limiter().in_flight == 1
+        
+        response = await analysis.cancel_analysis(analysis_id)
+        await asyncio.wait_for(run, timeout=5)
+        
+        assert response["was_running"] is True
+        assert get_rate_limiter().in_flight == 0
+        assert analysis.active_analyses[analysis_id]["status"] == AnalysisStatus.CANCELLED
+        assert orchestrator.get_status()["status"] == AnalysisStatus.CANCELLED
+        assert analysis_id not in analysis.running_analyses
+    
+    async def test_cancel_event_from_another_worker(self, event_bus, fake_orchestrator):
+        """Test that a cancel published on the event bus stops a running pipeline."""
+        import asyncio
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        from tests.conftest import HangingLLM
+        
+        llm = HangingLLM()
+        analysis_id = self.add_analysis(AnalysisStatus.PENDING)
+        orchestrator = fake_orchestrator(analysis_id, llm)
+        
+        run = asyncio.create_task(analysis.run_analysis(
+            analysis_id, "Should we open a second roastery?", {"bypass_cache": True}
+        ))
+        await asyncio.wait_for(llm.started.wait(), timeout=5)
+        await event_bus.publish(analysis_id, "cancel", {})
+        await asyncio.wait_for(run, timeout=5)
+        
+        assert orchestrator.status == AnalysisStatus.CANCELLED
+        assert analysis_id not in analysis.running_analyses
+    
+    async def test_cancel_after_pipeline_returns(self, fake_orchestrator, analysis_counters):
+        """Test that a cancel landing before the result is stored is not overwritten."""
+        import asyncio
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = self.add_analysis(AnalysisStatus.PENDING)
+        orchestrator = fake_orchestrator(analysis_id)
+        execute = orchestrator.execute
+        cancelling = []
+        
+        async def execute_then_cancel(**kwargs):
+            result = await execute(**kwargs)
+            cancelling.append(asyncio.create_task(analysis.cancel_analysis(analysis_id)))
+            return result
+        
+        orchestrator.execute = execute_then_cancel
+        await analysis.run_analysis(analysis_id, "Should we open a second roastery?", {"bypass_cache": True})
+        response = await cancelling[0]
+        
+        assert response["status"] == AnalysisStatus.CANCELLED
+        assert analysis.active_analyses[analysis_id]["status"] == AnalysisStatus.CANCELLED
+        assert analysis.active_analyses[analysis_id]["result"] is None
+        assert analysis_counters["status"] == {"pending": -1, "cancelled": 1}
+    
+    def test_cancel_queued_analysis(self, client):
+        """Test that a queued analysis is cancelled and later skipped."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = self.add_analysis(AnalysisStatus.PENDING)
+        
+        response = client.post(f"/api/v1/analysis/{analysis_id}/cancel")
+        
+        assert response.status_code == 200
+        assert response.json()["was_running"] is False
+        assert analysis.active_analyses[analysis_id]["status"] == AnalysisStatus.CANCELLED
+    
+    def test_cancel_finished_analysis(self, client):
+        """Test that a finished analysis cannot be cancelled."""
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = self.add_analysis(AnalysisStatus.COMPLETED)
+        
+        response = client.post(f"/api/v1/analysis/{analysis_id}/cancel")
+        
+        assert response.status_code == 409
+    
+    def test_delete_cancels_and_removes(self, client):
+        """Test that DELETE cancels before removing the analysis."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = self.add_analysis(AnalysisStatus.RESEARCHING)
+        
+        response = client.delete(f"/api/v1/analysis/{analysis_id}")
+        
+        assert response.status_code == 200
+        assert analysis_id not in analysis.active_analyses
+
+
+@pytest.mark.unit
+class TestEventBusReads:
+    """Test that status and reasoning are served from the event bus."""
+    
+    async def test_run_publishes_status_and_steps(self, event_bus, fake_orchestrator, sample_analysis_request):
+        """Test that a run leaves its progress and final status on the bus."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        fake_orchestrator(analysis_id)
+        subscription = event_bus.subscribe([analysis_id], max_queued=10000)
+        
+        await analysis.run_analysis(analysis_id, sample_analysis_request["problem_statement"], {"bypass_cache": True})
+        
+        events = []
+        while (event := await subscription.get(0.01)) is not None:
+            events.append(event)
+        assert [e["data"]["agent_name"] for e in events if e["type"] == "step"] == [
+            "Research Agent", "Analysis Agent", "Risk Agent", "Decision Agent"
+        ]
+        statuses = [e["data"]["status"] for e in events if e["type"] == "status"]
+        assert statuses[0] == "researching"
+        assert statuses[-1] == "completed"
+        snapshot = await event_bus.get_status(analysis_id)
+        assert snapshot["status"] == "completed"
+        assert len(snapshot["reasoning_steps"]) == 4
+    
+    async def test_status_and_reasoning_from_other_worker(self, client, event_bus):
+        """Test reads for an analysis whose orchestrator lives in another process."""
+        from datetime import datetime
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        step = {
+            "agent_name": "Research Agent",
+            "step_number": 1,
+            "action": "Executing Market Research",
+            "input_summary": "",
+            "output_summary": "Market research completed",
+            "reasoning": "Because",
+            "confidence": 0.8,
+            "duration_ms": 10,
+            "timestamp": datetime.now().isoformat()
+        }
+        await event_bus.put_status(analysis_id, {
+            "id": analysis_id,
+            "status": "analyzing",
+            "current_agent": "Analysis Agent",
+            "progress_percentage": 50,
+            "completed_steps": 1,
+            "latest_step": step,
+            "reasoning_steps": [step]
+        })
+        
+        status = client.get(f"/api/v1/analysis/{analysis_id}/status").json()
+        reasoning = client.get(f"/api/v1/analysis/{analysis_id}/reasoning").json()
+        
+        assert (status["status"], status["current_agent"], status["progress_percentage"]) == ("analyzing", "Analysis Agent", 50)
+        assert status["current_step"] == "Executing Market Research"
+        assert [s["agent"] for s in reasoning["steps"]] == ["Research Agent"]
+
+
+@pytest.mark.unit
+class TestStatusStream:
+    """Test the push-based status stream."""
+    
+    @staticmethod
+    async def _read(response, limit=10):
+        """Collect SSE chunks until the stream ends (or ``limit`` chunks)."""
+        import asyncio
+        chunks = []
+        iterator = response.body_iterator.__aiter__()
+        while len(chunks) < limit:
+            try:
+                chunks.append(await asyncio.wait_for(iterator.__anext__(), timeout=1))
+            except StopAsyncIteration:
+                break
+        return chunks
+    
+    async def test_pushes_events_and_final_result(self, event_bus, status_cache):
+        """Test that published events arrive at once and the last carries the result."""
+        import asyncio
+        import json
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        response = await analysis.stream_analysis_status(analysis_id, last_event_id=None)
+        iterator = response.body_iterator.__aiter__()
+        initial = await asyncio.wait_for(iterator.__anext__(), timeout=1)
+        assert json.loads(initial.split("data: ")[1])["status"] == "pending"
+        
+        await event_bus.publish(analysis_id, "step", {"agent_name": "Research Agent"})
+        step = await asyncio.wait_for(iterator.__anext__(), timeout=1)
+        analysis.active_analyses[analysis_id] = {
+            "id": analysis_id,
+            "status": AnalysisStatus.COMPLETED,
+            "result": {"decision": {"recommendation": "GO"}}
+        }
+        await analysis._publish_status(analysis_id, AnalysisStatus.COMPLETED)
+        rest = await self._read(response)
+        
+        assert "event: step" in step and "Research Agent" in step
+        assert len(rest) == 1
+        final = json.loads(rest[0].split("data: ")[1])
+        assert final["final"] is True and final["status"] == "completed"
+        assert final["result"]["result"]["decision"]["recommendation"] == "GO"
+        assert event_bus._subscriptions == {status_cache._subscription}
+    
+    async def test_resumes_after_last_event_id(self, event_bus):
+        """Test that a reconnect replays only the events after Last-Event-ID."""
+        import json
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.COMPLETED}
+        first = await event_bus.publish(analysis_id, "step", {"agent_name": "Research Agent"})
+        await event_bus.publish(analysis_id, "step", {"agent_name": "Analysis Agent"})
+        await analysis._publish_status(analysis_id, AnalysisStatus.COMPLETED)
+        
+        response = await analysis.stream_analysis_status(analysis_id, last_event_id=first["id"])
+        chunks = await self._read(response)
+        
+        assert len(chunks) == 2
+        assert "Analysis Agent" in chunks[0]
+        assert json.loads(chunks[1].split("data: ")[1])["final"] is True
+    
+    def test_unknown_analysis(self, client):
+        """Test that streaming an unknown analysis is a 404."""
+        response = client.get(f"/api/v1/analysis/{uuid4()}/status/stream")
+        assert response.status_code == 404
+
+
+@pytest.mark.unit
+class TestStatusCaching:
+    """Test ETags and long-polling on the status endpoint."""
+    
+    def test_etag_and_not_modified(self, client):
+        """Test that an unchanged status is answered with 304."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        
+        first = client.get(f"/api/v1/analysis/{analysis_id}/status")
+        etag = first.headers["ETag"]
+        second = client.get(f"/api/v1/analysis/{analysis_id}/status", headers={"If-None-Match": etag})
+        
+        assert first.status_code == 200 and first.json()["status"] == "pending"
+        assert second.status_code == 304
+        assert second.headers["ETag"] == etag
+    
+    async def test_etag_stable_while_queued(self):
+        """Test that the growing queue wait time does not change the ETag."""
+        import asyncio
+        from app.api.routes import analysis
+        from app.jobs import FairScheduler
+        from app.schemas import AnalysisStatus
+        
+        scheduler = FairScheduler(max_running=1)
+        release = asyncio.Event()
+        
+        async def hold(analysis_id):
+            async with scheduler.slot(analysis_id, "tenant-a", "normal"):
+                await release.wait()
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        tasks = [asyncio.create_task(hold("running")), asyncio.create_task(hold(analysis_id))]
+        await asyncio.sleep(0)
+        
+        with patch('app.api.routes.analysis.get_fair_scheduler', return_value=scheduler):
+            first = await analysis.get_analysis_status(analysis_id, wait=0, if_none_match=None)
+            await asyncio.sleep(0.01)
+            second = await analysis.get_analysis_status(
+                analysis_id, wait=0, if_none_match=first.headers["ETag"]
+            )
+        release.set()
+        await asyncio.gather(*tasks)
+        
+        assert second.status_code == 304
+    
+    async def test_served_from_cache_until_an_event(self, status_cache):
+        """Test that polls skip the loader until the bus reports a change."""
+        import asyncio
+        import json
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        
+        for _ in range(3):
+            await analysis.get_analysis_status(analysis_id, wait=0, if_none_match=None)
+        await analysis._publish_status(analysis_id, AnalysisStatus.CANCELLED)
+        await asyncio.sleep(0.01)
+        response = await analysis.get_analysis_status(analysis_id, wait=0, if_none_match=None)
+        
+        assert (status_cache.misses, status_cache.hits) == (1, 3)
+        assert json.loads(response.body)["status"] == "cancelled"
+    
+    async def test_long_poll_wakes_on_change(self):
+        """Test that ?wait blocks until the status differs from If-None-Match."""
+        import asyncio
+        import json
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+        
+        analysis_id = str(uuid4())
+        analysis.active_analyses[analysis_id] = {"id": analysis_id, "status": AnalysisStatus.PENDING}
+        etag = (await analysis.get_analysis_status(analysis_id, wait=0, if_none_match=None)).headers["ETag"]
+        
+        unchanged = await analysis.get_analysis_status(analysis_id, wait=0.05, if_none_match=etag)
+        poll = asyncio.create_task(analysis.get_analysis_status(analysis_id, wait=5, if_none_match=etag))
+        await asyncio.sleep(0.05)
+        assert not poll.done()
+        await analysis._publish_status(analysis_id, AnalysisStatus.CANCELLED)
+        changed = await asyncio.wait_for(poll, timeout=1)
+        
+        assert unchanged.status_code == 304
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert json.loads(changed.body)["status"] == "cancelled"
+
+
+class FakeFindOne:
+    """Awaitable ``find_one`` query that records ``update`` calls."""
+    
+    def __init__(self, calls, query):
+        self.calls = calls
+        self.query = query
+    
+    def __await__(self):
+        async def no_document():
+            return None
+        return no_document().__await__()
+    
+    async def update(self, update):
+        self.calls.append((self.query, update))
+
+
+class FakeCollection:
+    """Motor collection whose ``find_one_and_update`` records calls."""
+    
+    def __init__(self, calls, previous):
+        self.calls = calls
+        self.previous = previous
+    
+    async def find_one_and_update(self, query, update, projection=None):
+        self.calls.append((query, update))
+        return self.previous
+
+
+@pytest.mark.unit
+class TestMongoWrites:
+    """Test that MongoDB mode writes phases and results as partial updates."""
+    
+    async def test_phases_and_result_are_atomic_updates(
+        self, fake_orchestrator, sample_analysis_request, analysis_counters
+    ):
+        """Test one guarded $set/$push per phase and a single final $set."""
+        from app.api.routes import analysis
+        
+        calls = []
+        fake_document = MagicMock()
+        fake_document.find_one.side_effect = lambda query: FakeFindOne(calls, query)
+        fake_document.get_motor_collection.return_value = FakeCollection(calls, {"status": "deciding"})
+        analysis_id = str(uuid4())
+        fake_orchestrator(analysis_id)
+        
+        with patch('app.api.routes.analysis.is_connected', return_value=True), \
+             patch('app.api.routes.analysis.AnalysisDocument', fake_document):
+            await analysis.run_analysis(analysis_id, sample_analysis_request["problem_statement"], {"bypass_cache": True})
+        
+        updates = [update for _, update in calls]
+        phases, final = updates[:-1], updates[-1]
+        assert [u["$push"]["reasoning_steps"]["agent"] for u in phases] == [
+            "Research Agent", "Analysis Agent", "Risk Agent", "Decision Agent"
+        ]
+        assert phases[0]["$set"]["status"] == "researching"
+        assert "checkpoints.Research Agent" in phases[0]["$set"]
+        assert calls[0][0]["reasoning_steps.agent"] == {"$ne": "Research Agent"}
+        assert list(final) == ["$set"]
+        assert calls[-1][0]["status"] == {"$nin": ["completed", "failed", "cancelled"]}
+        assert final["$set"]["status"] == "completed"
+        assert len(final["$set"]["reasoning_steps"]) == 4
+        assert final["$set"]["decision"]["verdict"]
+        assert analysis_counters["status"] == {"pending": -1, "completed": 1}
+    
+    async def test_result_not_stored_over_cancel(self, fake_orchestrator, event_bus, analysis_counters):
+        """Test that a result arriving after a cancel neither completes nor counts."""
+        from app.api.routes import analysis
+        
+        calls = []
+        fake_document = MagicMock()
+        fake_document.find_one.side_effect = lambda query: FakeFindOne(calls, query)
+        fake_document.get_motor_collection.return_value = FakeCollection(calls, None)
+        analysis_id = str(uuid4())
+        fake_orchestrator(analysis_id)
+        
+        with patch('app.api.routes.analysis.is_connected', return_value=True), \
+             patch('app.api.routes.analysis.AnalysisDocument', fake_document):
+            await analysis.run_analysis(analysis_id, "Should we open a second roastery?", {"bypass_cache": True})
+        
+        assert calls[-1][1]["$set"]["status"] == "completed"
+        assert analysis_counters == {}
+        assert (await event_bus.get_status(analysis_id))["status"] != "completed"
+    
+    async def test_status_reads_projection(self):
+        """Test that the stored status is read through the status-only projection."""
+        from app.api.routes import analysis
+        from app.db import AnalysisStatusView
+        
+        view = AnalysisStatusView(status="analyzing", step_count=1)
+        fake_document = MagicMock()
+        
+        async def find_one(query, projection_model=None):
+            assert projection_model is AnalysisStatusView
+            return view
+        
+        fake_document.find_one.side_effect = find_one
+        with patch('app.api.routes.analysis.is_connected', return_value=True), \
+             patch('app.api.routes.analysis.AnalysisDocument', fake_document):
+            status = await analysis._build_status(str(uuid4()))
+        
+        assert status.status == "analyzing"
+        assert status.progress_percentage == analysis.PHASE_PROGRESS[analysis.AnalysisStatus.ANALYZING]
@@ -0,0 +1,97 @@
+"""
+Unit tests for the materialized analysis counters.
+"""
+import pytest
+
+from app.db.stats import apply_delta, counter_delta, counters_from_groups, summarize
+
+
+@pytest.mark.unit
+class TestCounters:
+    """Test counter deltas and summaries."""
+
+    def test_transitions_move_between_buckets(self):
+        """Test creation, progress, completion and deletion deltas."""
+        counters = {}
+        decision = {"verdict": "GO", "confidence": 0.8}
+        apply_delta(counters, counter_delta(None, None, "pending"))
+        assert counter_delta("pending", None, "researching", None) == {}
+        apply_delta(counters, counter_delta("deciding", None, "completed", decision))
+
+        stats = summarize(counters)
+        assert stats["total_analyses"] == 1
+        assert stats["pending"] == 0
+        assert stats["completed"] == 1
+        assert stats["average_confidence"] == 0.8
+        assert stats["verdict_distribution"] == {"GO": 1}
+
+        apply_delta(counters, counter_delta("completed", decision, None, None))
+        assert summarize(counters) == summarize({})
+
+    def test_counters_from_groups(self):
+        """Test that aggregation rows fold into the same counters."""
+        counters = counters_from_groups([
+            {"_id": {"status": "completed", "verdict": "GO"}, "count": 2, "confidence_sum": 1.5, "confidence_count": 2},
+            {"_id": {"status": "completed", "verdict": "NO_GO"}, "count": 1, "confidence_sum": 0.5, "confidence_count": 1},
+            {"_id": {"status": "analyzing"}, "count": 3, "confidence_sum": 0, "confidence_count": 0},
+            {"_id": {"status": "failed"}, "count": 1, "confidence_sum": 0, "confidence_count": 0},
+        ])
+
+        stats = summarize(counters)
+        assert stats["total_analyses"] == 7
+        assert stats["completed"] == 3
+        assert stats["pending"] == 3
+        assert stats["failed"] == 1
+        assert stats["average_confidence"] == pytest.approx(2 / 3)
+        assert stats["verdict_distribution"] == {"GO": 2, "NO_GO": 1}
+
+
+@pytest.mark.unit
+class TestStatsRoute:
+    """Test the statistics endpoint on the in-memory fallback."""
+
+    def test_stats_follow_status_changes(self, client, sample_analysis_request):
+        """Test that creating, cancelling and deleting analyses update the stats."""
+        first = client.post("/api/v1/analysis", json=sample_analysis_request).json()["id"]
+        second = client.post("/api/v1/analysis", json=sample_analysis_request).json()["id"]
+
+        assert client.post(f"/api/v1/analysis/{first}/cancel").status_code == 200
+        stats = client.get("/api/v1/history/stats").json()
+        assert stats["total_analyses"] == 2
+        assert stats["pending"] == 1
+        assert stats["cancelled"] == 1
+
+        assert client.delete(f"/api/v1/analysis/{second}").status_code == 200
+        stats = client.get("/api/v1/history/stats").json()
+        assert stats["total_analyses"] == 1
+        assert stats["pending"] == 0
+
+    def test_demo_analysis_is_counted(self, client):
+        """Test that the demo record is counted, so deleting it leaves the stats at zero."""
+        client.get("/api/v1/analysis/mock/demo")
+        client.get("/api/v1/analysis/mock/demo")
+        assert client.get("/api/v1/history/stats").json()["completed"] == 1
+
+        assert client.delete("/api/v1/analysis/demo-analysis-123").status_code == 200
+        stats = client.get("/api/v1/history/stats").json()
+        assert stats["total_analyses"] == 0
+        assert stats["verdict_distribution"] == {}
+
+    def test_restore_counts_held_analyses(self, analysis_counters):
+        """Test that startup recounts analyses already in the registry."""
+        from app.api.routes import analysis
+        from app.schemas import AnalysisStatus
+
+        analysis.active_analyses.clear()
+        analysis.active_analyses["a"] = {
+            "id": "a", "status": AnalysisStatus.COMPLETED, "created_at": "2024-01-01",
+            "result": {"decision": {"verdict": "GO", "confidence": 0.5}}
+        }
+        analysis.active_analyses["b"] = {"id": "b", "status": AnalysisStatus.RESEARCHING, "created_at": "2024-01-02"}
+
+        analysis.restore_memory_counters()
+
+        stats = summarize(analysis_counters)
+        assert (stats["total_analyses"], stats["completed"], stats["pending"]) == (2, 1, 1)
+        assert stats["verdict_distribution"] == {"GO": 1}
+        assert stats["average_confidence"] == 0.5
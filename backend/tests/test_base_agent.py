@@ -0,0 +1,100 @@
+"""
+Unit tests for BaseAgent execution.
+"""
+import asyncio
+import json
+import pytest
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from app.agents import RiskAgent
+from app.schemas import AgentInput
+
+
+class FakeLLM:
+    """Stand-in chat model that returns or streams a fixed completion."""
+
+    def __init__(self, text, chunk_size=5, total_tokens=42):
+        self.text = text
+        self.chunk_size = chunk_size
+        self.total_tokens = total_tokens
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        return AIMessage(
+            content=self.text,
+            response_metadata={"token_usage": {"total_tokens": self.total_tokens}}
+        )
+
+    async def astream(self, messages, **kwargs):
+        self.calls += 1
+        for i in range(0, len(self.text), self.chunk_size):
+            yield AIMessageChunk(content=self.text[i:i + self.chunk_size])
+        yield AIMessageChunk(
+            content="",
+            usage_metadata={"input_tokens": 30, "output_tokens": 12, "total_tokens": self.total_tokens}
+        )
+
+
+@pytest.mark.unit
+class TestAgentStreaming:
+    """Test the streaming execution mode."""
+
+    async def test_tokens_are_forwarded(self):
+        """Test that every fragment reaches the callback in order."""
+        completion = json.dumps({"overall_risk_score": 0.4, "confidence": 0.9})
+        agent = RiskAgent()
+        agent.llm = FakeLLM(completion)
+        received = []
+
+        async def on_token(text):
+            received.append(text)
+
+        output = await agent.execute(
+            AgentInput(task="Should we expand to a second city?", use_cache=False),
+            on_token=on_token
+        )
+
+        assert "".join(received) == completion
+        assert len(received) > 1
+        assert output.result["overall_risk_score"] == 0.4
+        assert output.tokens_used == 42
+
+
+class StalledLLM(FakeLLM):
+    """Fake chat model whose first call never returns."""
+
+    async def ainvoke(self, messages, **kwargs):
+        if self.calls == 0:
+            self.calls += 1
+            await asyncio.sleep(60)
+        return await super().ainvoke(messages, **kwargs)
+
+
+@pytest.mark.unit
+class TestAgentDeadlines:
+    """Test deadlines and hedging in execute."""
+
+    async def test_stalled_call_is_hedged(self):
+        """Test that a duplicate request rescues a stalled call."""
+        completion = json.dumps({"overall_risk_score": 0.4, "confidence": 0.9})
+        agent = RiskAgent()
+        agent.config.soft_deadline_seconds = 0.02
+        agent.llm = StalledLLM(completion)
+
+        output = await agent.execute(AgentInput(task="Expand?", use_cache=False))
+
+        assert agent.llm.calls == 2
+        assert output.result["overall_risk_score"] == 0.4
+
+    async def test_hard_deadline_fails_agent(self):
+        """Test that a call past the hard deadline returns an error output."""
+        agent = RiskAgent()
+        agent.config.soft_deadline_seconds = 10
+        agent.config.hard_deadline_seconds = 0.05
+        agent.llm = StalledLLM("{}")
+
+        output = await agent.execute(AgentInput(task="Expand?", use_cache=False))
+
+        assert "deadline" in output.result["error"]
+        assert output.confidence == 0.0
@@ -0,0 +1,155 @@
+"""
+Unit tests for the analysis event bus.
+"""
+import pytest
+
+from app.events.memory import InProcessEventBus
+from app.events.mongodb import MongoEventBus
+
+
+@pytest.mark.unit
+class TestInProcessEventBus:
+    """Test publishing, subscription filters and status snapshots."""
+
+    async def test_subscribers_receive_matching_events(self):
+        """Test that a subscription only sees the analyses it asked for."""
+        bus = InProcessEventBus()
+        everything = bus.subscribe()
+        only_a = bus.subscribe(["a"])
+
+        await bus.publish("a", "status", {"status": "researching"})
+        await bus.publish("b", "status", {"status": "deciding"})
+
+        assert [(await everything.get(0.1))["analysis_id"] for _ in range(2)] == ["a", "b"]
+        event = await only_a.get(0.1)
+        assert (event["analysis_id"], event["type"], event["data"]) == ("a", "status", {"status": "researching"})
+        assert await only_a.get(0.01) is None
+
+    async def test_closed_subscription_stops_receiving(self):
+        """Test that unsubscribing detaches the queue and ends iteration."""
+        bus = InProcessEventBus()
+        subscription = bus.subscribe(["a"])
+        subscription.close()
+
+        await bus.publish("a", "step", {})
+
+        assert await subscription.get() is None
+        assert [event async for event in subscription] == []
+        assert bus.stats()["subscribers"] == 0
+
+    async def test_slow_subscriber_drops_events(self):
+        """Test that a full queue never blocks the publisher."""
+        bus = InProcessEventBus()
+        subscription = bus.subscribe(max_queued=1)
+
+        await bus.publish("a", "step", {"n": 1})
+        await bus.publish("a", "step", {"n": 2})
+
+        assert subscription.dropped == 1
+        assert (await subscription.get(0.1))["data"] == {"n": 1}
+
+    async def test_status_snapshots_are_versioned(self):
+        """Test that every snapshot update bumps the version."""
+        bus = InProcessEventBus(max_snapshots=1)
+
+        assert await bus.get_status("a") is None
+        assert await bus.put_status("a", {"status": "researching"}) == 1
+        assert await bus.put_status("a", {"status": "deciding"}) == 2
+        assert await bus.get_status("a") == {"status": "deciding", "version": 2}
+
+        await bus.put_status("b", {"status": "pending"})
+        assert await bus.get_status("a") is None
+
+        await bus.delete("b")
+        assert await bus.get_status("b") is None
+
+    async def test_history_after_event_id(self):
+        """Test that history replays retained events after an ID, without tokens."""
+        bus = InProcessEventBus(max_history=2)
+        first = await bus.publish("a", "step", {"n": 1})
+        await bus.publish("a", "token", {"text": "x"})
+        await bus.publish("a", "step", {"n": 2})
+        await bus.publish("a", "step", {"n": 3})
+        await bus.publish("b", "step", {"n": 4})
+
+        assert [e["data"]["n"] for e in await bus.history("a")] == [2, 3]
+        assert [e["data"]["n"] for e in await bus.history("a", after=first["id"])] == [2, 3]
+        assert await bus.history("a", after="999") == []
+
+        await bus.delete("a")
+        assert await bus.history("a") == []
+
+    async def test_tenant_subscriptions_and_watch(self):
+        """Test tenant feeds and changing a subscription's analyses in place."""
+        bus = InProcessEventBus()
+        subscription = bus.subscribe(analysis_ids=[], tenants=["acme"])
+
+        await bus.publish("a", "status", {}, tenant="acme")
+        await bus.publish("b", "status", {}, tenant="other")
+        subscription.watch(["b"])
+        await bus.publish("b", "step", {}, tenant="other")
+        subscription.unwatch(["b"], ["acme"])
+        await bus.publish("a", "step", {}, tenant="acme")
+
+        received = []
+        while (event := await subscription.get(0.01)) is not None:
+            received.append((event["analysis_id"], event["type"]))
+        assert received == [("a", "status"), ("b", "step")]
+        assert bus.stats()["subscribers"] == 0
+
+
+@pytest.fixture
+def mongo_bus(mongo_database, event_loop):
+    """MongoDB event bus on the in-memory stand-in, polling quickly."""
+    bus = MongoEventBus(mongo_database, poll_interval=0.01)
+    yield bus
+    bus.close_subscriptions()
+    event_loop.run_until_complete(bus.close())
+
+
+@pytest.mark.unit
+class TestMongoEventBus:
+    """Test the MongoDB backend against an in-memory stand-in."""
+
+    async def test_events_arrive_through_the_tail(self, mongo_bus):
+        """Test that published events reach subscribers and history, tokens only locally."""
+        subscription = mongo_bus.subscribe(["a"])
+        step = await mongo_bus.publish("a", "step", {"n": 1}, tenant="acme")
+        await mongo_bus.publish("a", "token", {"text": "x"})
+        await mongo_bus.publish("b", "step", {"n": 2})
+
+        received = []
+        while (event := await subscription.get(0.2)) is not None:
+            received.append((event["type"], event["data"]))
+        assert sorted(received) == [("step", {"n": 1}), ("token", {"text": "x"})]
+        assert [e["id"] for e in await mongo_bus.history("a")] == [step["id"]]
+        assert await mongo_bus.history("a", after=step["id"]) == []
+
+    async def test_event_right_after_subscribe_is_delivered(self, mongo_bus):
+        """Test that an event inserted before the tail's first query is not skipped."""
+        subscription = mongo_bus.subscribe(["a"])
+        await mongo_bus.publish("a", "cancel", {})
+
+        event = await subscription.get(1)
+        assert event is not None and event["type"] == "cancel"
+
+    async def test_started_bus_skips_earlier_events(self, mongo_bus):
+        """Test that starting the bus tails from the newest event."""
+        await mongo_bus.publish("a", "step", {"n": 1})
+        await mongo_bus.start()
+        subscription = mongo_bus.subscribe(["a"])
+        await mongo_bus.publish("a", "step", {"n": 2})
+
+        assert (await subscription.get(1))["data"] == {"n": 2}
+        assert await subscription.get(0.05) is None
+        assert mongo_bus.stats()["tailing"] is True
+
+    async def test_status_snapshots_are_versioned(self, mongo_bus):
+        """Test that snapshots are upserted with an increasing version."""
+        assert await mongo_bus.get_status("a") is None
+        assert await mongo_bus.put_status("a", {"status": "researching"}) == 1
+        assert await mongo_bus.put_status("a", {"status": "deciding"}) == 2
+        assert await mongo_bus.get_status("a") == {"status": "deciding", "version": 2}
+
+        await mongo_bus.delete("a")
+        assert await mongo_bus.get_status("a") is None
@@ -0,0 +1,109 @@
+"""
+Unit tests for priority and per-client fair admission of analyses.
+"""
+import asyncio
+import pytest
+
+from app.jobs import FairScheduler
+
+
+async def hold(scheduler, analysis_id, client_id, priority, order, release):
+    async with scheduler.slot(analysis_id, client_id, priority):
+        order.append(analysis_id)
+        await release.wait()
+
+
+@pytest.mark.unit
+class TestFairScheduler:
+    """Test admission order, queue reporting and cancellation."""
+
+    async def test_interactive_overtakes_bulk_backlog(self):
+        """Test that an interactive request from another client runs next."""
+        scheduler = FairScheduler(max_running=1)
+        order, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(scheduler, f"bulk-{i}", "tenant-a", "bulk", order, release))
+                 for i in range(5)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(hold(scheduler, "urgent", "tenant-b", "interactive", order, release)))
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert order[:2] == ["bulk-0", "urgent"]
+
+    async def test_clients_share_slots_fairly(self):
+        """Test that a burst from one client does not delay another client's work."""
+        scheduler = FairScheduler(max_running=1)
+        order, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(scheduler, f"a-{i}", "tenant-a", "normal", order, release))
+                 for i in range(4)]
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(hold(scheduler, f"b-{i}", "tenant-b", "normal", order, release))
+                  for i in range(2)]
+        await asyncio.sleep(0)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert order == ["a-0", "b-0", "a-1", "b-1", "a-2", "a-3"]
+
+    async def test_describe_reports_position_and_depth(self):
+        """Test the queue information exposed in the status response."""
+        scheduler = FairScheduler(max_running=1)
+        order, release = [], asyncio.Event()
+        tasks = [asyncio.create_task(hold(scheduler, f"job-{i}", "tenant-a", "normal", order, release))
+                 for i in range(3)]
+        await asyncio.sleep(0)
+
+        assert scheduler.describe("job-0")["queue_position"] == 0
+        waiting = scheduler.describe("job-2")
+        assert (waiting["queue_position"], waiting["queue_depth"]) == (2, 2)
+        assert scheduler.stats()["waiting_by_priority"] == {"normal": 2}
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert scheduler.describe("job-2") is None
+        assert scheduler.stats()["admitted"] == 3
+
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        """Test that cancelling a queued analysis frees its place in line."""
+        scheduler = FairScheduler(max_running=1)
+        order, release = [], asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, "first", "a", "normal", order, release))
+        waiting = asyncio.create_task(hold(scheduler, "waiting", "a", "normal", order, release))
+        last = asyncio.create_task(hold(scheduler, "last", "b", "normal", order, release))
+        await asyncio.sleep(0)
+
+        waiting.cancel()
+        await asyncio.sleep(0)
+        assert scheduler.describe("waiting") is None
+
+        release.set()
+        await asyncio.gather(first, last)
+        assert order == ["first", "last"]
+        assert scheduler.stats()["running"] == 0
+
+    async def test_redelivered_attempt_holds_its_own_slot(self):
+        """Test that two attempts of one analysis each hold and release their own slot."""
+        scheduler = FairScheduler(max_running=2)
+        order, first_done, second_done = [], asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(hold(scheduler, "job", "a", "normal", order, first_done))
+        second = asyncio.create_task(hold(scheduler, "job", "a", "normal", order, second_done))
+        other = asyncio.create_task(hold(scheduler, "other", "b", "normal", order, asyncio.Event()))
+        await asyncio.sleep(0)
+        assert (scheduler.stats()["running"], scheduler.stats()["waiting"]) == (2, 1)
+
+        first_done.set()
+        await first
+        await asyncio.sleep(0)
+        assert order == ["job", "job", "other"]
+        assert scheduler.stats()["running"] == 2
+        assert scheduler.describe("job")["queue_position"] == 0
+
+        second_done.set()
+        await second
+        other.cancel()
+        await asyncio.gather(other, return_exceptions=True)
+        assert scheduler.stats()["running"] == 0
+        assert scheduler.describe("job") is None
@@ -91,3 +91,71 @@ class TestHistoryValidation:
         response = client.get("/api/v1/history?offset=-1")
         
         assert response.status_code == 422
+
+
+@pytest.mark.unit
+class TestHistoryCursors:
+    """Test keyset pagination of the history."""
+    
+    def test_pages_follow_cursor(self, client, sample_analysis_request):
+        """Test that next_after walks every analysis once, newest first."""
+        from app.api.routes import analysis
+        analysis.active_analyses.clear()
+        created = [
+            client.post("/api/v1/analysis", json=sample_analysis_request).json()["id"]
+            for _ in range(3)
+        ]
+        
+        first = client.get("/api/v1/history?limit=2").json()
+        assert first["total"] == 3
+        assert first["next_after"]
+        second = client.get(
+            f"/api/v1/history?limit=2&after={first['next_after']}&include_total=false"
+        ).json()
+        assert second["total"] is None
+        assert second["next_after"] is None
+        
+        ids = [item["id"] for item in first["analyses"] + second["analyses"]]
+        assert sorted(ids) == sorted(created)
+        assert ids[-1] == created[0]
+    
+    def test_cursor_round_trip(self):
+        """Test that cursors decode to the key they were made from."""
+        from app.api.pagination import decode_cursor, encode_cursor
+        
+        created_at = datetime(2024, 1, 11, 10, 0, 0, 123456)
+        assert decode_cursor(encode_cursor(created_at, "abc")) == (created_at, "abc")
+    
+    def test_invalid_cursor(self, client):
+        """Test that a malformed cursor is rejected."""
+        response = client.get("/api/v1/history?after=not-a-cursor")
+        
+        assert response.status_code == 400
+
+
+@pytest.mark.unit
+class TestHistoryProjection:
+    """Test that history reads only the listed fields."""
+    
+    async def test_history_reads_summaries(self):
+        """Test that MongoDB history pages are read as summary projections."""
+        from app.api.routes.history import get_analysis_history
+        from app.db import AnalysisSummary
+        
+        summary = AnalysisSummary(
+            analysis_id="test-1", status="completed", problem_statement="Test 1",
+            created_at=datetime(2024, 1, 11), verdict="GO", confidence=0.8
+        )
+        
+        async def to_list():
+            return [summary]
+        
+        with patch('app.db.is_connected', return_value=True), \
+             patch('app.db.AnalysisDocument') as mock_doc:
+            mock_doc.find.return_value.sort.return_value.skip.return_value.limit.return_value.to_list = to_list
+            page = await get_analysis_history(limit=10, offset=0, status=None, after=None, include_total=False)
+        
+        assert mock_doc.find.call_args.kwargs["projection_model"] is AnalysisSummary
+        assert page["analyses"][0]["verdict"] == "GO"
+        assert page["analyses"][0]["confidence"] == 0.8
+        assert page["next_after"] is None
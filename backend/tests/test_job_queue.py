@@ -0,0 +1,173 @@
+"""
+Unit tests for the durable job queue and worker pool.
+"""
+import asyncio
+import pytest
+
+from app.jobs import WorkerPool
+from app.jobs.mongodb import MongoJobQueue
+from app.jobs.sqlite import SQLiteJobQueue
+
+
+@pytest.fixture(params=["sqlite", "mongodb"])
+def queue(request, tmp_path):
+    """Each backend in turn; MongoDB runs against an in-memory stand-in."""
+    if request.param == "mongodb":
+        yield MongoJobQueue(request.getfixturevalue("mongo_database"))
+        return
+    queue = SQLiteJobQueue(str(tmp_path / "queue.sqlite"))
+    yield queue
+    queue._db.close()
+
+
+@pytest.mark.unit
+class TestJobQueue:
+    """Test queue semantics on every backend."""
+
+    async def test_reserve_in_order(self, queue):
+        """Test that jobs are delivered oldest first."""
+        await queue.enqueue("analysis", {"n": 1}, job_id="a")
+        await queue.enqueue("analysis", {"n": 2}, job_id="b")
+
+        first = await queue.reserve("w1", visibility_timeout=60)
+        second = await queue.reserve("w2", visibility_timeout=60)
+
+        assert (first.id, first.payload, first.attempts) == ("a", {"n": 1}, 1)
+        assert second.id == "b"
+        assert await queue.reserve("w3", visibility_timeout=60) is None
+
+    async def test_higher_priority_reserved_first(self, queue):
+        """Test that priority outranks age."""
+        await queue.enqueue("batch", {}, job_id="bulk", priority=0)
+        await queue.enqueue("analysis", {}, job_id="interactive", priority=2)
+
+        assert (await queue.reserve("w1", visibility_timeout=60)).id == "interactive"
+        assert (await queue.reserve("w1", visibility_timeout=60)).id == "bulk"
+
+    async def test_enqueue_is_idempotent(self, queue):
+        """Test that re-enqueueing a job ID does not duplicate it."""
+        await queue.enqueue("analysis", {}, job_id="a")
+        await queue.enqueue("analysis", {}, job_id="a")
+
+        assert (await queue.stats())["queued"] == 1
+
+    async def test_expired_lease_is_redelivered(self, queue):
+        """Test at-least-once delivery after a worker dies."""
+        await queue.enqueue("analysis", {}, job_id="a")
+        await queue.reserve("w1", visibility_timeout=0.01)
+        await asyncio.sleep(0.02)
+
+        job = await queue.reserve("w2", visibility_timeout=60)
+
+        assert job.id == "a"
+        assert job.attempts == 2
+
+    async def test_ack_and_nack(self, queue):
+        """Test completion, delayed retry and permanent failure."""
+        for job_id in ("a", "b", "c"):
+            await queue.enqueue("analysis", {}, job_id=job_id)
+        a = await queue.reserve("w", 60)
+        b = await queue.reserve("w", 60)
+        c = await queue.reserve("w", 60)
+
+        await queue.ack(a.id)
+        await queue.nack(b.id, "boom", retry_in=60)
+        await queue.nack(c.id, "boom")
+
+        stats = await queue.stats()
+        assert (stats["done"], stats["queued"], stats["failed"]) == (1, 1, 1)
+        # The retried job is not visible before its delay
+        assert await queue.reserve("w", 60) is None
+
+    async def test_expired_lease_cannot_settle(self, queue):
+        """Test that a worker whose lease passed on cannot ack or fail the job."""
+        await queue.enqueue("analysis", {}, job_id="a")
+        await queue.reserve("w1", visibility_timeout=0.01)
+        await asyncio.sleep(0.02)
+        await queue.reserve("w2", visibility_timeout=60)
+
+        assert not await queue.ack("a", worker_id="w1")
+        assert not await queue.nack("a", "boom", worker_id="w1")
+        assert (await queue.stats())["reserved"] == 1
+        assert await queue.ack("a", worker_id="w2")
+
+
+@pytest.mark.unit
+class TestWorkerPool:
+    """Test job dispatch."""
+
+    async def test_runs_jobs_concurrently(self, queue):
+        """Test that the pool drains the queue with bounded parallelism."""
+        in_flight = 0
+        peak = 0
+        done = []
+
+        async def handler(payload):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            done.append(payload["n"])
+
+        for n in range(6):
+            await queue.enqueue("analysis", {"n": n})
+        pool = WorkerPool(queue, {"analysis": handler}, concurrency=2, poll_interval=0.01)
+        pool.start()
+        for _ in range(500):
+            if pool.processed == 6:
+                break
+            await asyncio.sleep(0.01)
+        await pool.stop()
+
+        assert sorted(done) == list(range(6))
+        assert peak == 2
+        assert (await queue.stats())["done"] == 6
+
+    async def test_failed_job_retries_then_dead_letters(self, queue):
+        """Test that a failing handler is retried up to max_attempts."""
+        attempts = []
+        dead = []
+
+        async def handler(payload):
+            attempts.append(1)
+            raise RuntimeError("provider down")
+
+        async def on_dead_letter(job, error):
+            dead.append((job.id, error))
+
+        await queue.enqueue("analysis", {}, job_id="a", max_attempts=2)
+        pool = WorkerPool(
+            queue, {"analysis": handler}, max_retry_delay=0, on_dead_letter=on_dead_letter
+        )
+
+        await pool.run_once()
+        await pool.run_once()
+
+        assert len(attempts) == 2
+        assert dead == [("a", "provider down")]
+        assert (await queue.stats())["failed"] == 1
+
+    async def test_heartbeat_keeps_job_invisible(self, queue):
+        """Test that a long job is not redelivered while it runs."""
+        redelivered = []
+
+        async def handler(payload):
+            await asyncio.sleep(0.1)
+            redelivered.append(await queue.reserve("other", 60))
+
+        await queue.enqueue("analysis", {}, job_id="a")
+        pool = WorkerPool(queue, {"analysis": handler}, visibility_timeout=0.05)
+
+        await pool.run_once()
+
+        assert redelivered == [None]
+
+    async def test_unknown_kind_is_dead_lettered(self, queue):
+        """Test that jobs without a handler fail instead of looping."""
+        await queue.enqueue("mystery", {}, job_id="a")
+        pool = WorkerPool(queue, {})
+
+        await pool.run_once()
+
+        assert (await queue.stats())["failed"] == 1
@@ -0,0 +1,86 @@
+"""
+Unit tests for the incremental JSON parser.
+"""
+import json
+import pytest
+
+from app.agents import ResearchAgent
+from app.agents.json_stream import IncrementalJSONParser, parse_json_response
+
+
+DOCUMENT = {
+    "verdict": "GO",
+    "summary": "Escaped \"quotes\" and braces { } inside strings",
+    "key_factors": [{"factor": "Demand", "weight": 0.9}],
+    "confidence": 0.82,
+    "approved": True,
+}
+
+
+@pytest.mark.unit
+class TestIncrementalJSONParser:
+    """Test field emission while text streams in."""
+
+    def test_fields_emitted_as_they_close(self):
+        """Test that each top-level field is emitted once, in order."""
+        text = "```json\n" + json.dumps(DOCUMENT, indent=2) + "\n```"
+        parser = IncrementalJSONParser()
+
+        emitted = []
+        for i in range(0, len(text), 4):
+            emitted.extend(parser.feed(text[i:i + 4]))
+
+        assert [key for key, _ in emitted] == list(DOCUMENT)
+        assert dict(emitted) == DOCUMENT
+        assert parser.finish() == DOCUMENT
+        assert not parser.repaired
+
+    def test_field_not_emitted_before_close(self):
+        """Test that a partially streamed array is held back."""
+        parser = IncrementalJSONParser()
+
+        assert parser.feed('{"verdict": "GO", "key_factors": [{"factor": "Dem') == [("verdict", "GO")]
+        assert parser.feed('and"}], ') == [("key_factors", [{"factor": "Demand"}])]
+
+    def test_number_waits_for_terminator(self):
+        """Test that numbers split across chunks are not emitted early."""
+        parser = IncrementalJSONParser()
+
+        assert parser.feed('{"confidence": 0.8') == []
+        assert parser.feed('2}') == [("confidence", 0.82)]
+
+
+@pytest.mark.unit
+class TestTruncationRepair:
+    """Test recovery of responses cut off at max_tokens."""
+
+    @pytest.mark.parametrize("text, expected", [
+        ('{"verdict": "GO", "next_steps": ["Build MVP", "Hire', {"verdict": "GO", "next_steps": ["Build MVP", "Hire"]}),
+        ('{"verdict": "GO", "risks": [{"id": 1}, {"id": 2', {"verdict": "GO", "risks": [{"id": 1}, {"id": 2}]}),
+        ('{"verdict": "GO", "summ', {"verdict": "GO"}),
+        ('{"verdict": "GO", "confidence": ', {"verdict": "GO"}),
+        ('{"verdict": "GO", "done": tr', {"verdict": "GO"}),
+    ])
+    def test_truncated_tail_is_repaired(self, text, expected):
+        """Test that the valid prefix of a truncated object is kept."""
+        assert parse_json_response(text) == expected
+
+    def test_prose_around_json(self):
+        """Test that surrounding prose is ignored."""
+        text = "Here is my analysis:\n" + json.dumps(DOCUMENT) + "\nLet me know if you need more."
+
+        assert parse_json_response(text) == DOCUMENT
+
+    def test_no_json_returns_none(self):
+        """Test that text without an object is rejected."""
+        assert parse_json_response("I cannot help with that.") is None
+
+    def test_agent_keeps_mostly_valid_response(self):
+        """Test that agents no longer fall back on truncated output."""
+        result = ResearchAgent().parse_response(
+            '{"market_overview": {"market_size": "$3B"}, "competitors": [{"name": "Acme"'
+        )
+
+        assert "error" not in result
+        assert result["market_overview"]["market_size"] == "$3B"
+        assert result["competitors"] == [{"name": "Acme"}]
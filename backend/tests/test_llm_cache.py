@@ -0,0 +1,96 @@
+"""
+Unit tests for the LLM response cache.
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.agents import ResearchAgent
+from app.llm.cache import ResponseCache
+from app.schemas import AgentInput
+
+
+@pytest.mark.unit
+class TestResponseCache:
+    """Test the memory and disk tiers."""
+
+    async def test_hit_and_miss_counts(self):
+        """Test that lookups are counted."""
+        cache = ResponseCache(max_entries=4)
+
+        assert await cache.get("key") is None
+        await cache.set("key", {"content": "{}"})
+        assert await cache.get("key") == {"content": "{}"}
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ResponseCache(max_entries=2)
+        await cache.set("a", {"content": "a"})
+        await cache.set("b", {"content": "b"})
+        await cache.get("a")
+        await cache.set("c", {"content": "c"})
+
+        assert await cache.get("b") is None
+        assert await cache.get("a") is not None
+
+    async def test_ttl_expiry(self):
+        """Test that expired entries are not served."""
+        cache = ResponseCache(ttl_seconds=0)
+        await cache.set("key", {"content": "{}"})
+
+        assert await cache.get("key") is None
+
+    async def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Test that the SQLite tier serves entries after a restart."""
+        path = str(tmp_path / "cache.sqlite")
+        await ResponseCache(persist_path=path).set("key", {"content": "{}"})
+
+        cache = ResponseCache(persist_path=path)
+        assert await cache.get("key") == {"content": "{}"}
+        assert cache.stats()["disk_hits"] == 1
+
+    def test_key_depends_on_sampling_params(self):
+        """Test that temperature and max_tokens change the key."""
+        base = ResponseCache.make_key("m", "sys", "task", None, 0.3, 1000)
+
+        assert base == ResponseCache.make_key("m", "sys", "task", None, 0.3, 1000)
+        assert base != ResponseCache.make_key("m", "sys", "task", None, 0.4, 1000)
+        assert base != ResponseCache.make_key("m", "sys", "task", None, 0.3, 2000)
+
+
+@pytest.mark.unit
+class TestAgentCaching:
+    """Test cache use inside BaseAgent.execute."""
+
+    async def test_repeat_prompt_skips_llm(self):
+        """Test that an identical prompt is served from cache."""
+        cache = ResponseCache()
+        agent = ResearchAgent()
+        agent._call_llm = AsyncMock(return_value=(json.dumps({"confidence": 0.8}), 120))
+        agent_input = AgentInput(task="Should I open a bakery in a small town?")
+
+        with patch('app.agents.base.get_response_cache', return_value=cache):
+            first = await agent.execute(agent_input)
+            second = await agent.execute(agent_input)
+
+        assert agent._call_llm.await_count == 1
+        assert not first.cached
+        assert second.cached
+        assert second.tokens_used == 0
+
+    async def test_bypass_calls_llm(self):
+        """Test that use_cache=False always calls the LLM."""
+        cache = ResponseCache()
+        agent = ResearchAgent()
+        agent._call_llm = AsyncMock(return_value=(json.dumps({"confidence": 0.8}), 120))
+        agent_input = AgentInput(task="Should I open a bakery in a small town?", use_cache=False)
+
+        with patch('app.agents.base.get_response_cache', return_value=cache):
+            await agent.execute(agent_input)
+            await agent.execute(agent_input)
+
+        assert agent._call_llm.await_count == 2
@@ -0,0 +1,63 @@
+"""
+Unit tests for the shared LLM client registry.
+"""
+import pytest
+
+from app.llm import clients
+from app.agents import ResearchAgent, DecisionAgent
+
+
+@pytest.fixture(autouse=True)
+def reset_registry():
+    """Start every test with an empty registry."""
+    clients._chat_models.clear()
+    clients._http_client = None
+    yield
+    clients._chat_models.clear()
+    clients._http_client = None
+
+
+@pytest.mark.unit
+class TestClientRegistry:
+    """Test client reuse and pooling."""
+
+    def test_same_key_returns_same_client(self):
+        """Test that identical keys share one client."""
+        first = clients.get_chat_model(model="test/model")
+        second = clients.get_chat_model(model="test/model")
+
+        assert first is second
+
+    def test_different_model_gets_new_client(self):
+        """Test that a different model is registered separately."""
+        first = clients.get_chat_model(model="test/model-a")
+        second = clients.get_chat_model(model="test/model-b")
+
+        assert first is not second
+        assert len(clients._chat_models) == 2
+
+    def test_clients_share_connection_pool(self):
+        """Test that all clients use the same HTTP connection pool."""
+        first = clients.get_chat_model(model="test/model-a")
+        second = clients.get_chat_model(model="test/model-b")
+
+        assert first.http_async_client is second.http_async_client
+        assert first.http_async_client is clients.get_http_client()
+
+    def test_agents_borrow_shared_client(self):
+        """Test that agents bind their params onto the shared client."""
+        research = ResearchAgent()
+        decision = DecisionAgent()
+
+        assert research.llm.bound is decision.llm.bound
+        assert research.llm.kwargs["max_tokens"] == 3000
+        assert decision.llm.kwargs["temperature"] == 0.5
+
+    async def test_close_clears_registry(self):
+        """Test that closing the pool drops registered clients."""
+        clients.get_chat_model(model="test/model")
+
+        await clients.close_llm_clients()
+
+        assert clients._chat_models == {}
+        assert clients._http_client is None
@@ -0,0 +1,163 @@
+"""
+Unit tests for LLM deadlines and request hedging.
+"""
+import asyncio
+import pytest
+
+from app.llm.hedging import Hedger, LatencyTracker, LLMTimeoutError
+
+
+def make_call(delays):
+    """Return a factory whose n-th attempt sleeps delays[n] and returns n."""
+    attempts = {"started": 0, "cancelled": 0}
+
+    async def call():
+        n = attempts["started"]
+        attempts["started"] += 1
+        try:
+            await asyncio.sleep(delays[n])
+        except asyncio.CancelledError:
+            attempts["cancelled"] += 1
+            raise
+        return n
+
+    return call, attempts
+
+
+@pytest.mark.unit
+class TestLatencyTracker:
+    """Test latency percentiles."""
+
+    def test_percentile_needs_min_samples(self):
+        """Test that no threshold is reported before enough samples."""
+        tracker = LatencyTracker()
+        tracker.record("agent", 1.0)
+
+        assert tracker.percentile("agent", 95, min_samples=2) is None
+
+    def test_percentile(self):
+        """Test nearest-rank percentile over the window."""
+        tracker = LatencyTracker(window=100)
+        for i in range(1, 101):
+            tracker.record("agent", float(i))
+
+        assert tracker.percentile("agent", 50) == 50.0
+        assert tracker.percentile("agent", 95) == 95.0
+
+
+@pytest.mark.unit
+class TestHedger:
+    """Test hedged calls."""
+
+    async def test_fast_call_is_not_hedged(self):
+        """Test that a call under the soft deadline runs once."""
+        hedger = Hedger()
+        call, attempts = make_call([0])
+
+        result = await hedger.call("agent", call, soft_deadline=1, hard_deadline=2)
+
+        assert result == 0
+        assert attempts["started"] == 1
+        assert hedger.stats()["agents"]["agent"]["hedged"] == 0
+
+    async def test_slow_call_is_hedged_and_loser_cancelled(self):
+        """Test that the hedge wins over a stalled primary."""
+        hedger = Hedger()
+        call, attempts = make_call([10, 0])
+        hedges = []
+
+        result = await hedger.call(
+            "agent", call, soft_deadline=0.02, hard_deadline=2,
+            on_hedge=lambda: hedges.append(1)
+        )
+
+        assert result == 1
+        assert attempts["cancelled"] == 1
+        assert hedges == [1]
+        stats = hedger.stats()["agents"]["agent"]
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+
+    async def test_hedge_uses_latency_percentile(self):
+        """Test that the hedge fires at the learned percentile, before the soft deadline."""
+        hedger = Hedger(min_samples=5)
+        for _ in range(5):
+            hedger.tracker.record("agent", 0.01)
+        call, attempts = make_call([10, 0])
+
+        result = await hedger.call("agent", call, soft_deadline=5, hard_deadline=1)
+
+        assert result == 1
+
+    async def test_hard_deadline(self):
+        """Test that the call is abandoned at the hard deadline."""
+        hedger = Hedger(enabled=False)
+        call, attempts = make_call([10])
+
+        with pytest.raises(LLMTimeoutError):
+            await hedger.call("agent", call, soft_deadline=0.01, hard_deadline=0.05)
+
+        assert attempts["cancelled"] == 1
+        assert hedger.stats()["agents"]["agent"]["timeouts"] == 1
+
+    async def test_invalid_response_waits_for_hedge(self):
+        """Test that an invalid first response does not win."""
+        hedger = Hedger()
+        call, _ = make_call([0.05, 0.06])
+
+        result = await hedger.call(
+            "agent", call, soft_deadline=0.01, hard_deadline=2,
+            validate=lambda n: n == 1
+        )
+
+        assert result == 1
+
+    async def test_stream_hedged_on_first_chunk(self):
+        """Test that only the first stream to produce a chunk is forwarded."""
+        hedger = Hedger()
+        started = []
+
+        async def stream():
+            n = len(started)
+            started.append(n)
+            await asyncio.sleep(10 if n == 0 else 0)
+            for part in ("a", "b"):
+                yield f"{n}{part}"
+
+        chunks = [chunk async for chunk in hedger.stream("agent", stream, soft_deadline=0.02)]
+
+        assert chunks == ["1a", "1b"]
+        assert hedger.stats()["agents"]["agent"]["hedge_wins"] == 1
+
+    async def test_empty_stream(self):
+        """Test that a stream without chunks ends cleanly."""
+        hedger = Hedger()
+
+        async def stream():
+            return
+            yield
+
+        chunks = [chunk async for chunk in hedger.stream("agent", stream, soft_deadline=1)]
+
+        assert chunks == []
+
+    async def test_stream_latency_tracked_apart_from_calls(self):
+        """Test that slow whole calls do not delay the hedge of a stream's first chunk."""
+        hedger = Hedger(min_samples=5)
+        for _ in range(5):
+            hedger.tracker.record("agent", 30.0)
+            hedger.tracker.record("agent:ttfb", 0.01)
+        started = []
+
+        async def stream():
+            n = len(started)
+            started.append(n)
+            await asyncio.sleep(10 if n == 0 else 0)
+            yield n
+
+        chunks = [chunk async for chunk in hedger.stream("agent", stream, soft_deadline=5)]
+
+        assert chunks == [1]
+        stats = hedger.stats()["agents"]["agent"]
+        assert stats["p50_ms"] == 30000
+        assert stats["first_chunk_p50_ms"] == 10
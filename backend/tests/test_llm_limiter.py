@@ -0,0 +1,93 @@
+"""
+Unit tests for the LLM rate limiter.
+"""
+import asyncio
+import pytest
+
+from app.llm.limiter import RateLimiter, TokenBucket
+
+
+@pytest.mark.unit
+class TestTokenBucket:
+    """Test bucket accounting."""
+
+    def test_empty_bucket_reports_wait(self):
+        """Test that a drained bucket needs time to refill."""
+        bucket = TokenBucket(per_minute=60)
+        bucket.consume(60)
+
+        assert bucket.wait_time(1) == pytest.approx(1.0, abs=0.05)
+
+    def test_unlimited_bucket_never_waits(self):
+        """Test that a zero limit disables the bucket."""
+        bucket = TokenBucket(per_minute=0)
+        bucket.consume(10 ** 6)
+
+        assert bucket.wait_time(10 ** 6) == 0
+
+    def test_adjust_refunds_overestimate(self):
+        """Test that unused estimated tokens are returned."""
+        bucket = TokenBucket(per_minute=1000)
+        bucket.consume(800)
+        bucket.adjust(500)
+
+        assert bucket.wait_time(600) == 0
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Test admission control."""
+
+    async def test_concurrency_cap(self):
+        """Test that in-flight calls never exceed the cap."""
+        limiter = RateLimiter(max_concurrent=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter.acquire("model", 10):
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*(call() for _ in range(6)))
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+        assert limiter.stats()["admitted"] == 6
+
+    async def test_fifo_admission(self):
+        """Test that queued callers are admitted in arrival order."""
+        limiter = RateLimiter(max_concurrent=1)
+        order = []
+
+        async def call(i):
+            async with limiter.acquire("model", 10):
+                order.append(i)
+                await asyncio.sleep(0.001)
+
+        await asyncio.gather(*(call(i) for i in range(5)))
+
+        assert order == [0, 1, 2, 3, 4]
+
+    async def test_requests_per_minute_throttles(self):
+        """Test that exceeding the request budget waits for refill."""
+        limiter = RateLimiter(requests_per_minute=600, max_concurrent=10)
+        limiter._requests_bucket("model").consume(600)
+
+        start = asyncio.get_running_loop().time()
+        async with limiter.acquire("model", 10):
+            pass
+
+        assert asyncio.get_running_loop().time() - start >= 0.09
+        assert limiter.stats()["throttled"] >= 1
+
+    async def test_slot_released_on_error(self):
+        """Test that a failing call frees its slot."""
+        limiter = RateLimiter(max_concurrent=1)
+
+        with pytest.raises(RuntimeError):
+            async with limiter.acquire("model", 10):
+                raise RuntimeError("provider error")
+
+        async with limiter.acquire("model", 10):
+            assert limiter.in_flight == 1
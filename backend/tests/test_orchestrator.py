@@ -0,0 +1,325 @@
+"""
+Unit tests for the agent orchestrator.
+"""
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import patch
+from uuid import uuid4
+
+from app.agents import AgentOrchestrator
+from app.schemas import AnalysisStatus
+from tests.test_base_agent import FakeLLM
+
+
+AGENT_RESPONSES = {
+    "Research Agent": {"market_overview": {"market_size": "$2B"}, "competitors": [], "confidence": 0.8},
+    "Analysis Agent": {"market_viability": {"score": 0.7}, "overall_analysis_score": 0.7, "confidence": 0.8},
+    "Risk Agent": {"risks": [], "risk_matrix_summary": {}, "overall_risk_score": 0.4, "confidence": 0.7},
+    "Decision Agent": {"verdict": "GO", "summary": "Proceed", "key_factors": [], "confidence": 0.8},
+}
+
+PROBLEM = "Should I launch a subscription box for specialty coffee?"
+
+
+@pytest.fixture
+def orchestrator():
+    """Orchestrator whose agents answer with canned JSON."""
+    orch = AgentOrchestrator(uuid4())
+    for agent in orch.agents.values():
+        agent.llm = FakeLLM(json.dumps(AGENT_RESPONSES[agent.name]))
+    return orch
+
+
+def stored_outputs():
+    """Phase outputs as kept with a completed analysis record."""
+    return {
+        name: {
+            "agent_name": name,
+            "result": result,
+            "reasoning": "stored",
+            "confidence": 0.8,
+            "tools_used": [],
+            "tokens_used": 500,
+            "duration_ms": 9000,
+        }
+        for name, result in AGENT_RESPONSES.items()
+    }
+
+
+def stored_memory(distance=0.05, age_seconds=60):
+    """A memory entry as written by _store_insights."""
+    return {
+        "id": "mem-1",
+        "text": "Problem: coffee subscription",
+        "distance": distance,
+        "metadata": {
+            "category": "analysis_result",
+            "analysis_id": "previous-analysis",
+            "verdict": "GO",
+            "confidence": 0.8,
+            "summary": "Proceed",
+            "created_at": time.time() - age_seconds,
+        },
+    }
+
+
+def llm_calls(orch):
+    return sum(agent.llm.calls for agent in orch.agents.values())
+
+
+@pytest.mark.unit
+class TestAnalysisReuse:
+    """Test the near-duplicate reuse fast path."""
+
+    async def run(self, orch, memories, context):
+        async def load_outputs(analysis_id):
+            assert analysis_id == "previous-analysis"
+            return stored_outputs()
+
+        with patch('app.agents.orchestrator.search_similar_memories', return_value=memories), \
+             patch('app.agents.orchestrator.add_memory'):
+            return await orch.execute(PROBLEM, {"bypass_cache": True, **context}, load_outputs=load_outputs)
+
+    async def test_full_reuse_skips_pipeline(self, orchestrator):
+        """Test that a close, recent match is served without LLM calls."""
+        result = await self.run(orchestrator, [stored_memory()], {"allow_reuse": True})
+
+        assert llm_calls(orchestrator) == 0
+        assert result["status"] == AnalysisStatus.COMPLETED
+        assert result["reused_from"]["analysis_id"] == "previous-analysis"
+        assert result["decision"].verdict == "GO"
+        assert result["tokens_used"] == 0
+
+    async def test_research_only_reuse(self, orchestrator):
+        """Test that research mode re-runs every phase but research."""
+        with patch('app.agents.orchestrator.settings.ANALYSIS_REUSE_MODE', "research"):
+            result = await self.run(orchestrator, [stored_memory()], {"allow_reuse": True})
+
+        assert orchestrator.agents["research"].llm.calls == 0
+        assert llm_calls(orchestrator) == 3
+        assert result["reused_from"]["phases"] == ["research"]
+
+    async def test_distant_match_runs_pipeline(self, orchestrator):
+        """Test that matches beyond the distance threshold are ignored."""
+        result = await self.run(orchestrator, [stored_memory(distance=0.9)], {"allow_reuse": True})
+
+        assert llm_calls(orchestrator) == 4
+        assert result["reused_from"] is None
+
+    async def test_stale_match_runs_pipeline(self, orchestrator):
+        """Test that matches older than the age limit are ignored."""
+        result = await self.run(orchestrator, [stored_memory(age_seconds=10 ** 7)], {"allow_reuse": True})
+
+        assert llm_calls(orchestrator) == 4
+
+    async def test_insight_metadata_stays_small(self, orchestrator):
+        """Test that memories keep only what the fast path reads, not the phase outputs."""
+        with patch('app.agents.orchestrator.search_similar_memories', return_value=[]), \
+             patch('app.agents.orchestrator.add_memory') as mock_add:
+            await orchestrator.execute(PROBLEM, {"bypass_cache": True})
+
+        metadata = mock_add.call_args.kwargs["metadata"]
+        assert set(metadata) == {"type", "analysis_id", "verdict", "confidence", "summary", "category", "created_at"}
+        assert metadata["summary"] == "Proceed"
+
+    async def test_reuse_is_opt_in(self, orchestrator):
+        """Test that reuse is off unless requested."""
+        result = await self.run(orchestrator, [stored_memory()], {})
+
+        assert llm_calls(orchestrator) == 4
+        assert result["reused_from"] is None
+
+
+@pytest.mark.unit
+class TestOrchestratorEvents:
+    """Test event delivery to subscribers."""
+
+    async def test_subscriber_receives_tokens(self, orchestrator):
+        """Test that streamed tokens are published per agent."""
+        queue = orchestrator.subscribe()
+
+        await orchestrator._execute_agent("research", PROBLEM, {"bypass_cache": True}, None)
+
+        events = []
+        while not queue.empty():
+            event = queue.get_nowait()
+            if event["type"] == "token":
+                events.append(event)
+        assert events
+        assert all(e["data"]["agent"] == "Research Agent" for e in events)
+        assert "".join(e["data"]["text"] for e in events) == json.dumps(AGENT_RESPONSES["Research Agent"])
+
+    def test_unsubscribe_stops_delivery(self, orchestrator):
+        """Test that unsubscribed queues receive nothing."""
+        queue = orchestrator.subscribe()
+        orchestrator.unsubscribe(queue)
+
+        orchestrator._emit("token", {"text": "x"})
+
+        assert queue.empty()
+
+    async def test_subscriber_receives_completed_fields(self, orchestrator):
+        """Test that top-level fields are published as they close."""
+        queue = orchestrator.subscribe()
+
+        await orchestrator._execute_agent("research", PROBLEM, {"bypass_cache": True}, None)
+
+        fields = []
+        while not queue.empty():
+            event = queue.get_nowait()
+            if event["type"] == "field":
+                fields.append(event["data"]["field"])
+        assert fields == list(AGENT_RESPONSES["Research Agent"])
+
+
+class FailingLLM(FakeLLM):
+    """Fake chat model that errors on every call."""
+
+    async def astream(self, messages, **kwargs):
+        self.calls += 1
+        raise RuntimeError("provider unavailable")
+        yield
+
+
+@pytest.mark.unit
+class TestCheckpointing:
+    """Test per-phase checkpoints and resume."""
+
+    async def run(self, orch, **kwargs):
+        with patch('app.agents.orchestrator.search_similar_memories', return_value=[]), \
+             patch('app.agents.orchestrator.add_memory'):
+            return await orch.execute(PROBLEM, {"bypass_cache": True}, **kwargs)
+
+    async def test_failed_phase_keeps_earlier_checkpoints(self, orchestrator):
+        """Test that phases finished before a failure are checkpointed."""
+        from app.agents import PhaseFailedError
+
+        orchestrator.agents["decision"].llm = FailingLLM("")
+        saved = {}
+
+        async def on_checkpoint(agent_name, output):
+            saved[agent_name] = output.model_dump(mode="json")
+
+        with pytest.raises(PhaseFailedError):
+            await self.run(orchestrator, on_checkpoint=on_checkpoint)
+
+        assert orchestrator.status == AnalysisStatus.FAILED
+        assert set(saved) == {"Research Agent", "Analysis Agent", "Risk Agent"}
+
+    async def test_unparseable_completion_is_not_fatal(self, orchestrator):
+        """Test that a malformed completion continues with the fallback result."""
+        orchestrator.agents["research"].llm = FakeLLM("not json at all")
+
+        result = await self.run(orchestrator)
+
+        assert result["status"] == AnalysisStatus.COMPLETED
+        assert "error" in orchestrator.agent_outputs["Research Agent"].result
+        assert not orchestrator.agent_outputs["Research Agent"].failed
+
+    async def test_resume_runs_only_missing_phases(self, orchestrator):
+        """Test that checkpointed phases are restored instead of re-run."""
+        checkpoints = {
+            name: {
+                "agent_name": name,
+                "result": AGENT_RESPONSES[name],
+                "reasoning": "checkpointed",
+                "confidence": 0.8,
+                "tokens_used": 100,
+                "duration_ms": 1000,
+            }
+            for name in ("Research Agent", "Analysis Agent", "Risk Agent")
+        }
+
+        result = await self.run(orchestrator, checkpoints=checkpoints)
+
+        assert llm_calls(orchestrator) == 1
+        assert orchestrator.agents["decision"].llm.calls == 1
+        assert result["status"] == AnalysisStatus.COMPLETED
+        assert result["resumed_phases"] == ["research", "analyst", "risk"]
+        assert result["decision"].verdict == "GO"
+
+
+class SlowLLM(FakeLLM):
+    """Fake chat model that takes ``delay`` seconds and records call kwargs."""
+
+    def __init__(self, text, delay=0.0):
+        super().__init__(text)
+        self.delay = delay
+        self.kwargs = []
+
+    async def astream(self, messages, **kwargs):
+        self.kwargs.append(kwargs)
+        await asyncio.sleep(self.delay)
+        async for chunk in super().astream(messages, **kwargs):
+            yield chunk
+
+
+@pytest.mark.unit
+class TestLatencyBudget:
+    """Test degraded execution under preferences.deadline_ms."""
+
+    async def run(self, orch, deadline_ms, fuse_below_ms=0):
+        from app.agents import budget
+
+        with patch('app.agents.orchestrator.search_similar_memories', return_value=[]) as mock_search, \
+             patch('app.agents.orchestrator.add_memory') as mock_add, \
+             patch.object(budget.settings, "DEADLINE_FUSE_BELOW_MS", fuse_below_ms):
+            result = await orch.execute(PROBLEM, {"bypass_cache": True, "deadline_ms": deadline_ms})
+        return result, mock_search, mock_add
+
+    async def test_no_deadline_is_not_degraded(self, orchestrator):
+        """Test that runs without a budget report no degradation."""
+        with patch('app.agents.orchestrator.search_similar_memories', return_value=[]), \
+             patch('app.agents.orchestrator.add_memory'):
+            result = await orchestrator.execute(PROBLEM, {"bypass_cache": True})
+
+        assert result["degraded"] is False
+        assert result["degradations"] == []
+
+    async def test_tight_budget_caps_tokens_and_skips_memory(self, orchestrator):
+        """Test that completions are capped to the time left."""
+        for agent in orchestrator.agents.values():
+            agent.llm = SlowLLM(json.dumps(AGENT_RESPONSES[agent.name]))
+
+        result, mock_search, mock_add = await self.run(orchestrator, deadline_ms=20000)
+
+        mock_search.assert_not_called()
+        mock_add.assert_not_called()
+        assert result["degraded"] is True
+        assert "Skipped memory retrieval" in result["degradations"]
+        research_kwargs = orchestrator.agents["research"].llm.kwargs[0]
+        assert research_kwargs["max_tokens"] < orchestrator.agents["research"].config.max_tokens
+        assert result["decision"].verdict == "GO"
+
+    async def test_slow_phase_is_cut_off(self, orchestrator):
+        """Test that the decision still runs when an upstream phase overruns."""
+        orchestrator.agents["risk"].llm = SlowLLM(json.dumps(AGENT_RESPONSES["Risk Agent"]), delay=5)
+
+        result, _, _ = await self.run(orchestrator, deadline_ms=300)
+
+        assert result["status"] == AnalysisStatus.COMPLETED
+        assert "Out of time before Risk Agent finished" in result["degradations"]
+        assert "Risk Agent" not in result["agent_outputs"]
+        assert result["decision"].verdict == "GO"
+
+    async def test_short_budget_fuses_phases(self, orchestrator):
+        """Test that very short budgets go straight to the decision."""
+        result, _, _ = await self.run(orchestrator, deadline_ms=5000, fuse_below_ms=10000)
+
+        assert llm_calls(orchestrator) == 1
+        assert orchestrator.agents["decision"].llm.calls == 1
+        assert any(item.startswith("Fused phases") for item in result["degradations"])
+
+    async def test_best_effort_decision_from_completed_phases(self, orchestrator):
+        """Test that an overrunning decision is replaced by a derived one."""
+        orchestrator.agents["decision"].llm = SlowLLM(json.dumps(AGENT_RESPONSES["Decision Agent"]), delay=5)
+
+        result, _, _ = await self.run(orchestrator, deadline_ms=300)
+
+        assert result["status"] == AnalysisStatus.COMPLETED
+        assert result["decision"].verdict == "GO"
+        assert result["decision"].confidence_score == 0.4
+        assert result["agent_outputs"]["Decision Agent"]["best_effort"] is True
+        assert "Returned a best-effort decision from completed phases" in result["degradations"]
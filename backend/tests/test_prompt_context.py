@@ -0,0 +1,78 @@
+"""
+Unit tests for compact prompt context building.
+"""
+import json
+import pytest
+
+from app.agents import DecisionAgent, AnalystAgent
+from app.agents.prompt_context import PromptContextBuilder, estimate_tokens, fit_to_budget
+from app.schemas import AgentInput
+
+
+RESEARCH = {
+    "market_overview": {"market_size": "$4B", "key_trends": ["remote work", "automation"]},
+    "competitors": [{"name": f"Competitor {i}", "description": "x" * 300} for i in range(10)],
+    "target_market": {"demographics": "SMBs"},
+    "data_sources": ["report a", "report b"],
+    "raw_response": "not needed",
+    "confidence": 0.8,
+}
+
+
+@pytest.mark.unit
+class TestPromptContextBuilder:
+    """Test digest building for downstream agents."""
+
+    def test_digest_is_minified_and_pruned(self):
+        """Test that digests drop whitespace and unrequested fields."""
+        builder = PromptContextBuilder(token_budget=10000)
+        digests = builder.build(DecisionAgent(), {"Research Agent": RESEARCH})
+
+        digest = digests["Research Agent"]
+        assert "\n" not in digest and ": " not in digest
+        parsed = json.loads(digest)
+        assert "target_market" not in parsed
+        assert "data_sources" not in parsed
+        assert "raw_response" not in parsed
+        assert parsed["market_overview"]["market_size"] == "$4B"
+
+    def test_all_fields_kept_when_not_listed(self):
+        """Test that inputs without a field list keep every field but raw_response."""
+        builder = PromptContextBuilder(token_budget=10000)
+        parsed = json.loads(builder.build(AnalystAgent(), {"Research Agent": RESEARCH})["Research Agent"])
+
+        assert set(parsed) == set(RESEARCH) - {"raw_response"}
+
+    def test_digest_is_memoized(self):
+        """Test that the same output is serialized once per selection."""
+        builder = PromptContextBuilder(token_budget=10000)
+        agent = DecisionAgent()
+
+        first = builder.build(agent, {"Research Agent": RESEARCH})["Research Agent"]
+        second = builder.build(agent, {"Research Agent": RESEARCH})["Research Agent"]
+
+        assert first is second
+
+    def test_budget_is_enforced(self):
+        """Test that oversized outputs are shrunk to the budget."""
+        text = fit_to_budget(RESEARCH, token_budget=200)
+
+        assert estimate_tokens(text) <= 200
+        assert json.loads(text)["market_overview"]["market_size"] == "$4B"
+
+    def test_tokens_saved_is_tracked(self):
+        """Test that savings against indented JSON are recorded."""
+        builder = PromptContextBuilder(token_budget=10000)
+        builder.build(DecisionAgent(), {"Research Agent": RESEARCH})
+
+        assert builder.tokens_saved > 0
+
+    def test_format_task_uses_prepared_digest(self):
+        """Test that agents embed the orchestrator's digest."""
+        agent_input = AgentInput(
+            task="Should we build an AI scheduling assistant?",
+            previous_outputs={"Research Agent": RESEARCH},
+            prompt_context={"Research Agent": '{"digest":true}'}
+        )
+
+        assert '{"digest":true}' in AnalystAgent().format_task(agent_input)
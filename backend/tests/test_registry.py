@@ -0,0 +1,154 @@
+"""
+Unit tests for the bounded analysis registries.
+"""
+import time
+import pytest
+
+from app.api.registry import BoundedRegistry, IndexedRegistry, SortedIndex, SpillStore, estimate_size
+
+
+def finished(value):
+    return value["status"] == "completed"
+
+
+@pytest.mark.unit
+class TestBoundedRegistry:
+    """Test eviction policies."""
+
+    def test_lru_eviction_by_count(self):
+        """Test that the least recently used finished entry goes first."""
+        registry = BoundedRegistry("test", max_entries=2, is_finished=finished)
+        registry["a"] = {"status": "completed"}
+        registry["b"] = {"status": "completed"}
+        registry["a"]  # Touch a so b becomes the LRU entry
+        registry["c"] = {"status": "completed"}
+
+        assert set(registry) == {"a", "c"}
+        assert registry.stats()["evicted"] == 1
+
+    def test_running_entries_are_kept(self):
+        """Test that unfinished entries survive the budget."""
+        registry = BoundedRegistry("test", max_entries=1, is_finished=finished)
+        registry["a"] = {"status": "researching"}
+        registry["b"] = {"status": "researching"}
+
+        assert set(registry) == {"a", "b"}
+
+    def test_memory_budget(self):
+        """Test eviction once the approximate byte budget is exceeded."""
+        registry = BoundedRegistry(
+            "test", max_bytes=150, is_finished=finished, sizeof=estimate_size
+        )
+        registry["a"] = {"status": "completed", "result": "x" * 100}
+        registry["b"] = {"status": "completed", "result": "y" * 100}
+
+        assert list(registry) == ["b"]
+        assert registry.total_bytes == estimate_size(registry["b"])
+
+    def test_ttl_expires_finished_entries(self):
+        """Test that idle finished entries expire after the TTL."""
+        registry = BoundedRegistry("test", ttl_seconds=0.01, is_finished=finished)
+        registry["a"] = {"status": "completed"}
+        registry["b"] = {"status": "researching"}
+        time.sleep(0.02)
+
+        registry.sweep()
+
+        assert list(registry) == ["b"]
+        assert registry.stats()["expired"] == 1
+
+    def test_touch_remeasures_mutated_entry(self):
+        """Test that an entry finished in place becomes evictable."""
+        registry = BoundedRegistry("test", max_entries=1, is_finished=finished)
+        registry["a"] = {"status": "researching"}
+        registry["b"] = {"status": "researching"}
+
+        registry["a"]["status"] = "completed"
+        registry.touch("b")
+
+        assert list(registry) == ["b"]
+
+    def test_spill_and_reload(self, tmp_path):
+        """Test that evicted entries are spilled and loaded back on access."""
+        spill = SpillStore(str(tmp_path / "spill.sqlite"))
+        registry = BoundedRegistry("test", max_entries=1, is_finished=finished, spill=spill)
+        registry["a"] = {"status": "completed", "n": 1}
+        registry["b"] = {"status": "completed", "n": 2}
+
+        assert "a" in registry
+        assert len(registry) == 2
+        assert sorted(v["n"] for v in registry.values()) == [1, 2]
+        assert registry["a"] == {"status": "completed", "n": 1}
+        assert registry.stats()["reloaded"] == 1
+        # Reloading a evicted b in turn
+        assert spill.keys() == ["b"]
+
+    def test_delete_removes_spilled_entry(self, tmp_path):
+        """Test that deleting a spilled key removes it from the store."""
+        spill = SpillStore(str(tmp_path / "spill.sqlite"))
+        registry = BoundedRegistry("test", max_entries=1, is_finished=finished, spill=spill)
+        registry["a"] = {"status": "completed"}
+        registry["b"] = {"status": "completed"}
+
+        del registry["a"]
+
+        assert "a" not in registry
+        with pytest.raises(KeyError):
+            registry["a"]
+
+
+def indexed(**kwargs):
+    return IndexedRegistry(
+        "test",
+        sort_key=lambda value: value["created_at"],
+        bucket=lambda value: value["status"],
+        is_finished=finished,
+        **kwargs
+    )
+
+
+@pytest.mark.unit
+class TestIndexedRegistry:
+    """Test the sorted index over registry entries."""
+
+    def test_pages_newest_first(self):
+        """Test offset and keyset pages, overall and per bucket."""
+        index = SortedIndex()
+        for n in range(5):
+            index.add(f"k{n}", n, "completed" if n % 2 else "pending")
+
+        assert index.page(limit=2) == (["k4", "k3"], True)
+        assert index.page(offset=3, limit=2) == (["k1", "k0"], False)
+        assert index.page(before=(3, "k3"), limit=2) == (["k2", "k1"], True)
+        assert index.page("completed") == (["k3", "k1"], False)
+        assert index.counts() == {"completed": 2, "pending": 3}
+
+    def test_touch_moves_between_buckets(self):
+        """Test that a status change applied in place re-indexes the entry."""
+        registry = indexed()
+        registry["a"] = {"status": "researching", "created_at": "2024-01-01"}
+        registry["a"]["status"] = "completed"
+        registry.touch("a")
+
+        assert registry.index.page("completed") == (["a"], False)
+        assert registry.index.count("researching") == 0
+
+    def test_eviction_and_spill(self, tmp_path):
+        """Test that evicted entries leave the index unless spilled."""
+        registry = indexed(max_entries=1)
+        registry["a"] = {"status": "completed", "created_at": "2024-01-01"}
+        registry["b"] = {"status": "completed", "created_at": "2024-01-02"}
+        assert registry.index.page() == (["b"], False)
+
+        spill = SpillStore(str(tmp_path / "spill.sqlite"))
+        registry = indexed(max_entries=1, spill=spill)
+        registry["a"] = {"status": "completed", "created_at": "2024-01-01"}
+        registry["b"] = {"status": "completed", "created_at": "2024-01-02"}
+        assert registry.index.page() == (["b", "a"], False)
+        assert registry.peek("a") == {"status": "completed", "created_at": "2024-01-01"}
+        assert spill.keys() == ["a"]
+
+        # A new process indexes what was spilled before
+        assert indexed(spill=spill).index.page() == (["a"], False)
+        del registry["a"]
+        assert registry.index.page() == (["b"], False)
@@ -0,0 +1,148 @@
+"""
+Unit tests for the agent pipeline scheduler.
+"""
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from app.agents import AgentOrchestrator, DAGScheduler, PipelineNode
+from app.schemas import AnalysisStatus
+
+
+def make_node(key, depends_on=None):
+    """Build a pipeline node around a stub agent."""
+    agent = MagicMock()
+    agent.name = key
+    return PipelineNode(
+        key=key,
+        agent=agent,
+        status=AnalysisStatus.ANALYZING,
+        depends_on=depends_on or []
+    )
+
+
+@pytest.mark.unit
+class TestDAGScheduler:
+    """Test dependency-ordered execution."""
+
+    async def test_independent_nodes_run_concurrently(self):
+        """Test that nodes sharing a dependency overlap in time."""
+        nodes = [
+            make_node("research"),
+            make_node("analyst", ["research"]),
+            make_node("prescreen", ["research"]),
+            make_node("decision", ["analyst", "prescreen"]),
+        ]
+        running = set()
+        overlaps = []
+
+        async def run_node(node):
+            running.add(node.key)
+            overlaps.append(set(running))
+            await asyncio.sleep(0.01)
+            running.discard(node.key)
+            return node.key
+
+        results = await DAGScheduler(nodes).run(run_node)
+
+        assert set(results) == {"research", "analyst", "prescreen", "decision"}
+        assert {"analyst", "prescreen"} in overlaps
+
+    async def test_dependencies_finish_first(self):
+        """Test that a node only starts after its dependencies."""
+        nodes = [make_node("a"), make_node("b", ["a"]), make_node("c", ["b"])]
+        order = []
+
+        async def run_node(node):
+            order.append(node.key)
+
+        await DAGScheduler(nodes).run(run_node)
+
+        assert order == ["a", "b", "c"]
+
+    async def test_completed_nodes_are_skipped(self):
+        """Test that already-completed nodes are not re-run."""
+        nodes = [make_node("a"), make_node("b", ["a"])]
+        ran = []
+
+        async def run_node(node):
+            ran.append(node.key)
+
+        await DAGScheduler(nodes).run(run_node, completed=["a"])
+
+        assert ran == ["b"]
+
+    async def test_failure_cancels_running_nodes(self):
+        """Test that one failing node cancels its siblings."""
+        nodes = [make_node("slow"), make_node("broken")]
+        cancelled = asyncio.Event()
+
+        async def run_node(node):
+            if node.key == "broken":
+                raise RuntimeError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(RuntimeError):
+            await DAGScheduler(nodes).run(run_node)
+
+        assert cancelled.is_set()
+
+    async def test_deadline_returns_finished_nodes(self):
+        """Test that a deadline cancels stragglers and reports partial results."""
+        from app.agents.scheduler import DeadlineExceeded
+
+        nodes = [make_node("fast"), make_node("slow"), make_node("after", ["slow"])]
+
+        async def run_node(node):
+            if node.key == "slow":
+                await asyncio.sleep(10)
+            return node.key
+
+        deadline = asyncio.get_running_loop().time() + 0.05
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            await DAGScheduler(nodes).run(run_node, deadline=deadline)
+
+        assert exc_info.value.results == {"fast": "fast"}
+        assert exc_info.value.pending == ["after", "slow"]
+
+    async def test_only_runs_selected_nodes(self):
+        """Test that nodes outside ``only`` are left alone."""
+        nodes = [make_node("a"), make_node("b", ["a"]), make_node("c", ["b"])]
+
+        async def run_node(node):
+            return node.key
+
+        results = await DAGScheduler(nodes).run(run_node, only=["a", "b"])
+
+        assert set(results) == {"a", "b"}
+
+    def test_cycle_is_rejected(self):
+        """Test that cyclic pipelines fail validation."""
+        with pytest.raises(ValueError):
+            DAGScheduler([make_node("a", ["b"]), make_node("b", ["a"])])
+
+    def test_unknown_dependency_is_rejected(self):
+        """Test that dependencies on missing nodes fail validation."""
+        with pytest.raises(ValueError):
+            DAGScheduler([make_node("a", ["missing"])])
+
+
+@pytest.mark.unit
+class TestDefaultPipeline:
+    """Test the graph derived from agent input declarations."""
+
+    def test_default_pipeline_dependencies(self):
+        """Test that declared inputs become graph edges."""
+        orchestrator = AgentOrchestrator(uuid4())
+        deps = {node.key: node.depends_on for node in orchestrator.pipeline}
+
+        assert deps["research"] == []
+        assert deps["analyst"] == ["research"]
+        assert deps["risk"] == ["research", "analyst"]
+        assert deps["decision"] == ["research", "analyst", "risk"]
+        assert orchestrator.scheduler.topological_order() == ["research", "analyst", "risk", "decision"]
@@ -0,0 +1,110 @@
+"""
+Unit tests for the WebSocket progress channel.
+"""
+import pytest
+from uuid import uuid4
+
+
+@pytest.mark.unit
+class TestUpdatesChannel:
+    """Test subscriptions and batched frames on the updates WebSocket."""
+
+    async def test_tenant_feed_receives_new_analyses(self, event_bus, sample_analysis_request):
+        """Test that the tenant feed only carries the tenant's own analyses."""
+        import asyncio
+        from app.api.routes import analysis, updates
+        from app.schemas import AnalysisRequest
+
+        class FakeWebSocket:
+            def __init__(self):
+                self.frames = asyncio.Queue()
+
+            async def send_json(self, data):
+                await self.frames.put(data)
+
+        ws = FakeWebSocket()
+        subscription = event_bus.subscribe(analysis_ids=[], event_types=updates.UPDATE_EVENTS)
+        ack = await updates._handle_message('{"action": "subscribe", "feed": "tenant"}', subscription, "acme")
+        sender = asyncio.create_task(updates._send_batches(ws, subscription, asyncio.Lock()))
+        try:
+            other_id = str(uuid4())
+            for analysis_id, client_id in ((other_id, "other"), (str(uuid4()), "acme"), (str(uuid4()), "acme")):
+                request = analysis._with_scheduling(AnalysisRequest(**sample_analysis_request), None, client_id)
+                await analysis._create_analysis_record(analysis_id, request, analysis.datetime.now())
+            frame = await asyncio.wait_for(ws.frames.get(), timeout=1)
+        finally:
+            sender.cancel()
+            subscription.close()
+
+        assert ack == {"type": "subscribed", "analysis_ids": [], "tenant": "acme", "unknown": []}
+        assert frame["type"] == "updates"
+        assert [u["event"] for u in frame["updates"]] == ["status", "status"]
+        assert other_id not in [u["analysis_id"] for u in frame["updates"]]
+        assert frame["updates"][0]["data"]["status"] == "pending"
+
+    def test_subscribe_and_unsubscribe_analyses(self, client, sample_analysis_request):
+        """Test that subscribing sends current statuses and reports unknown IDs."""
+        analysis_id = client.post("/api/v1/analysis", json=sample_analysis_request).json()["id"]
+        missing = str(uuid4())
+
+        with client.websocket_connect("/api/v1/updates/ws") as ws:
+            ws.send_json({"action": "subscribe", "analysis_ids": [analysis_id, missing]})
+            ack = ws.receive_json()
+            frame = ws.receive_json()
+            ws.send_json({"action": "unsubscribe", "analysis_ids": [analysis_id]})
+            unsubscribed = ws.receive_json()
+
+        assert (ack["analysis_ids"], ack["unknown"]) == ([analysis_id], [missing])
+        assert frame["updates"][0]["analysis_id"] == analysis_id
+        assert frame["updates"][0]["data"]["status"] == "pending"
+        assert unsubscribed["analysis_ids"] == []
+
+    def test_invalid_message(self, client):
+        """Test that malformed messages get an error frame and keep the connection."""
+        with client.websocket_connect("/api/v1/updates/ws") as ws:
+            ws.send_text("not json")
+            assert ws.receive_json()["type"] == "error"
+            ws.send_json({"action": "subscribe", "feed": "everything"})
+            assert ws.receive_json()["detail"] == "The only feed is 'tenant'"
+
+    def test_batches_keep_latest_status(self):
+        """Test that a frame keeps one status per analysis and every step."""
+        from app.api.routes.updates import _coalesce
+
+        def status(analysis_id, value, progress):
+            return {"id": None, "analysis_id": analysis_id, "type": "status", "data": {
+                "status": value, "progress_percentage": progress, "completed_steps": 0
+            }}
+
+        a, b = str(uuid4()), str(uuid4())
+        updates = _coalesce([
+            status(a, "researching", 10),
+            {"id": "2", "analysis_id": a, "type": "step", "data": {"agent_name": "Research Agent"}},
+            status(b, "researching", 10),
+            status(a, "analyzing", 40),
+        ])
+
+        assert [(u["analysis_id"], u["event"]) for u in updates] == [(a, "step"), (b, "status"), (a, "status")]
+        assert updates[-1]["data"]["progress_percentage"] == 40
+
+    async def test_tokens_do_not_fill_the_queue(self, event_bus):
+        """Test that token events never reach the subscription, so status events are not dropped."""
+        from app.api.routes.updates import UPDATE_EVENTS
+
+        analysis_id = str(uuid4())
+        subscription = event_bus.subscribe([analysis_id], max_queued=2, event_types=UPDATE_EVENTS)
+        for _ in range(5):
+            await event_bus.publish(analysis_id, "token", {"text": "x"})
+        await event_bus.publish(analysis_id, "status", {"status": "analyzing"})
+
+        assert (await subscription.get(timeout=0.1))["type"] == "status"
+        assert subscription.dropped == 0
+
+    def test_tenant_comes_from_header(self, client):
+        """Test that the tenant feed uses the X-Client-ID header, not the query string."""
+        with client.websocket_connect("/api/v1/updates/ws?client_id=other", headers={"X-Client-ID": "acme"}) as ws:
+            ws.send_json({"action": "subscribe", "feed": "tenant"})
+            assert ws.receive_json()["tenant"] == "acme"
+        with client.websocket_connect("/api/v1/updates/ws?client_id=other") as ws:
+            ws.send_json({"action": "subscribe", "feed": "tenant"})
+            assert ws.receive_json()["tenant"] == "anonymous"
@@ -11,7 +11,7 @@ import ResultCard from '@/components/analysis/ResultCard';
 import ReasoningTimeline from '@/components/analysis/ReasoningTimeline';
 import FeedbackPanel from '@/components/feedback/FeedbackPanel';
 import { analysisApi } from '@/lib/api';
-import { formatDate, formatDuration } from '@/lib/utils';
+import { formatDate, formatDuration, isTerminalStatus } from '@/lib/utils';
 import type { AnalysisResponse, AnalysisStatusResponse, AnalysisStatus } from '@/types';
 
 interface AnalysisResultPageProps {
@@ -37,21 +37,24 @@ export default function AnalysisResultPage({ params }: AnalysisResultPageProps)
                 const data = await analysisApi.get(id);
 
                 // Check if this is a terminal state
-                if (data.status === 'completed' || data.status === 'failed') {
+                if (isTerminalStatus(data.status)) {
                     isTerminalState.current = true;
                 }
 
                 setAnalysis(data);
 
                 // If not completed, subscribe to status updates
-                if (data.status !== 'completed' && data.status !== 'failed') {
+                if (!isTerminalStatus(data.status)) {
                     unsubscribe = analysisApi.subscribeToStatus(id, (statusUpdate) => {
                         setStatus(statusUpdate);
 
-                        if (statusUpdate.status === 'completed' || statusUpdate.status === 'failed') {
+                        if (isTerminalStatus(statusUpdate.status)) {
                             // Fetch final result ONLY if we haven't already reached terminal state
                             if (!isTerminalState.current) {
-                                analysisApi.get(id).then(finalData => {
+                                const finalResult = statusUpdate.result
+                                    ? Promise.resolve(statusUpdate.result)
+                                    : analysisApi.get(id);
+                                finalResult.then(finalData => {
                                     isTerminalState.current = true;
                                     setAnalysis(finalData);
                                 });
@@ -82,7 +85,7 @@ export default function AnalysisResultPage({ params }: AnalysisResultPageProps)
                 const statusData = await analysisApi.getStatus(id);
                 setStatus(statusData);
 
-                if (statusData.status === 'completed' || statusData.status === 'failed') {
+                if (isTerminalStatus(statusData.status)) {
                     // Only fetch and update if we haven't already reached terminal state
                     if (!isTerminalState.current) {
                         const data = await analysisApi.get(id);
@@ -103,7 +106,7 @@ export default function AnalysisResultPage({ params }: AnalysisResultPageProps)
     }, [id]); // Remove analysis and status from dependencies to prevent re-fetching
 
     const currentStatus = status?.status || analysis?.status || 'pending';
-    const isProcessing = !['completed', 'failed'].includes(currentStatus);
+    const isProcessing = !isTerminalStatus(currentStatus);
 
     if (isLoading) {
         return (
@@ -25,6 +25,7 @@ const statusToAgentIndex: Record<string, number> = {
     'deciding': 3,
     'completed': 4,
     'failed': -1,
+    'cancelled': -1,
 };
 
 export default function AgentProgress({ status, currentAgent, progressPercentage }: AgentProgressProps) {
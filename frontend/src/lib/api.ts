@@ -83,9 +83,8 @@ export const analysisApi = {
             }
         };
 
-        eventSource.onerror = () => {
-            eventSource.close();
-        };
+        // No onerror close: the browser reconnects after a dropped connection
+        // and the server resumes from the Last-Event-ID header it sends
 
         return () => eventSource.close();
     },
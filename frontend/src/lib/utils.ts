@@ -35,11 +35,16 @@ export function getVerdictColor(verdict: string): string {
     }
 }
 
+export function isTerminalStatus(status: string): boolean {
+    return ['completed', 'failed', 'cancelled'].includes(status);
+}
+
 export function getStatusColor(status: string): string {
     switch (status) {
         case 'completed':
             return 'badge-success';
         case 'failed':
+        case 'cancelled':
             return 'badge-error';
         case 'pending':
             return 'badge-info';
@@ -7,7 +7,8 @@ export type AnalysisStatus =
   | 'assessing_risks'
   | 'deciding'
   | 'completed'
-  | 'failed';
+  | 'failed'
+  | 'cancelled';
 
 export type Verdict = 'GO' | 'NO-GO' | 'CONDITIONAL';
 
@@ -72,6 +73,9 @@ export interface AnalysisResponse {
   result?: {
     decision?: Decision;
     reasoning_steps?: AgentStep[];
+    // Set when preferences.deadline_ms forced shortcuts
+    degraded?: boolean;
+    degradations?: string[];
   };
   // Legacy fields for backward compatibility
   decision?: Decision;
@@ -87,6 +91,13 @@ export interface AnalysisStatusResponse {
   current_step?: string;
   progress_percentage: number;
   latest_update: string;
+  priority?: 'interactive' | 'normal' | 'bulk';
+  queue_position?: number;
+  queue_depth?: number;
+  queue_wait_ms?: number;
+  // Set on the terminal stream event, which carries the stored result
+  final?: boolean;
+  result?: AnalysisResponse | null;
 }
 
 export interface FeedbackRequest {